@@ -27,6 +27,14 @@ export const foodItemsAPI = {
   // 음식 아이템 목록 조회
   getAll: () => api.get('/api/food-items'),
   
+  // 음식 아이템 페이지 조회 (유통기한 순) → { items, next_cursor }
+  // params: { limit, cursor, category, expiring_within_days, fields: 'name,expiration_date' }
+  getPage: (params) => api.get('/api/food-items', { params: { limit: 50, ...params } }),
+  
+  // 오늘부터 within일 이내에 유통기한이 끝나는 음식 아이템 (임박한 순)
+  getExpiring: (within = 3, params = {}) =>
+    api.get('/api/food-items/expiring', { params: { within, ...params } }),
+  
   // 음식 아이템 생성
   create: (data) => api.post('/api/food-items', data),
   
@@ -35,6 +43,31 @@ export const foodItemsAPI = {
   
   // 음식 아이템 삭제
   delete: (id) => api.delete(`/api/food-items/${id}`),
+  
+  // 음식 아이템 일괄 생성/수정/삭제 (요청 1번, 항목 합계 최대 500개)
+  // { create: [...], update: [{ id, ...fields }], delete: [id, ...] }
+  batch: ({ create = [], update = [], delete: remove = [] }) =>
+    api.post('/api/food-items/batch', { create, update, delete: remove }),
+};
+
+// 레시피 추천 API
+export const recommendationsAPI = {
+  // 보유 재료 기반 추천 (서버에서 점수 계산)
+  // { top_k, max_missing, only_full_match }
+  get: (params = {}) => api.get('/api/recommendations', { params }),
+};
+
+// 통계 API
+export const statsAPI = {
+  // 서버 집계 문서 기반 통계 (카테고리별/유통기한 구간별 보유 수, 월별 추가·소비·폐기 수)
+  get: () => api.get('/api/stats'),
+};
+
+// 레시피 검색 API
+export const recipesAPI = {
+  // 서버 색인 기반 검색 (이름/태그/재료, 점수순)
+  // { category, offset, limit } -> { total, items, facets: { category } }
+  search: (q, params = {}) => api.get('/api/recipes/search', { params: { q, ...params } }),
 };
 
 export default api;
\ No newline at end of file
@@ -7,12 +7,44 @@ import {
   deleteDoc, 
   query, 
   where, 
-  orderBy 
+  orderBy,
+  Timestamp
 } from 'firebase/firestore';
 import { auth, db } from '../config/firebase';
 
 const COLLECTION_NAME = 'food_items';
 
+// 서버(fastapi-backend)가 정렬/범위 조회와 유통기한 알림에 쓰는 필드
+// 유통기한 날짜의 0시(한국 시간) 타임스탬프, 날짜를 해석할 수 없으면 null (서버 services/expiration.py와 같은 규칙)
+const APP_UTC_OFFSET_MS = 9 * 60 * 60 * 1000;
+const DATE_PATTERN = /^(\d{4})[-./]?(\d{1,2})[-./]?(\d{1,2})\.?$/;
+
+const toExpirationAt = (value) => {
+  if (!value) return null;
+  const text = String(value).trim();
+  let year, month, day;
+  if (text.includes('T')) {
+    // 시간이 붙은 ISO 문자열은 한국 시간 기준 날짜만 사용
+    const moment = new Date(text);
+    if (isNaN(moment.getTime())) return null;
+    const shifted = new Date(moment.getTime() + APP_UTC_OFFSET_MS);
+    [year, month, day] = [shifted.getUTCFullYear(), shifted.getUTCMonth() + 1, shifted.getUTCDate()];
+  } else {
+    const match = DATE_PATTERN.exec(text);
+    if (!match) return null;
+    [year, month, day] = match.slice(1).map(Number);
+  }
+  const midnight = new Date(Date.UTC(year, month - 1, day));
+  // 2025-02-30 같은 없는 날짜는 해석 실패
+  if (midnight.getUTCMonth() !== month - 1 || midnight.getUTCDate() !== day) return null;
+  return Timestamp.fromMillis(midnight.getTime() - APP_UTC_OFFSET_MS);
+};
+
+// 유통기한이 포함된 쓰기에 expiration_at을 함께 채움
+const withExpirationAt = (data) => (
+  'expirationDate' in data ? { ...data, expiration_at: toExpirationAt(data.expirationDate) } : data
+);
+
 // 현재 사용자 UID 가져오기
 const getCurrentUserUid = () => {
   const user = auth.currentUser;
@@ -33,7 +65,7 @@ export const saveFoodItemToFirestore = async (foodItem) => {
   try {
     const userCollection = getUserFoodItemsCollection();
     const docRef = await addDoc(userCollection, {
-      ...foodItem,
+      ...withExpirationAt(foodItem),
       createdAt: new Date().toISOString(),
       updatedAt: new Date().toISOString()
     });
@@ -73,7 +105,7 @@ export const updateFoodItemInFirestore = async (itemId, updateData) => {
     const itemDoc = doc(db, 'users', uid, COLLECTION_NAME, itemId);
     
     await updateDoc(itemDoc, {
-      ...updateData,
+      ...withExpirationAt(updateData),
       updatedAt: new Date().toISOString()
     });
     
@@ -0,0 +1,364 @@
+"""
+음식 아이템 API 혼합 부하 벤치마크
+로컬 대역 서버(benchmarks/local_server.py: 메모리 Firestore 또는 에뮬레이터 + 가짜 토큰 검증)를 새 프로세스로 띄우고,
+사용자 N명이 각자 자기 아이템에 목록/생성/수정/삭제 요청을 섞어 보내 처리량, 지연(p50/p95/p99),
+요청당 Firestore 사용량을 측정
+
+- 보정: 부하 전에 요청 종류마다 순서대로 몇 번씩 보내 /metrics의 Firestore 사용량 차이로 요청 1건당 RPC/읽기/쓰기 수를 셈
+- 부하: 사용자마다 seed로 고정된 난수로 요청 종류/대상을 고르므로 --requests를 주면 같은 요청 순서가 재현됨
+- 결과 JSON(--output)을 --compare로 이전 결과와 비교 (FirestoreService/라우트 변경 전후 비교용)
+
+사용법:
+    cd fastapi-backend
+    python benchmarks/api_load_bench.py --users 50 --duration 20 --output before.json
+    python benchmarks/api_load_bench.py --users 50 --duration 20 --compare before.json
+    python benchmarks/api_load_bench.py --mix list=80,create=10,update=5,delete=5 --latency-ms 5 --json
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python benchmarks/api_load_bench.py --firestore emulator
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from load_test import percentile  # noqa: E402
+from local_server import CATEGORIES, FOOD_NAMES, bench_user_id  # noqa: E402
+from startup_bench import LOCAL_SERVER, POLL_INTERVAL, STARTUP_TIMEOUT, free_port  # noqa: E402
+
+OPERATIONS = ('list', 'create', 'update', 'delete')
+DEFAULT_MIX = 'list=60,create=15,update=15,delete=10'
+LIST_PAGE_SIZE = 20
+CALIBRATION_REQUESTS = 20
+METRIC_LINE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+METRIC_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_mix(value):
+    """'list=60,create=15,...' → {요청 종류: 비율}"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in OPERATIONS or not weight.strip():
+            raise argparse.ArgumentTypeError(f"잘못된 --mix 항목입니다: {part} (사용 가능: {', '.join(OPERATIONS)})")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def scrape_metrics(base_host, port):
+    """/metrics → {(이름, ((라벨, 값), ...)): 값}"""
+    connection = http.client.HTTPConnection(base_host, port, timeout=30)
+    try:
+        connection.request('GET', '/metrics')
+        text = connection.getresponse().read().decode('utf-8')
+    finally:
+        connection.close()
+    samples = {}
+    for line in text.splitlines():
+        match = METRIC_LINE.match(line)
+        if match:
+            name, labels, value = match.groups()
+            samples[(name, tuple(sorted(METRIC_LABEL.findall(labels or ''))))] = float(value)
+    return samples
+
+
+def metrics_delta(before, after):
+    return {key: value - before.get(key, 0.0) for key, value in after.items()}
+
+
+def firestore_operations(delta):
+    """메모리 대역 사용량 {rpcs, document_reads, ...} (에뮬레이터처럼 내보내지 않으면 None)"""
+    operations = {labels[0][1]: value for (name, labels), value in delta.items()
+                  if name == 'local_firestore_operations_total'}
+    return operations or None
+
+
+def phase_breakdown(delta):
+    """경로별 요청 1건당 평균 서버 시간과 단계별 시간(ms) (/metrics 합계 / 요청 수)
+
+    server는 서버가 요청을 받아 응답을 다 보낼 때까지, 나머지는 그중 auth/firestore/serialize 등에 쓴 시간
+    """
+    requests = Counter()
+    for (name, labels), value in delta.items():
+        if name == 'http_requests_total':
+            label = dict(labels)
+            requests[f"{label['method']} {label['route']}"] += value
+    phases = defaultdict(dict)
+    for (name, labels), value in delta.items():
+        if name in ('http_request_duration_seconds_sum', 'http_request_phase_seconds_sum') and value:
+            label = dict(labels)
+            route = f"{label['method']} {label['route']}"
+            if requests[route] and route != 'GET /metrics':
+                phases[route][label.get('phase', 'server')] = value / requests[route] * 1000
+    return dict(phases)
+
+
+class SimulatedUser:
+    """사용자 1명: keep-alive 연결 하나로 자기 아이템에 요청을 보냄 (알고 있는 아이템 ID 목록을 스스로 관리)"""
+
+    def __init__(self, host, port, user_id, item_ids, mix, seed):
+        self.connection = http.client.HTTPConnection(host, port, timeout=30)
+        self.headers = {'Authorization': f'Bearer {user_id}', 'Content-Type': 'application/json'}
+        self.item_ids = list(item_ids)
+        self.rng = random.Random(seed)
+        self.operations = list(mix)
+        self.weights = [mix[name] for name in self.operations]
+        self.next_cursor = None
+
+    def _request(self, method, path, body=None):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8') if body is not None else None
+        try:
+            self.connection.request(method, path, body=payload, headers=self.headers)
+            response = self.connection.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            return None, b''
+
+    def _food_item(self):
+        expiration = date.today() + timedelta(days=self.rng.randint(-2, 30))
+        return {
+            'name': self.rng.choice(FOOD_NAMES),
+            'expiration_date': expiration.isoformat(),
+            'quantity': self.rng.randint(1, 5),
+            'category': self.rng.choice(CATEGORIES),
+        }
+
+    def choose(self):
+        operation = self.rng.choices(self.operations, self.weights)[0]
+        # 아이템이 없으면 수정/삭제 대신 생성
+        if operation in ('update', 'delete') and not self.item_ids:
+            return 'create'
+        return operation
+
+    def run(self, operation):
+        """요청 1건 → (성공 여부, 응답 상태)"""
+        if operation == 'list':
+            # 첫 페이지 또는 이전 응답의 다음 페이지 (앱의 무한 스크롤)
+            path = f'/api/food-items/?limit={LIST_PAGE_SIZE}'
+            if self.next_cursor and self.rng.random() < 0.5:
+                path += f'&cursor={self.next_cursor}'
+            status, body = self._request('GET', path)
+            if status == 200:
+                self.next_cursor = json.loads(body).get('next_cursor')
+        elif operation == 'create':
+            status, body = self._request('POST', '/api/food-items/', self._food_item())
+            if status == 200:
+                self.item_ids.append(json.loads(body)['id'])
+        elif operation == 'update':
+            item_id = self.rng.choice(self.item_ids)
+            update = {'quantity': self.rng.randint(1, 5)}
+            if self.rng.random() < 0.3:
+                update['expiration_date'] = self._food_item()['expiration_date']
+            status, _ = self._request('PUT', f'/api/food-items/{item_id}', update)
+        else:
+            item_id = self.item_ids.pop(self.rng.randrange(len(self.item_ids)))
+            status, _ = self._request('DELETE', f'/api/food-items/{item_id}')
+        return status is not None and status < 400, status
+
+    def close(self):
+        self.connection.close()
+
+
+def user_loop(user, deadline, requests, think, records, lock):
+    """deadline까지(또는 requests건) 요청을 보내고 (종류, 지연, 성공 여부)를 모음"""
+    local = []
+    count = 0
+    while time.perf_counter() < deadline and (requests is None or count < requests):
+        operation = user.choose()
+        started_at = time.perf_counter()
+        ok, _ = user.run(operation)
+        local.append((operation, time.perf_counter() - started_at, ok))
+        count += 1
+        if think:
+            time.sleep(user.rng.expovariate(1 / think))
+    user.close()
+    with lock:
+        records.extend(local)
+
+
+def run_phase(users, duration, requests, think):
+    """사용자마다 스레드 하나로 duration초 동안(또는 사용자당 requests건) 요청"""
+    records, lock = [], threading.Lock()
+    deadline = time.perf_counter() + (duration if requests is None else float('inf'))
+    threads = [threading.Thread(target=user_loop, args=(user, deadline, requests, think, records, lock))
+               for user in users]
+    started_at = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return records, time.perf_counter() - started_at
+
+
+def summarize(records, elapsed):
+    latencies = [latency for _, latency, ok in records if ok]
+    return {
+        'requests': len(records),
+        'errors': sum(1 for _, _, ok in records if not ok),
+        'requests_per_sec': len(records) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def calibrate(host, port, user_id, item_ids):
+    """요청 종류마다 CALIBRATION_REQUESTS건을 혼자 보내 요청 1건당 Firestore 사용량 측정"""
+    per_request = {}
+    user = SimulatedUser(host, port, user_id, item_ids, {'list': 1}, seed=0)
+    for operation in OPERATIONS:
+        before = scrape_metrics(host, port)
+        for _ in range(CALIBRATION_REQUESTS):
+            user.run(operation if operation == 'list' or user.item_ids else 'create')
+        operations = firestore_operations(metrics_delta(before, scrape_metrics(host, port)))
+        if operations is None:
+            return None
+        per_request[operation] = {kind: value / CALIBRATION_REQUESTS for kind, value in operations.items()}
+    user.close()
+    return per_request
+
+
+def start_server(port, args):
+    command = [sys.executable, LOCAL_SERVER, '--port', str(port), '--firestore', args.firestore,
+               '--latency-ms', str(args.latency_ms), '--seed-users', str(args.users + 1),
+               '--seed-items', str(args.seed_items)]
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    started_at = time.perf_counter()
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버가 시작하지 못했습니다: {process.stderr.read().decode('utf-8', 'replace')}")
+        if time.perf_counter() - started_at > STARTUP_TIMEOUT:
+            process.terminate()
+            raise RuntimeError("서버 시작 시간이 초과되었습니다.")
+        try:
+            scrape_metrics('127.0.0.1', port)
+            return process
+        except OSError:
+            time.sleep(POLL_INTERVAL)
+
+
+def git_revision():
+    try:
+        completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                   cwd=BACKEND_DIR, check=True)
+        return completed.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark(args):
+    host, port = '127.0.0.1', free_port()
+    process = start_server(port, args)
+    seeded_ids = [f'item{index:06d}' for index in range(args.seed_items)]
+    try:
+        # 보정은 부하에 쓰지 않는 마지막 시드 사용자로
+        calibration = calibrate(host, port, bench_user_id(args.users), seeded_ids)
+
+        users = [SimulatedUser(host, port, bench_user_id(index), seeded_ids, args.mix, args.seed + index)
+                 for index in range(args.users)]
+        # 워밍업도 같은 사용자 객체로 (워밍업 중 지운 아이템을 측정 중에 고치지 않도록), 요청 수 기준이라 순서가 재현됨
+        if args.warmup:
+            run_phase(users, None, args.warmup, args.think_ms / 1000)
+        before = scrape_metrics(host, port)
+        records, elapsed = run_phase(users, args.duration, args.requests, args.think_ms / 1000)
+        delta = metrics_delta(before, scrape_metrics(host, port))
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    by_operation = defaultdict(list)
+    for record in records:
+        by_operation[record[0]].append(record)
+    operations = firestore_operations(delta)
+    return {
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': git_revision(),
+        'config': {
+            'users': args.users, 'duration': args.duration, 'requests': args.requests, 'warmup': args.warmup,
+            'mix': args.mix, 'think_ms': args.think_ms, 'seed': args.seed, 'seed_items': args.seed_items,
+            'firestore': args.firestore, 'latency_ms': args.latency_ms,
+        },
+        'elapsed_s': elapsed,
+        'total': summarize(records, elapsed),
+        'operations': {name: summarize(by_operation[name], elapsed) for name in OPERATIONS if by_operation[name]},
+        'firestore_per_request': (
+            {kind: value / len(records) for kind, value in operations.items()} if operations and records else None
+        ),
+        'firestore_per_operation': calibration,
+        'phases_ms': phase_breakdown(delta),
+    }
+
+
+def change(current, baseline):
+    if not baseline:
+        return ''
+    return f" ({(current - baseline) / baseline * 100:+.1f}%)"
+
+
+def print_report(result, baseline=None):
+    config = result['config']
+    print(f"📊 혼합 부하 - 사용자 {config['users']}명, {result['elapsed_s']:.1f}초, "
+          f"Firestore {config['firestore']} (RPC 지연 {config['latency_ms']:g}ms), 비율 {config['mix']}")
+    rows = [('전체', result['total'], (baseline or {}).get('total'))]
+    rows += [(name, summary, (baseline or {}).get('operations', {}).get(name))
+             for name, summary in result['operations'].items()]
+    for label, summary, before in rows:
+        before = before or {}
+        columns = [f"{summary['requests_per_sec']:8.1f} req/s{change(summary['requests_per_sec'], before.get('requests_per_sec'))}"]
+        columns += [f"{key[:3]} {summary[key]:.1f}ms{change(summary[key], before.get(key))}"
+                    for key in ('p50_ms', 'p95_ms', 'p99_ms')]
+        print(f"   {label:6} " + '  '.join(columns) + f"  (요청 {summary['requests']}, 실패 {summary['errors']})")
+    if result['firestore_per_request']:
+        usage = ', '.join(f"{kind} {value:.2f}" for kind, value in result['firestore_per_request'].items())
+        print(f"   요청당 Firestore: {usage}")
+    for name, usage in (result['firestore_per_operation'] or {}).items():
+        print(f"     {name:6} " + ', '.join(f"{kind} {value:.2f}" for kind, value in usage.items()))
+    for route, phases in sorted(result['phases_ms'].items()):
+        ordered = sorted(phases.items(), key=lambda item: (item[0] != 'server', item[0]))
+        print(f"   {route}: " + ', '.join(f"{phase} {value:.2f}ms" for phase, value in ordered))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="음식 아이템 API 혼합 부하 벤치마크")
+    parser.add_argument('--users', type=int, default=50, help='동시 사용자 수 (기본 50)')
+    parser.add_argument('--duration', type=float, default=20.0, help='측정 시간(초, 기본 20)')
+    parser.add_argument('--requests', type=int, default=None, help='사용자당 요청 수 (주면 시간 대신 요청 수로 종료)')
+    parser.add_argument('--warmup', type=int, default=10, help='측정 전 사용자당 워밍업 요청 수 (기본 10)')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f'요청 비율 (기본 {DEFAULT_MIX})')
+    parser.add_argument('--think-ms', type=float, default=0.0, help='요청 사이 평균 대기(ms, 지수분포, 기본 0)')
+    parser.add_argument('--seed', type=int, default=1, help='요청 순서 난수 seed')
+    parser.add_argument('--seed-items', type=int, default=50, help='사용자마다 미리 넣을 아이템 수 (기본 50)')
+    parser.add_argument('--firestore', choices=['memory', 'emulator'], default='memory', help='Firestore 대역')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='메모리 대역의 RPC당 지연 (기본 0)')
+    parser.add_argument('--output', default=None, help='결과 JSON을 저장할 파일')
+    parser.add_argument('--compare', default=None, help='비교할 이전 결과 JSON 파일')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON 한 줄로 출력')
+    args = parser.parse_args()
+
+    result = benchmark(args)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+        return
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+
+if __name__ == "__main__":
+    main()
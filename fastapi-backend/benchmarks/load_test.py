@@ -0,0 +1,99 @@
+"""
+API 부하 테스트
+실행 중인 서버에 동시 사용자 N명이 쉬지 않고 요청을 보내 초당 처리량과 지연(p50/p99)을 측정
+
+사용법:
+    uvicorn main:app --port 8000            # 다른 터미널에서 서버 실행
+    python benchmarks/load_test.py --token <Firebase ID 토큰> --users 50 --duration 20
+    python benchmarks/load_test.py --token <토큰> --path /api/food-items/ --users 50 --json
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+def percentile(values, pct):
+    """nearest-rank 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def run_user(base_url, path, headers, deadline, latencies, errors, lock):
+    """사용자 1명: keep-alive 연결 하나로 deadline까지 요청 반복"""
+    parsed = urlparse(base_url)
+    connection_class = http.client.HTTPSConnection if parsed.scheme == 'https' else http.client.HTTPConnection
+    connection = connection_class(parsed.hostname, parsed.port, timeout=30)
+    local_latencies = []
+    local_errors = 0
+    while time.perf_counter() < deadline:
+        started_at = time.perf_counter()
+        try:
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                local_errors += 1
+            else:
+                local_latencies.append(time.perf_counter() - started_at)
+        except (OSError, http.client.HTTPException):
+            local_errors += 1
+            connection.close()
+    connection.close()
+    with lock:
+        latencies.extend(local_latencies)
+        errors[0] += local_errors
+
+
+def load_test(base_url, path, token=None, users=50, duration=10.0):
+    """users명이 duration초 동안 path를 반복 요청한 결과 dict 반환"""
+    headers = {'Connection': 'keep-alive'}
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    latencies, errors, lock = [], [0], threading.Lock()
+    started_at = time.perf_counter()
+    deadline = started_at + duration
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        for _ in range(users):
+            executor.submit(run_user, base_url, path, headers, deadline, latencies, errors, lock)
+    elapsed = time.perf_counter() - started_at
+    return {
+        'path': path,
+        'users': users,
+        'requests': len(latencies),
+        'errors': errors[0],
+        'elapsed': elapsed,
+        'requests_per_sec': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 부하 테스트")
+    parser.add_argument('--url', default='http://localhost:8000', help='서버 주소')
+    parser.add_argument('--path', default='/api/food-items/', help='요청 경로 (GET)')
+    parser.add_argument('--token', default=None, help='Authorization: Bearer 토큰')
+    parser.add_argument('--users', type=int, default=50, help='동시 사용자 수 (기본 50)')
+    parser.add_argument('--duration', type=float, default=10.0, help='측정 시간(초, 기본 10)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON 한 줄로 출력')
+    args = parser.parse_args()
+
+    result = load_test(args.url, args.path, args.token, args.users, args.duration)
+    if args.json:
+        print(json.dumps(result))
+        return
+    print(f"📊 GET {result['path']} - 동시 사용자 {result['users']}명, {result['elapsed']:.1f}초")
+    print(f"   처리량 {result['requests_per_sec']:.1f} req/s (성공 {result['requests']}, 실패 {result['errors']})")
+    print(f"   지연 p50 {result['p50_ms']:.1f}ms / p99 {result['p99_ms']:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,499 @@
+"""
+로컬 Firestore 대역 (메모리)
+Firestore 에뮬레이터/실제 프로젝트 없이 서버를 띄워 벤치마크하기 위한 google.cloud.firestore.Client 대체 객체
+
+- 서비스들이 쓰는 범위만 구현: collection/collection_group/document, where/order_by/start_after/limit/select,
+  stream/get, set(merge)/update/delete, get_all, batch, transaction(google.cloud.firestore.transactional과 함께 사용)
+- Increment/DELETE_FIELD 값은 google.cloud.firestore의 객체를 그대로 받아 처리
+- 트랜잭션은 낙관적 동시성: 읽은 문서가 커밋 전에 바뀌었으면 Aborted를 내서 transactional이 다시 실행
+- 정렬/필터는 Firestore 규칙을 따름 (order_by 필드가 없는 문서 제외, null이 가장 앞, 타입별 정렬 순서)
+- 같은 쿼리의 필터/정렬 결과는 해당 컬렉션에 쓰기가 없으면 재사용 (커서로 페이지를 넘길 때 전체를 다시 훑지 않음)
+- latency를 주면 RPC마다 그만큼 대기해 네트워크 왕복을 흉내 냄
+- stats()로 RPC/문서 읽기/쓰기 수를 확인 (요청당 Firestore 사용량 측정용)
+"""
+
+import bisect
+import copy
+import operator
+import random
+import string
+import threading
+import time
+from datetime import datetime
+
+AUTO_ID_CHARS = string.ascii_letters + string.digits
+BATCH_LIMIT = 500
+QUERY_CACHE_SIZE = 256
+
+_COMPARATORS = {
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+
+class NotFound(Exception):
+    """없는 문서를 update할 때 (google.api_core.exceptions.NotFound에 해당)"""
+
+
+def _aborted(message):
+    # transactional 데코레이터는 google.api_core의 Aborted만 다시 시도함
+    try:
+        from google.api_core.exceptions import Aborted
+    except ImportError:
+        return RuntimeError(message)
+    return Aborted(message)
+
+
+def _is_increment(value):
+    return type(value).__name__ == 'Increment' and hasattr(value, 'value')
+
+
+def _is_delete_field(value):
+    return type(value).__name__ == 'Sentinel' and 'delete' in getattr(value, 'description', '').lower()
+
+
+def _type_rank(value):
+    # Firestore 정렬 순서: null < bool < 숫자 < 타임스탬프 < 문자열 < 바이트 < 배열 < 맵
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, datetime):
+        return 3
+    if isinstance(value, str):
+        return 4
+    if isinstance(value, bytes):
+        return 5
+    if isinstance(value, (list, tuple)):
+        return 6
+    return 7
+
+
+def _sort_key(value):
+    rank = _type_rank(value)
+    if rank in (0, 7):
+        return (rank, 0)
+    if rank == 6:
+        return (rank, tuple(_sort_key(item) for item in value))
+    return (rank, value)
+
+
+def _get_field(data, field_path):
+    """점(.)으로 구분한 필드 경로 값, 없으면 (False, None)"""
+    value = data
+    for part in field_path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return False, None
+        value = value[part]
+    return True, value
+
+
+def _matches(data, doc_id, field, op, value):
+    if field == '__name__':
+        found, current = True, doc_id
+        value = value.id if isinstance(value, DocumentReference) else value
+    else:
+        found, current = _get_field(data, field)
+    if not found:
+        return False
+    if op == 'in':
+        return current in value
+    if op == 'not-in':
+        return current is not None and current not in value
+    if op == 'array_contains':
+        return isinstance(current, list) and value in current
+    if op == 'array_contains_any':
+        return isinstance(current, list) and any(item in current for item in value)
+    if op in ('==', '!='):
+        return _COMPARATORS[op](current, value)
+    # 범위 비교는 같은 타입끼리만
+    if _type_rank(current) != _type_rank(value) or current is None:
+        return False
+    return _COMPARATORS[op](current, value)
+
+
+class DocumentSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field_path):
+        return _get_field(self._data or {}, field_path)[1]
+
+
+class DocumentReference:
+    def __init__(self, client, path):
+        self._client = client
+        self._path = tuple(path)
+        self.id = self._path[-1]
+
+    @property
+    def path(self):
+        return '/'.join(self._path)
+
+    @property
+    def parent(self):
+        return CollectionReference(self._client, self._path[:-1])
+
+    def collection(self, name):
+        return CollectionReference(self._client, self._path + (name,))
+
+    def get(self, field_paths=None, transaction=None):
+        self._client._rpc()
+        data = self._client._read(self._path, transaction)
+        if data is not None and field_paths is not None:
+            data = {key: value for key, value in data.items() if key in field_paths}
+        return DocumentSnapshot(self, data)
+
+    def set(self, document_data, merge=False):
+        self._client._rpc()
+        self._client._write(self._path, document_data, merge=merge)
+
+    def update(self, field_updates):
+        self._client._rpc()
+        self._client._update(self._path, field_updates)
+
+    def delete(self):
+        self._client._rpc()
+        self._client._delete(self._path)
+
+
+class Query:
+    def __init__(self, client, parent, all_descendants=False, filters=(), orders=(), cursor=None,
+                 limit_count=None, projection=None):
+        self._client = client
+        self._parent = parent
+        self._all_descendants = all_descendants
+        self._filters = filters
+        self._orders = orders
+        self._cursor = cursor
+        self._limit = limit_count
+        self._projection = projection
+
+    def _copy(self, **changes):
+        options = dict(
+            all_descendants=self._all_descendants, filters=self._filters, orders=self._orders,
+            cursor=self._cursor, limit_count=self._limit, projection=self._projection,
+        )
+        options.update(changes)
+        return Query(self._client, self._parent, **options)
+
+    def where(self, field_path, op_string, value):
+        return self._copy(filters=self._filters + ((field_path, op_string, value),))
+
+    def order_by(self, field_path, direction='ASCENDING'):
+        return self._copy(orders=self._orders + ((field_path, direction == 'DESCENDING'),))
+
+    def start_after(self, document_fields_or_snapshot):
+        return self._copy(cursor=document_fields_or_snapshot)
+
+    def limit(self, count):
+        return self._copy(limit_count=count)
+
+    def select(self, field_paths):
+        return self._copy(projection=list(field_paths))
+
+    def _name_key(self, value):
+        """__name__ 정렬 값 = 문서 경로 (문자열 ID는 이 쿼리 컬렉션의 문서로 해석)"""
+        if isinstance(value, DocumentReference):
+            return value._path
+        if isinstance(value, str):
+            return tuple(value.split('/')) if '/' in value else self._parent + (value,)
+        return tuple(value)
+
+    def _cursor_values(self):
+        cursor = self._cursor
+        if isinstance(cursor, DocumentSnapshot):
+            return [cursor.reference._path if field == '__name__' else cursor.get(field) for field, _ in self._orders]
+        return [self._name_key(cursor.get(field)) if field == '__name__' else cursor.get(field)
+                for field, _ in self._orders]
+
+    def _order_key(self, path, data):
+        return [_sort_key(path if field == '__name__' else _get_field(data, field)[1]) for field, _ in self._orders]
+
+    def _after_cursor(self, key, cursor_key):
+        for (_, descending), value, bound in zip(self._orders, key, cursor_key):
+            if value != bound:
+                return value < bound if descending else value > bound
+        return False
+
+    def _matching(self):
+        """필터/정렬을 적용한 (경로, 데이터) 목록과 정렬 키 (같은 쿼리는 해당 컬렉션에 쓰기가 없으면 재사용)"""
+        key = repr((self._parent, self._all_descendants, self._filters, self._orders))
+        collection_id = self._parent[0] if self._all_descendants else self._parent[-1]
+        return self._client._cached_query(key, collection_id, self._match_and_sort)
+
+    def _match_and_sort(self):
+        documents = [
+            (path, data) for path, data in self._client._scan(self._parent, self._all_descendants)
+            if all(_matches(data, path[-1], *condition) for condition in self._filters)
+            # order_by 필드가 없는 문서는 결과에서 제외
+            and all(field == '__name__' or _get_field(data, field)[0] for field, _ in self._orders)
+        ]
+        # 여러 정렬 조건을 뒤에서부터 안정 정렬, 마지막으로 문서 이름 순
+        documents.sort(key=lambda item: item[0])
+        for index in range(len(self._orders) - 1, -1, -1):
+            field, descending = self._orders[index]
+            documents.sort(
+                key=lambda item: _sort_key(item[0] if field == '__name__' else _get_field(item[1], field)[1]),
+                reverse=descending,
+            )
+        return documents, [self._order_key(path, data) for path, data in documents]
+
+    def _run(self):
+        documents, keys = self._matching()
+        if self._cursor is not None:
+            cursor_key = [_sort_key(value) for value in self._cursor_values()]
+            if any(descending for _, descending in self._orders):
+                documents = [item for item, item_key in zip(documents, keys) if self._after_cursor(item_key, cursor_key)]
+            else:
+                documents = documents[bisect.bisect_right(keys, cursor_key):]
+        if self._limit is not None:
+            documents = documents[:self._limit]
+        return documents
+
+    def stream(self, transaction=None):
+        self._client._rpc()
+        for path, data in self._run():
+            if self._projection is not None:
+                data = {key: value for key, value in data.items() if key in self._projection}
+            self._client._count('document_reads')
+            yield DocumentSnapshot(DocumentReference(self._client, path), copy.deepcopy(data))
+
+    def get(self, transaction=None):
+        return list(self.stream())
+
+
+class CollectionReference(Query):
+    def __init__(self, client, path):
+        super().__init__(client, tuple(path))
+        self.id = self._parent[-1]
+
+    @property
+    def parent(self):
+        return DocumentReference(self._client, self._parent[:-1]) if len(self._parent) > 1 else None
+
+    def document(self, document_id=None):
+        if document_id is None:
+            document_id = ''.join(random.choice(AUTO_ID_CHARS) for _ in range(20))
+        return DocumentReference(self._client, self._parent + (document_id,))
+
+    def add(self, document_data):
+        reference = self.document()
+        reference.set(document_data)
+        return None, reference
+
+
+class WriteBatch:
+    def __init__(self, client):
+        self._client = client
+        self._writes = []
+
+    def set(self, reference, document_data, merge=False):
+        self._writes.append(('set', reference._path, copy.deepcopy(document_data), merge))
+
+    def update(self, reference, field_updates):
+        self._writes.append(('update', reference._path, copy.deepcopy(field_updates), False))
+
+    def delete(self, reference):
+        self._writes.append(('delete', reference._path, None, False))
+
+    def commit(self):
+        if len(self._writes) > BATCH_LIMIT:
+            raise ValueError(f"WriteBatch 한 번에 최대 {BATCH_LIMIT}개까지 쓸 수 있습니다.")
+        self._client._rpc()
+        self._client._count('commits')
+        self._client._apply(self._writes)
+        self._writes = []
+
+
+class Transaction(WriteBatch):
+    """google.cloud.firestore.transactional이 호출하는 메서드(_begin/_commit/_rollback 등)를 갖춘 트랜잭션"""
+
+    _max_attempts = 5
+    _read_only = False
+
+    def __init__(self, client):
+        super().__init__(client)
+        self._id = None
+        self._read_versions = {}
+
+    def _clean_up(self):
+        self._writes = []
+        self._read_versions = {}
+        self._id = None
+
+    def _begin(self, retry_id=None):
+        self._id = self._client._next_transaction_id()
+
+    def _commit(self):
+        self._client._rpc()
+        self._client._count('commits')
+        try:
+            self._client._apply(self._writes, self._read_versions)
+        finally:
+            self._clean_up()
+
+    def _rollback(self):
+        self._clean_up()
+
+    def get_all(self, references):
+        return self._client.get_all(references, transaction=self)
+
+
+class InMemoryFirestore:
+    """google.cloud.firestore.Client 대체 객체 (스레드 안전)"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self._documents = {}  # 문서 경로 튜플 → 데이터
+        self._versions = {}  # 문서 경로 튜플 → 쓰기 횟수 (트랜잭션 충돌 확인용)
+        self._transaction_ids = 0
+        self._collection_versions = {}  # 컬렉션 ID → 쓰기 횟수 (쿼리 결과 재사용 판단)
+        self._query_cache = {}  # 쿼리 키 → (컬렉션 버전, 결과)
+        self._lock = threading.RLock()
+        self._counters = dict.fromkeys(('rpcs', 'document_reads', 'document_writes', 'commits'), 0)
+
+    # --- 공개 API ---
+    def collection(self, name):
+        return CollectionReference(self, (name,))
+
+    def collection_group(self, collection_id):
+        return Query(self, (collection_id,), all_descendants=True)
+
+    def document(self, path):
+        return DocumentReference(self, tuple(path.split('/')))
+
+    def batch(self):
+        return WriteBatch(self)
+
+    def transaction(self):
+        return Transaction(self)
+
+    def get_all(self, references, field_paths=None, transaction=None):
+        references = list(references)
+        self._rpc()
+        for reference in references:
+            data = self._read(reference._path, transaction)
+            if data is not None and field_paths is not None:
+                data = {key: value for key, value in data.items() if key in field_paths}
+            yield DocumentSnapshot(reference, data)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def reset_stats(self):
+        with self._lock:
+            self._counters = dict.fromkeys(self._counters, 0)
+
+    def load(self, documents):
+        """{문서 경로 문자열: 데이터} 일괄 적재 (통계에 포함하지 않음)"""
+        with self._lock:
+            for path, data in documents.items():
+                self._documents[tuple(path.split('/'))] = copy.deepcopy(data)
+            self._query_cache.clear()
+
+    # --- 내부 구현 ---
+    def _rpc(self):
+        self._count('rpcs')
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _cached_query(self, key, collection_id, compute):
+        with self._lock:
+            version = self._collection_versions.get(collection_id, 0)
+            cached = self._query_cache.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            result = compute()
+            if len(self._query_cache) >= QUERY_CACHE_SIZE:
+                self._query_cache.clear()
+            self._query_cache[key] = (version, result)
+            return result
+
+    def _next_transaction_id(self):
+        with self._lock:
+            self._transaction_ids += 1
+            return self._transaction_ids
+
+    def _read(self, path, transaction=None):
+        with self._lock:
+            if transaction is not None:
+                transaction._read_versions.setdefault(path, self._versions.get(path, 0))
+            data = self._documents.get(path)
+            if data is not None:
+                self._counters['document_reads'] += 1
+            return copy.deepcopy(data)
+
+    def _scan(self, parent, all_descendants):
+        # _cached_query에서 잠금을 잡은 채로 호출됨
+        if all_descendants:
+            return ((path, data) for path, data in self._documents.items() if path[-2] == parent[0])
+        return ((path, data) for path, data in self._documents.items()
+                if len(path) == len(parent) + 1 and path[:-1] == parent)
+
+    def _write(self, path, data, merge=False):
+        self._apply([('set', path, copy.deepcopy(data), merge)])
+
+    def _update(self, path, data):
+        self._apply([('update', path, copy.deepcopy(data), False)])
+
+    def _delete(self, path):
+        self._apply([('delete', path, None, False)])
+
+    def _apply(self, writes, read_versions=None):
+        with self._lock:
+            for path, version in (read_versions or {}).items():
+                if self._versions.get(path, 0) != version:
+                    raise _aborted(f"Transaction conflict on {'/'.join(path)}")
+            # 배치는 원자적: 없는 문서 update가 하나라도 있으면 아무것도 쓰지 않음
+            for kind, path, _, _ in writes:
+                if kind == 'update' and path not in self._documents:
+                    raise NotFound(f"No document to update: {'/'.join(path)}")
+            for kind, path, data, merge in writes:
+                if kind == 'delete':
+                    self._documents.pop(path, None)
+                else:
+                    current = copy.deepcopy(self._documents.get(path) or {}) if kind == 'update' or merge else {}
+                    for field_path, value in data.items():
+                        # update는 점(.) 경로를 중첩 필드로 해석, set은 맵을 재귀적으로 병합
+                        parts = field_path.split('.') if kind == 'update' else [field_path]
+                        _set_field(current, parts, value, merge_maps=kind == 'set')
+                    self._documents[path] = current
+                self._versions[path] = self._versions.get(path, 0) + 1
+                self._collection_versions[path[-2]] = self._collection_versions.get(path[-2], 0) + 1
+                self._counters['document_writes'] += 1
+
+
+def _set_field(data, parts, value, merge_maps):
+    target = data
+    for part in parts[:-1]:
+        if not isinstance(target.get(part), dict):
+            target[part] = {}
+        target = target[part]
+    last = parts[-1]
+    if _is_delete_field(value):
+        target.pop(last, None)
+    elif _is_increment(value):
+        previous = target.get(last)
+        numeric = isinstance(previous, (int, float)) and not isinstance(previous, bool)
+        target[last] = (previous if numeric else 0) + value.value
+    elif merge_maps and isinstance(value, dict):
+        if not isinstance(target.get(last), dict):
+            target[last] = {}
+        for key, item in value.items():
+            _set_field(target[last], [key], item, merge_maps)
+    else:
+        target[last] = value
@@ -0,0 +1,144 @@
+"""
+로컬 대역으로 API 서버 실행
+Firebase 서비스 계정 키 없이 main.app을 띄움 (벤치마크/로컬 개발용)
+
+- Firestore: 메모리 대역(InMemoryFirestore, 기본) 또는 FIRESTORE_EMULATOR_HOST의 Firestore 에뮬레이터
+- ID 토큰: 서명 검증 없이 토큰 문자열을 그대로 uid로 사용 (토큰 캐시는 그대로 거침)
+- 서비스는 app.dependency_overrides로 주입하므로 main/routes 코드는 실제 배포와 같음
+- 메모리 대역의 RPC/문서 읽기/쓰기 수를 /metrics에 local_firestore_operations_total로 내보냄
+
+사용법:
+    cd fastapi-backend
+    python benchmarks/local_server.py --port 8000 --seed-items 200
+    python benchmarks/local_server.py --seed-users 100 --seed-items 50   # bench-user-0000 ~ bench-user-0099
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python benchmarks/local_server.py --firestore emulator
+    python benchmarks/load_test.py --token bench-user --users 50   # 다른 터미널에서
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from local_firestore import InMemoryFirestore  # noqa: E402
+
+DEFAULT_USER = 'bench-user'
+CATEGORIES = ['채소', '과일', '육류', '유제품', '냉동식품', '기타']
+FOOD_NAMES = ['대파', '양파', '우유', '계란', '두부', '돼지고기', '사과', '요거트', '김치', '만두']
+
+_exported_db = None
+
+
+def bench_user_id(index):
+    """--seed-users로 아이템을 넣는 사용자 ID (토큰으로 그대로 쓰면 됨)"""
+    return f'{DEFAULT_USER}-{index:04d}'
+
+
+def local_token_verifier(token):
+    """토큰 문자열을 uid로 쓰는 검증 대역 (1시간 동안 토큰 캐시에 남음)"""
+    return {'uid': token, 'exp': time.time() + 3600}
+
+
+def seed_food_items(db, user_id=DEFAULT_USER, count=0, seed=0):
+    """사용자에게 합성 음식 아이템 count개를 저장 (FirestoreService.create_food_item과 같은 모양)"""
+    from services.firestore import with_expiration
+
+    rng = random.Random(seed)
+    documents = {}
+    for index in range(count):
+        item_id = f'item{index:06d}'
+        expiration = date.today() + timedelta(days=rng.randint(-5, 60))
+        documents[f'users/{user_id}/food_items/{item_id}'] = with_expiration({
+            'id': item_id,
+            'name': rng.choice(FOOD_NAMES),
+            'category': rng.choice(CATEGORIES),
+            'quantity': rng.randint(1, 5),
+            'expiration_date': expiration.isoformat(),
+            'added_date': date.today().isoformat(),
+            'user_id': user_id,
+        })
+    db.load(documents)
+
+
+def mark_expiration_backfilled(db):
+    """expiration_at 백필 표식을 써서 expiration_at 정렬/범위 쿼리를 쓰게 함"""
+    from services.firestore import expiration_migration_ref
+
+    expiration_migration_ref(db).set({'completedAt': datetime.now(timezone.utc)})
+
+
+def export_firestore_stats(db):
+    """메모리 대역의 누적 사용량을 /metrics에 내보냄 (나중에 넘긴 대역으로 교체)"""
+    global _exported_db
+    from services.metrics import registry
+
+    if _exported_db is None:
+        operations = registry.counter('local_firestore_operations_total', '메모리 Firestore 대역 사용량', ('kind',))
+
+        def collect():
+            for kind, value in _exported_db.stats().items():
+                operations.set(value, kind=kind)
+
+        registry.add_collector(collect)
+    _exported_db = db
+
+
+def create_local_app(db=None, firestore='memory'):
+    """대역을 주입한 main.app 반환 (firestore='emulator'면 실제 클라이언트가 에뮬레이터에 연결)"""
+    from main import app
+    from middleware.auth import get_token_verifier
+    from services.cache import food_item_cache
+    from services.firestore import AsyncFirestoreService, FirestoreService, get_async_firestore_service
+    from services.recommendation import (
+        AsyncRecommendationService, RecommendationService, get_async_recommendation_service,
+    )
+    from services.recipe_search import AsyncRecipeSearchService, RecipeSearchService, get_async_recipe_search_service
+
+    app.dependency_overrides[get_token_verifier] = lambda: local_token_verifier
+    if firestore == 'memory':
+        db = db if db is not None else InMemoryFirestore()
+        firestore_service = AsyncFirestoreService(FirestoreService(db=db, cache=food_item_cache))
+        recommendation_service = AsyncRecommendationService(RecommendationService(db=db))
+        app.dependency_overrides[get_async_firestore_service] = lambda: firestore_service
+        app.dependency_overrides[get_async_recommendation_service] = lambda: recommendation_service
+        recipe_search_service = AsyncRecipeSearchService(RecipeSearchService(db=db))
+        app.dependency_overrides[get_async_recipe_search_service] = lambda: recipe_search_service
+        export_firestore_stats(db)
+    elif not os.getenv('FIRESTORE_EMULATOR_HOST'):
+        raise SystemExit("--firestore emulator 를 쓰려면 FIRESTORE_EMULATOR_HOST를 설정하세요.")
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 대역으로 API 서버 실행")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--firestore', choices=['memory', 'emulator'], default='memory',
+                        help='Firestore 대역 (memory: 프로세스 메모리, emulator: FIRESTORE_EMULATOR_HOST)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='메모리 대역의 RPC당 지연 (기본 0)')
+    parser.add_argument('--seed-items', type=int, default=0, help=f'{DEFAULT_USER} 사용자에게 미리 넣을 아이템 수')
+    parser.add_argument('--seed-users', type=int, default=0,
+                        help=f'아이템을 --seed-items개씩 넣을 사용자 수 ({bench_user_id(0)}부터)')
+    args = parser.parse_args()
+
+    import uvicorn
+
+    db = InMemoryFirestore(latency=args.latency_ms / 1000) if args.firestore == 'memory' else None
+    if db is not None:
+        # 대역의 아이템은 모두 서버가 쓰므로 expiration_at 백필이 끝난 배포와 같음
+        mark_expiration_backfilled(db)
+    if db is not None and args.seed_items:
+        seed_food_items(db, count=args.seed_items)
+        for index in range(args.seed_users):
+            seed_food_items(db, bench_user_id(index), count=args.seed_items, seed=index + 1)
+    app = create_local_app(db, args.firestore)
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+유통기한 알림 스윕 벤치마크
+메모리 Firestore 대역에 합성 아이템 N개를 넣고 ExpiryNotificationScheduler.sweep을 실행해
+처리 시간, Firestore RPC 수, 스윕 중 최대 메모리(tracemalloc, 대역에 적재된 데이터와 대역의 쿼리 결과 계산 제외)를 측정
+같은 날 두 번째 스윕에서 중복 발송이 없는지도 확인
+
+사용법:
+    cd fastapi-backend
+    python benchmarks/notification_sweep_bench.py --items 200000
+    python benchmarks/notification_sweep_bench.py --items 1000000 --page-size 1000 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from local_firestore import InMemoryFirestore  # noqa: E402
+from local_server import mark_expiration_backfilled  # noqa: E402
+from services.expiration import start_of_day, today  # noqa: E402
+from services.notifications import ExpiryNotificationScheduler  # noqa: E402
+
+SEED_CHUNK = 100000
+FOOD_NAMES = ['대파', '양파', '우유', '계란', '두부', '돼지고기', '사과', '요거트', '김치', '만두']
+
+
+class CountingPushSender:
+    """메시지를 보관하지 않고 개수만 세는 발송기 (발송기 메모리가 측정에 섞이지 않도록)"""
+
+    def __init__(self):
+        self.messages = 0
+
+    def send(self, messages):
+        self.messages += len(messages)
+        return [True] * len(messages)
+
+
+def seed(db, items, users, token_ratio, rng):
+    """사용자 users명에게 아이템 items개를 나눠 넣음 (유통기한은 오늘 -10일 ~ +50일)"""
+    base = today()
+    documents = {}
+    for index in range(items):
+        user_id = f'user{rng.randrange(users):07d}'
+        expiration = start_of_day(base + timedelta(days=rng.randint(-10, 50)))
+        documents[f'users/{user_id}/food_items/item{index:08d}'] = {
+            'name': rng.choice(FOOD_NAMES),
+            'expiration_at': expiration,
+        }
+        if len(documents) >= SEED_CHUNK:
+            db.load(documents)
+            documents = {}
+    for user_index in range(users):
+        if rng.random() < token_ratio:
+            documents[f'users/user{user_index:07d}'] = {'expoPushToken': f'ExponentPushToken[{user_index}]'}
+    db.load(documents)
+
+
+def run_sweep(db, scheduler, trace):
+    # 대역이 쿼리 결과를 처음 계산할 때 쓰는 메모리는 제외 (실제 Firestore는 서버에서 페이지 단위로 처리)
+    list(scheduler.due_query(today()).limit(1).stream())
+    db.reset_stats()
+    if trace:
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+    started_at = time.perf_counter()
+    stats = scheduler.sweep()
+    elapsed = time.perf_counter() - started_at
+    peak_mb = None
+    if trace:
+        peak_mb = (tracemalloc.get_traced_memory()[1] - baseline) / 2**20
+        tracemalloc.stop()
+    return {**stats, 'elapsed_s': elapsed, 'peak_mb': peak_mb, 'firestore': db.stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="유통기한 알림 스윕 벤치마크")
+    parser.add_argument('--items', type=int, default=200000, help='전체 아이템 수 (기본 200000)')
+    parser.add_argument('--users', type=int, default=None, help='사용자 수 (기본 아이템 수 / 10)')
+    parser.add_argument('--page-size', type=int, default=1000, help='쿼리 페이지 크기 (기본 1000)')
+    parser.add_argument('--flush-users', type=int, default=100, help='발송 묶음 사용자 수 (기본 100)')
+    parser.add_argument('--token-ratio', type=float, default=0.9, help='푸시 토큰이 있는 사용자 비율')
+    parser.add_argument('--no-trace', action='store_true', help='tracemalloc 없이 시간만 측정')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON 한 줄로 출력')
+    args = parser.parse_args()
+
+    users = args.users or max(1, args.items // 10)
+    db = InMemoryFirestore()
+    started_at = time.perf_counter()
+    seed(db, args.items, users, args.token_ratio, random.Random(42))
+    mark_expiration_backfilled(db)
+    seed_s = time.perf_counter() - started_at
+
+    sender = CountingPushSender()
+    scheduler = ExpiryNotificationScheduler(db, sender, page_size=args.page_size, flush_users=args.flush_users)
+    first = run_sweep(db, scheduler, trace=not args.no_trace)
+    second = run_sweep(db, scheduler, trace=False)
+    result = {'items': args.items, 'users': users, 'page_size': args.page_size, 'seed_s': seed_s,
+              'first': first, 'second': second}
+
+    if args.json:
+        print(json.dumps(result))
+        return
+    print(f"📦 아이템 {args.items}개, 사용자 {users}명 적재 {seed_s:.1f}초 (페이지 {args.page_size}개)")
+    for label, sweep in (('첫 스윕', first), ('같은 날 재실행', second)):
+        rate = sweep['items'] / sweep['elapsed_s'] if sweep['elapsed_s'] else 0.0
+        memory = f", 최대 메모리 {sweep['peak_mb']:.1f}MB" if sweep['peak_mb'] is not None else ''
+        print(f"   {label}: 대상 아이템 {sweep['items']}개 / 사용자 {sweep['users']}명, 발송 {sweep['sent']}, "
+              f"중복 생략 {sweep['duplicates']}, 토큰 없음 {sweep['no_token']} - {sweep['elapsed_s']:.1f}초 "
+              f"({rate:.0f} 아이템/초, RPC {sweep['firestore']['rpcs']}회{memory})")
+
+
+if __name__ == "__main__":
+    main()
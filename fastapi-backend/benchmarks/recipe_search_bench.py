@@ -0,0 +1,199 @@
+"""
+레시피 검색 색인 벤치마크
+합성 레시피 N개(기본 100000)를 메모리 Firestore 대역에 넣고 RecipeSearchService로
+
+- 색인 생성 시간과 색인 메모리(tracemalloc)
+- 검색 지연 p50/p99 (1글자/2글자/여러 글자/여러 단어 검색어), 앱처럼 전체 레시피를 부분 문자열로 거르는 방식과 비교
+- 크롤러 동기화 후 증분 갱신 시간 (변경/추가/삭제 비율), 갱신한 색인과 새로 만든 색인의 검색 결과가 같은지
+
+를 측정
+
+사용법:
+    cd fastapi-backend
+    python benchmarks/recipe_search_bench.py --recipes 100000
+    python benchmarks/recipe_search_bench.py --recipes 20000 --queries 500 --json
+    (tracemalloc을 켜면 색인 생성이 몇 배 느려지므로 생성 시간은 --no-trace로 측정)
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from load_test import percentile  # noqa: E402
+from local_firestore import InMemoryFirestore  # noqa: E402
+from services.recipe_search import RECIPE_SYNC_COLLECTION, RECIPE_SYNC_DOCUMENT, RecipeSearchService  # noqa: E402
+
+MODIFIERS = ['돼지고기', '소고기', '차돌', '참치', '꽁치', '버섯', '애호박', '두부', '해물', '닭', '오징어', '새우',
+             '김치', '감자', '콩나물', '묵은지', '매콤', '얼큰', '간단', '초간단', '백종원', '자취생', '다이어트', '우렁']
+DISHES = ['찌개', '볶음', '조림', '전', '국', '탕', '무침', '볶음밥', '덮밥', '비빔밥', '샐러드', '파스타', '스테이크',
+          '카레', '떡볶이', '김밥', '라면', '수제비', '칼국수', '잡채', '부침개', '장아찌', '구이', '샌드위치']
+INGREDIENTS = ['대파', '양파', '마늘', '간장', '고추장', '된장', '고춧가루', '설탕', '참기름', '들기름', '소금', '후추',
+               '계란', '두부', '감자', '당근', '애호박', '버섯', '김치', '돼지고기', '소고기', '닭가슴살', '오징어',
+               '새우', '쪽파', '청양고추', '깨', '올리고당', '식용유', '버터', '우유', '치즈', '베이컨', '스파게티면']
+UNITS = ['1큰술', '2큰술', '1/2개', '1개', '200g', '약간', '1컵', '300ml', '']
+TAGS = ['자취요리', '밑반찬', '국물요리', '술안주', '아이반찬', '간단요리', '손님상', '도시락', '다이어트', '야식']
+CATEGORIES = ['한식', '양식', '일식', '중식']
+
+
+def synthetic_recipe(rng, index):
+    name = f"{rng.choice(MODIFIERS)} {rng.choice(DISHES)}"
+    if rng.random() < 0.3:
+        name = f"{rng.choice(MODIFIERS)} {name}"
+    ingredients = [f"{name} {rng.choice(UNITS)}".strip() for name in rng.sample(INGREDIENTS, rng.randint(4, 12))]
+    recipe = {
+        'name': name,
+        'ingredients': ingredients,
+        'tags': rng.sample(TAGS, rng.randint(0, 3)),
+        'category': rng.choice(CATEGORIES),
+        'steps': ['재료를 손질합니다.', '양념을 넣고 끓입니다.'],
+        'cookingTime': rng.randint(15, 120),
+    }
+    recipe['contentHash'] = f'{index}-{rng.random()}'
+    return recipe
+
+
+def sample_queries(rng, count):
+    """1글자(재료 글자), 2글자, 여러 글자, 두 단어 검색어를 고르게"""
+    queries = []
+    for index in range(count):
+        kind = index % 4
+        word = rng.choice(MODIFIERS + DISHES + INGREDIENTS)
+        if kind == 0:
+            queries.append(rng.choice(word))
+        elif kind == 1 and len(word) >= 2:
+            start = rng.randrange(len(word) - 1)
+            queries.append(word[start:start + 2])
+        elif kind == 3:
+            queries.append(f"{rng.choice(MODIFIERS)} {rng.choice(DISHES)}")
+        else:
+            queries.append(word)
+    return queries
+
+
+def naive_search(recipes, query):
+    """앱이 하던 방식: 모든 레시피의 이름/재료/태그를 부분 문자열로 확인"""
+    words = query.lower().split()
+    return [recipe_id for recipe_id, recipe in recipes.items()
+            if all(any(word in text.lower() for text in [recipe['name'], *recipe['ingredients'], *recipe['tags']])
+                   for word in words)]
+
+
+def timed_queries(service, queries, limit):
+    latencies = []
+    for query in queries:
+        started_at = time.perf_counter()
+        service.search(query, limit=limit)
+        latencies.append(time.perf_counter() - started_at)
+    return latencies
+
+
+def result_signature(service, queries):
+    signature = []
+    for query in queries:
+        result = service.search(query, limit=20)
+        signature.append((result['total'], [(item['id'], round(item['score'], 6)) for item in result['items']],
+                          result['facets']))
+    return signature
+
+
+def main():
+    parser = argparse.ArgumentParser(description="레시피 검색 색인 벤치마크")
+    parser.add_argument('--recipes', type=int, default=100000, help='레시피 수 (기본 100000)')
+    parser.add_argument('--queries', type=int, default=1000, help='검색어 수 (기본 1000)')
+    parser.add_argument('--limit', type=int, default=20, help='페이지 크기 (기본 20)')
+    parser.add_argument('--change-ratio', type=float, default=0.01, help='동기화로 바뀌는 레시피 비율 (기본 1%%)')
+    parser.add_argument('--naive-queries', type=int, default=20, help='부분 문자열 전체 스캔과 비교할 검색어 수')
+    parser.add_argument('--no-trace', action='store_true', help='tracemalloc 없이 색인 생성 시간만 측정')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON 한 줄로 출력')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    recipes = {f'recipe_{index:07d}': synthetic_recipe(rng, index) for index in range(args.recipes)}
+    db = InMemoryFirestore()
+    db.load({f'recipes/{recipe_id}': recipe for recipe_id, recipe in recipes.items()})
+    queries = sample_queries(rng, args.queries)
+
+    service = RecipeSearchService(db=db, refresh_interval=float('inf'))
+    if not args.no_trace:
+        tracemalloc.start()
+    started_at = time.perf_counter()
+    service.refresh()
+    build_s = time.perf_counter() - started_at
+    index_mb = None
+    if not args.no_trace:
+        index_mb = tracemalloc.get_traced_memory()[0] / 2**20
+        tracemalloc.stop()
+
+    timed_queries(service, queries[:50], args.limit)  # 워밍업
+    latencies = timed_queries(service, queries, args.limit)
+    totals = [service.search(query, limit=1)['total'] for query in queries]
+
+    naive = queries[:args.naive_queries]
+    started_at = time.perf_counter()
+    for query in naive:
+        naive_search(recipes, query)
+    naive_ms = (time.perf_counter() - started_at) / max(1, len(naive)) * 1000
+
+    # 크롤러 동기화 흉내: 일부 변경/추가/삭제 후 표식 갱신
+    changes = max(1, int(args.recipes * args.change_ratio))
+    ids = list(recipes)
+    updates = {}
+    for recipe_id in rng.sample(ids, changes):
+        updates[f'recipes/{recipe_id}'] = recipes[recipe_id] = synthetic_recipe(rng, args.recipes + len(updates))
+    for index in range(changes // 2):
+        recipe_id = f'recipe_new_{index:07d}'
+        updates[f'recipes/{recipe_id}'] = recipes[recipe_id] = synthetic_recipe(rng, -index)
+    deleted = rng.sample([recipe_id for recipe_id in ids if f'recipes/{recipe_id}' not in updates], changes // 2)
+    updates[f'{RECIPE_SYNC_COLLECTION}/{RECIPE_SYNC_DOCUMENT}'] = {'syncedAt': datetime.now(timezone.utc)}
+    db.load(updates)
+    for recipe_id in deleted:
+        db.collection('recipes').document(recipe_id).delete()
+        del recipes[recipe_id]
+    db.reset_stats()
+    started_at = time.perf_counter()
+    applied = service.refresh()
+    refresh_s = time.perf_counter() - started_at
+    refresh_reads = db.stats()['document_reads']
+
+    fresh = RecipeSearchService(db=db, refresh_interval=float('inf'))
+    fresh.refresh()
+    check = queries[:200]
+    consistent = result_signature(service, check) == result_signature(fresh, check)
+
+    result = {
+        'recipes': args.recipes,
+        'build_s': build_s,
+        'index_mb': index_mb,
+        'terms': len(service.get_index().postings),
+        'queries': len(queries),
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'mean_ms': statistics.mean(latencies) * 1000,
+        'median_total': statistics.median(totals),
+        'naive_scan_ms': naive_ms,
+        'refresh': {**applied, 'seconds': refresh_s, 'document_reads': refresh_reads},
+        'refresh_consistent': consistent,
+    }
+    if args.json:
+        print(json.dumps(result))
+        return
+    memory = f", 메모리 {index_mb:.0f}MB" if index_mb is not None else ''
+    print(f"🔎 레시피 {args.recipes}개 색인 {build_s:.1f}초, {result['terms']}개 n-gram{memory}")
+    print(f"   검색 {len(queries)}회: p50 {result['p50_ms']:.2f}ms / p99 {result['p99_ms']:.2f}ms "
+          f"(평균 {result['mean_ms']:.2f}ms, 결과 수 중앙값 {result['median_total']:.0f})")
+    print(f"   전체 부분 문자열 스캔(앱 방식): 검색 1회 {naive_ms:.0f}ms")
+    print(f"   동기화 반영: 변경/추가 {applied['upserted']}개, 삭제 {applied['deleted']}개 - {refresh_s:.2f}초 "
+          f"(문서 읽기 {refresh_reads}회), 새로 만든 색인과 결과 {'일치' if consistent else '불일치'}")
+
+
+if __name__ == "__main__":
+    main()
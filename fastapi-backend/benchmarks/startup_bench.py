@@ -0,0 +1,138 @@
+"""
+서버 시작 시간 벤치마크
+새 프로세스에서 측정해 콜드 스타트(스케일 투 제로 배포에서 첫 요청이 들어올 때)와 같은 조건을 만듦
+
+- import: `import main`에 걸린 시간과 그때 Firebase/gRPC 패키지가 불러와졌는지
+- 첫 응답: 프로세스 시작부터 /health가 처음 200을 돌려줄 때까지, 그리고 첫 인증 요청(음식 아이템 목록)이 끝날 때까지
+  (서버는 benchmarks/local_server.py로 실행, Firestore는 메모리 대역 또는 에뮬레이터)
+
+사용법:
+    cd fastapi-backend
+    python benchmarks/startup_bench.py --runs 5
+    python benchmarks/startup_bench.py --warmup blocking --json
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python benchmarks/startup_bench.py --firestore emulator
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOCAL_SERVER = os.path.join(BACKEND_DIR, 'benchmarks', 'local_server.py')
+HEAVY_PACKAGES = ('firebase_admin', 'google.cloud.firestore', 'grpc')
+POLL_INTERVAL = 0.005
+STARTUP_TIMEOUT = 60.0
+
+IMPORT_PROBE = f"""
+import json, sys, time
+sys.path.insert(0, {BACKEND_DIR!r})
+started_at = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started_at
+print(json.dumps({{'import_ms': elapsed * 1000, 'heavy_loaded': [name for name in {HEAVY_PACKAGES!r} if name in sys.modules]}}))
+"""
+
+
+def measure_import():
+    completed = subprocess.run([sys.executable, '-c', IMPORT_PROBE], capture_output=True, text=True,
+                               check=True, cwd=BACKEND_DIR)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def get(port, path, token=None):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        connection.request('GET', path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    finally:
+        connection.close()
+
+
+def measure_first_response(firestore, warmup, seed_items):
+    """서버 프로세스를 새로 띄워 (첫 /health 응답까지, 첫 목록 응답까지, 첫 목록 요청 자체의 지연) 측정"""
+    port = free_port()
+    command = [sys.executable, LOCAL_SERVER, '--port', str(port), '--firestore', firestore,
+               '--seed-items', str(seed_items)]
+    env = {**os.environ, 'STARTUP_WARMUP': warmup}
+    started_at = time.perf_counter()
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"서버가 시작하지 못했습니다: {process.stderr.read().decode('utf-8', 'replace')}")
+            if time.perf_counter() - started_at > STARTUP_TIMEOUT:
+                raise RuntimeError("서버 시작 시간이 초과되었습니다.")
+            try:
+                if get(port, '/health') == 200:
+                    break
+            except OSError:
+                time.sleep(POLL_INTERVAL)
+        health_at = time.perf_counter()
+        status = get(port, '/api/food-items/?limit=20', token='bench-user')
+        if status != 200:
+            raise RuntimeError(f"첫 목록 요청이 실패했습니다 (HTTP {status})")
+        data_at = time.perf_counter()
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return {
+        'health_ms': (health_at - started_at) * 1000,
+        'first_data_ms': (data_at - started_at) * 1000,
+        'first_request_ms': (data_at - health_at) * 1000,
+    }
+
+
+def summarize(samples, key):
+    return statistics.median(sample[key] for sample in samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 시작 시간 벤치마크")
+    parser.add_argument('--runs', type=int, default=5, help='반복 횟수 (중앙값 보고, 기본 5)')
+    parser.add_argument('--firestore', choices=['memory', 'emulator'], default='memory', help='Firestore 대역')
+    parser.add_argument('--warmup', choices=['background', 'blocking', 'off'], default='background',
+                        help='STARTUP_WARMUP 설정 (기본 background)')
+    parser.add_argument('--seed-items', type=int, default=200, help='첫 목록 요청 사용자의 아이템 수 (메모리 대역)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON 한 줄로 출력')
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    responses = [measure_first_response(args.firestore, args.warmup, args.seed_items) for _ in range(args.runs)]
+    result = {
+        'runs': args.runs,
+        'firestore': args.firestore,
+        'warmup': args.warmup,
+        'import_ms': summarize(imports, 'import_ms'),
+        'heavy_loaded_at_import': imports[0]['heavy_loaded'],
+        'health_ms': summarize(responses, 'health_ms'),
+        'first_data_ms': summarize(responses, 'first_data_ms'),
+        'first_request_ms': summarize(responses, 'first_request_ms'),
+    }
+    if args.json:
+        print(json.dumps(result))
+        return
+    print(f"🚀 시작 시간 ({args.runs}회 중앙값, Firestore {args.firestore}, 워밍업 {args.warmup})")
+    loaded = ', '.join(result['heavy_loaded_at_import']) or '없음'
+    print(f"   import main {result['import_ms']:.0f}ms (import 시 불러온 Firebase/gRPC 패키지: {loaded})")
+    print(f"   첫 /health 응답 {result['health_ms']:.0f}ms, 첫 목록 응답 {result['first_data_ms']:.0f}ms "
+          f"(요청 자체 {result['first_request_ms']:.1f}ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,58 @@
-import firebase_admin
-from firebase_admin import credentials, auth, firestore
 import os
+import threading
 from functools import lru_cache
 
-# Firebase Admin SDK 초기화
-cred = credentials.Certificate("path/to/serviceAccountKey.json")
-firebase_admin.initialize_app(cred)
+# Firebase Admin SDK 설정
+#   FIREBASE_CREDENTIALS: 서비스 계정 키 파일 경로
+#   FIREBASE_PROJECT_ID: 프로젝트 ID (없으면 키 파일 또는 GOOGLE_CLOUD_PROJECT에서 찾음)
+#   FIRESTORE_EMULATOR_HOST / FIREBASE_AUTH_EMULATOR_HOST: 로컬 에뮬레이터에 연결 (키 파일 불필요)
+FIREBASE_CREDENTIALS = os.getenv('FIREBASE_CREDENTIALS', 'path/to/serviceAccountKey.json')
+FIREBASE_PROJECT_ID = os.getenv('FIREBASE_PROJECT_ID') or os.getenv('GOOGLE_CLOUD_PROJECT')
+
+_app_lock = threading.Lock()
+
+def using_emulator() -> bool:
+    return bool(os.getenv('FIRESTORE_EMULATOR_HOST'))
+
+def get_firebase_app():
+    """Firebase Admin 앱 (처음 호출될 때 초기화)
+
+    firebase_admin과 gRPC/Firestore 패키지는 여기서 처음 import되므로
+    main을 import하거나 서버가 포트를 여는 동안에는 키 파일을 읽지 않음
+    """
+    import firebase_admin
+    from firebase_admin import credentials
+
+    with _app_lock:
+        try:
+            return firebase_admin.get_app()
+        except ValueError:
+            pass
+        options = {'projectId': FIREBASE_PROJECT_ID} if FIREBASE_PROJECT_ID else None
+        if using_emulator() and not os.path.exists(FIREBASE_CREDENTIALS):
+            # 에뮬레이터는 서명된 키가 필요 없음 (프로젝트 ID만 있으면 됨)
+            return firebase_admin.initialize_app(options=options or {'projectId': 'demo-eatsoon'})
+        return firebase_admin.initialize_app(credentials.Certificate(FIREBASE_CREDENTIALS), options)
 
 @lru_cache()
 def get_firestore_client():
-    return firestore.client()
+    app = get_firebase_app()
+    if using_emulator():
+        # firebase_admin.firestore.client()는 에뮬레이터에서도 실제 자격 증명을 요구하므로 직접 생성
+        from google.cloud import firestore as cloud_firestore
+        return cloud_firestore.Client(project=app.project_id)
+    from firebase_admin import firestore
+    return firestore.client(app)
 
 def verify_firebase_token(token: str):
-    """Firebase ID 토큰 검증"""
+    """Firebase ID 토큰 검증
+
+    서명 검증용 공개 키는 firebase_admin이 Cache-Control을 따르는 HTTP 세션(cachecontrol)으로
+    가져오므로 max-age 동안은 다시 내려받지 않음. 같은 토큰의 반복 검증은 middleware.auth의 캐시가 생략
+    """
+    from firebase_admin import auth
     try:
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = auth.verify_id_token(token, app=get_firebase_app())
         return decoded_token
     except Exception as e:
-        raise Exception(f"Token verification failed: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Token verification failed: {str(e)}")
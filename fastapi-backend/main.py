@@ -1,8 +1,59 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from typing import Optional
 from routes.food_items import router as food_items_router
+from routes.recommendations import router as recommendations_router
+from routes.recipes import router as recipes_router
+from routes.stats import router as stats_router
+from middleware.auth import token_cache
+from services.metrics import PROFILE_TOKEN, MetricsMiddleware, TimedJSONResponse, recent_profiles, registry
+from services.firestore import close_firestore_service, get_async_firestore_service
+from services.recommendation import close_recommendation_service, get_async_recommendation_service
+from services.recipe_search import close_recipe_search_service, get_async_recipe_search_service
 
-app = FastAPI(title="음식물 재고 관리 API", version="1.0.0")
+logger = logging.getLogger(__name__)
+
+# 시작 시 Firebase 앱/Firestore 클라이언트 준비 방식
+#   background (기본): 포트를 먼저 열고 별도 스레드에서 준비 (준비 전에 온 요청은 준비가 끝날 때까지 대기)
+#   blocking: 준비를 마친 뒤 포트를 엶 (readiness 검사가 있는 배포용)
+#   off: 첫 요청에서 준비
+STARTUP_WARMUP = os.getenv('STARTUP_WARMUP', 'background')
+
+def warm_up(app: FastAPI):
+    """라우트가 주입받을 서비스를 미리 만들어 첫 요청 지연을 줄임 (dependency_overrides가 있으면 그쪽 사용)"""
+    providers = (get_async_firestore_service, get_async_recommendation_service, get_async_recipe_search_service)
+    for provider in providers:
+        try:
+            app.dependency_overrides.get(provider, provider)()
+        except Exception as e:
+            # 실패해도 서버는 뜨고, 첫 요청에서 다시 시도
+            logger.warning("워밍업 실패 (%s): %s", provider.__name__, e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup = None
+    if STARTUP_WARMUP == 'blocking':
+        await asyncio.to_thread(warm_up, app)
+    elif STARTUP_WARMUP == 'background':
+        warmup = asyncio.get_running_loop().run_in_executor(None, warm_up, app)
+    yield
+    if warmup is not None:
+        await warmup
+    close_firestore_service()
+    close_recommendation_service()
+    close_recipe_search_service()
+
+app = FastAPI(
+    title="음식물 재고 관리 API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
+)
 
 # CORS 설정
 app.add_middleware(
@@ -13,8 +64,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 지연/단계별 시간/오류 수 기록 (가장 바깥에서 측정하도록 마지막에 추가)
+app.add_middleware(MetricsMiddleware)
+
 # 라우터 등록
 app.include_router(food_items_router)
+app.include_router(recommendations_router)
+app.include_router(recipes_router)
+app.include_router(stats_router)
 
 @app.get("/")
 async def root():
@@ -22,7 +79,19 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "token_cache": token_cache.stats()}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 텍스트 형식 메트릭 (요청 지연, 토큰 확인/Firestore 호출/직렬화 시간, 처리 중 요청 수, 오류 수)"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/metrics/profiles", include_in_schema=False)
+async def metrics_profiles(x_profile: Optional[str] = Header(None)):
+    """X-Profile 헤더로 프로파일한 느린 요청들의 샘플 (접힌 스택 → 샘플 수, PROFILE_TOKEN이 있어야 조회)"""
+    if not PROFILE_TOKEN or x_profile != PROFILE_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return list(recent_profiles)
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,18 +1,113 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from config.firebase import verify_firebase_token
+from services.metrics import TOKEN_VERIFICATION, record_phase, registry
 
 security = HTTPBearer()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """현재 사용자 정보 가져오기"""
+# 검증된 토큰 캐시 최대 개수 (가장 오래 사용하지 않은 토큰부터 제거)
+TOKEN_CACHE_MAX_SIZE = int(os.getenv('TOKEN_CACHE_MAX_SIZE', '10000'))
+
+class VerifiedTokenCache:
+    """검증이 끝난 ID 토큰의 디코딩 결과 캐시
+
+    - 키는 토큰 원문 대신 sha256 해시
+    - 토큰의 exp 시각이 지나면 만료 (만료된 토큰은 다시 검증되어 거부됨)
+    - max_size를 넘으면 LRU로 제거
+    """
+
+    def __init__(self, max_size: int = TOKEN_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # 토큰 해시 → (만료 시각, 디코딩 결과)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, token: str):
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, decoded_token: dict):
+        expires_at = decoded_token.get('exp')
+        if not expires_at or expires_at <= time.time():
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, decoded_token)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+            }
+
+token_cache = VerifiedTokenCache()
+
+TOKEN_CACHE_ENTRIES = registry.gauge('auth_token_cache_entries', '검증된 토큰 캐시에 든 토큰 수')
+TOKEN_CACHE_LOOKUPS = registry.counter('auth_token_cache_lookups_total', '토큰 캐시 조회 수', ('result',))
+
+def _collect_token_cache_metrics():
+    stats = token_cache.stats()
+    TOKEN_CACHE_ENTRIES.set(stats['size'])
+    TOKEN_CACHE_LOOKUPS.set(stats['hits'], result='hit')
+    TOKEN_CACHE_LOOKUPS.set(stats['misses'], result='miss')
+
+registry.add_collector(_collect_token_cache_metrics)
+
+async def get_token_verifier() -> Callable[[str], dict]:
+    """ID 토큰 검증 함수 (테스트/벤치마크에서는 app.dependency_overrides로 교체)"""
+    return verify_firebase_token
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    verify_token: Callable[[str], dict] = Depends(get_token_verifier),
+):
+    """현재 사용자 정보 가져오기 (같은 토큰은 만료 전까지 서명 검증 생략)"""
+    started_at = time.perf_counter()
+    result = 'cache_hit'
     try:
         token = credentials.credentials
-        decoded_token = verify_firebase_token(token)
+        decoded_token = token_cache.get(token)
+        if decoded_token is None:
+            result = 'verified'
+            decoded_token = verify_token(token)
+            token_cache.put(token, decoded_token)
         return decoded_token
     except Exception as e:
+        result = 'invalid'
         raise HTTPException(
             status_code=401,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
+    finally:
+        elapsed = time.perf_counter() - started_at
+        TOKEN_VERIFICATION.observe(elapsed, result=result)
+        record_phase('auth', elapsed)
@@ -0,0 +1,70 @@
+"""
+expiration_at 백필 마이그레이션
+기존 food_items 문서의 expiration_date(앱이 직접 쓴 문서는 expirationDate) 문자열을 expiration_at 타임스탬프로 변환해 채움
+(expiration_at이 없거나 값이 다른 문서만 WriteBatch 500개 단위로 수정, 여러 번 실행해도 안전)
+끝까지 마치면 migrations/expiration_at 표식을 써서, 서버가 그때부터 expiration_at 정렬/범위 쿼리를 사용
+(표식 전에는 목록 페이지/임박 조회/알림이 아이템을 모두 읽어 메모리에서 거름)
+expiration_at을 쓰기 전의 앱 버전이 문서를 추가했다면 다시 실행해 채울 것
+
+사용법:
+    cd fastapi-backend
+    python migrations/backfill_expiration_at.py --dry-run   # 변경 대상 수만 확인
+    python migrations/backfill_expiration_at.py
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.firebase import get_firestore_client  # noqa: E402
+from services.expiration import APP_TIMEZONE, EXPIRATION_READ_FIELDS, source_expiration  # noqa: E402
+from services.firestore import EXPIRATION_FIELD, FIRESTORE_BATCH_LIMIT, expiration_migration_ref  # noqa: E402
+
+
+def backfill(db, dry_run=False):
+    """모든 사용자의 food_items를 훑어 expiration_at 갱신하고 표식을 씀, (검사 수, 변경 수, 해석 실패 수) 반환"""
+    scanned = changed = unparsed = 0
+    batch, pending = db.batch(), 0
+    docs = db.collection_group('food_items').select(list(EXPIRATION_READ_FIELDS)).stream()
+    for doc in docs:
+        scanned += 1
+        data = doc.to_dict() or {}
+        expiration_at = source_expiration(data)
+        if expiration_at is None:
+            unparsed += 1
+        if EXPIRATION_FIELD in data and data[EXPIRATION_FIELD] == expiration_at:
+            continue
+        changed += 1
+        if dry_run:
+            continue
+        batch.update(doc.reference, {EXPIRATION_FIELD: expiration_at})
+        pending += 1
+        if pending == FIRESTORE_BATCH_LIMIT:
+            batch.commit()
+            batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
+    if not dry_run:
+        expiration_migration_ref(db).set({
+            'completedAt': datetime.now(APP_TIMEZONE),
+            'scanned': scanned,
+            'changed': changed,
+        })
+    return scanned, changed, unparsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="food_items expiration_at 백필")
+    parser.add_argument('--dry-run', action='store_true', help='쓰지 않고 변경 대상 수만 출력')
+    args = parser.parse_args()
+
+    scanned, changed, unparsed = backfill(get_firestore_client(), dry_run=args.dry_run)
+    action = "변경 예정" if args.dry_run else "변경"
+    print(f"✅ 검사 {scanned}개, {action} {changed}개, 날짜 해석 실패 {unparsed}개 (expiration_at = null)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+음식 아이템 통계 집계 문서 재계산
+집계 문서(users/{uid}/stats/food_items)가 도입되기 전의 아이템이나, 앱이 Firestore에 직접 쓴 변경을 반영
+(사용자별로 현재 아이템을 모두 읽어 total/byCategory/byExpiryDate를 다시 쓰고 monthly 이력은 유지, 여러 번 실행해도 안전)
+
+사용법:
+    cd fastapi-backend
+    python migrations/rebuild_food_item_stats.py              # 아이템이 있는 모든 사용자
+    python migrations/rebuild_food_item_stats.py --user <uid>
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.firebase import get_firestore_client  # noqa: E402
+from services.firestore import FirestoreService  # noqa: E402
+from services.stats import STATS_COLLECTION  # noqa: E402
+
+
+def user_ids(db):
+    """아이템이나 통계 문서가 있는 사용자 ID (문서 내용은 읽지 않음)"""
+    ids = set()
+    for collection in ('food_items', STATS_COLLECTION):
+        for doc in db.collection_group(collection).select([]).stream():
+            ids.add(doc.reference.parent.parent.id)
+    return sorted(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="음식 아이템 통계 재계산")
+    parser.add_argument('--user', default=None, help='이 사용자만 재계산')
+    args = parser.parse_args()
+
+    service = FirestoreService(db=get_firestore_client())
+    targets = [args.user] if args.user else user_ids(service.db)
+    for index, user_id in enumerate(targets, 1):
+        stats = service.rebuild_food_item_stats(user_id)
+        print(f"  [{index}/{len(targets)}] {user_id}: 아이템 {stats['total']}개")
+    print(f"✅ 사용자 {len(targets)}명의 통계를 다시 계산했습니다.")
+
+
+if __name__ == "__main__":
+    main()
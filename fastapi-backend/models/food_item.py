@@ -1,7 +1,10 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, model_validator
+from typing import List, Optional
 from datetime import datetime
 
+# 일괄 요청 한 번에 담을 수 있는 생성/수정/삭제 항목 수 합계
+MAX_BATCH_ITEMS = 500
+
 class FoodItemBase(BaseModel):
     name: str
     expiration_date: str
@@ -23,4 +26,19 @@ class FoodItemResponse(FoodItemBase):
     user_id: str
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class FoodItemBatchUpdate(FoodItemUpdate):
+    id: str
+
+class FoodItemBatchRequest(BaseModel):
+    create: List[FoodItemCreate] = []
+    update: List[FoodItemBatchUpdate] = []
+    delete: List[str] = []
+    
+    @model_validator(mode='after')
+    def check_size(self):
+        total = len(self.create) + len(self.update) + len(self.delete)
+        if total > MAX_BATCH_ITEMS:
+            raise ValueError(f"일괄 요청은 최대 {MAX_BATCH_ITEMS}개 항목까지 가능합니다 (요청 {total}개).")
+        return self
@@ -1,7 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from models.food_item import FoodItemCreate, FoodItemUpdate, FoodItemResponse
-from services.firestore import firestore_service
+import json
+import time
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Iterable, Optional
+from models.food_item import FoodItemCreate, FoodItemUpdate, FoodItemResponse, FoodItemBatchRequest
+from services.cache import CACHE_MAX_BODY_BYTES, etag_matches
+from services.expiration import today
+from services.firestore import (
+    AsyncFirestoreService, FirestoreService, FoodItemStream, MAX_PAGE_SIZE, get_async_firestore_service,
+)
+from services.metrics import record_phase, timed_phase
 from middleware.auth import get_current_user
 
 router = APIRouter(prefix="/api/food-items", tags=["food-items"])
@@ -9,11 +18,12 @@ router = APIRouter(prefix="/api/food-items", tags=["food-items"])
 @router.post("/", response_model=dict)
 async def create_food_item(
     food_item: FoodItemCreate,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    service: AsyncFirestoreService = Depends(get_async_firestore_service)
 ):
     """음식 아이템 생성"""
     try:
-        item_id = firestore_service.create_food_item(current_user['uid'], food_item)
+        item_id = await service.create_food_item(current_user['uid'], food_item)
         return {"id": item_id, "message": "음식 아이템이 생성되었습니다."}
     except Exception as e:
         raise HTTPException(
@@ -21,12 +31,176 @@ async def create_food_item(
             detail=str(e)
         )
 
-@router.get("/", response_model=List[dict])
-async def get_food_items(current_user: dict = Depends(get_current_user)):
-    """사용자의 음식 아이템 목록 조회"""
+@router.post("/batch", response_model=dict)
+async def batch_food_items(
+    batch_request: FoodItemBatchRequest,
+    current_user: dict = Depends(get_current_user),
+    service: AsyncFirestoreService = Depends(get_async_firestore_service)
+):
+    """음식 아이템 일괄 생성/수정/삭제 (요청 1번, 항목 합계 최대 MAX_BATCH_ITEMS개, Firestore 커밋은 500개 단위)"""
+    try:
+        outcome = await service.batch_write_food_items(
+            current_user['uid'],
+            batch_request.create,
+            batch_request.update,
+            batch_request.delete,
+        )
+        results = outcome['results']
+        succeeded = [r for r in results if r['success']]
+        return {
+            "results": results,
+            "created": sum(1 for r in succeeded if r['op'] == 'create'),
+            "updated": sum(1 for r in succeeded if r['op'] == 'update'),
+            "deleted": sum(1 for r in succeeded if r['op'] == 'delete'),
+            "failed": len(results) - len(succeeded),
+            "commits": outcome['commits'],
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+# 캐시된 응답도 매번 ETag로 재검증하도록 (다른 사용자와 공유되는 캐시에는 저장하지 않음)
+CACHE_CONTROL = "private, no-cache"
+
+def _request_key(kind: str, **params) -> str:
+    """캐시 키/ETag용 요청 식별자 (값이 None인 파라미터는 제외, 순서 고정)"""
+    return kind + '?' + '&'.join(f'{name}={value}' for name, value in sorted(params.items()) if value is not None)
+
+def _cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+
+def _cached_json(body: bytes, etag: str) -> Response:
+    return Response(content=body, media_type="application/json", headers=_cache_headers(etag))
+
+def _tee_into_cache(chunks: Iterable[str], service: FirestoreService, user_id: str, version: str, request_key: str):
+    """응답을 흘려보내면서 본문을 모아 끝까지 보낸 뒤 캐시에 저장 (CACHE_MAX_BODY_BYTES 초과 시 저장 안 함)"""
+    parts, size = [], 0
+    for chunk in chunks:
+        if parts is not None:
+            encoded = chunk.encode('utf-8')
+            size += len(encoded)
+            if size <= CACHE_MAX_BODY_BYTES:
+                parts.append(encoded)
+            else:
+                parts = None
+        yield chunk
+    if parts is not None:
+        service.store_response(user_id, version, request_key, b''.join(parts))
+
+def _stream_json(items: FoodItemStream, paginated: bool):
+    """아이템을 하나씩 JSON으로 직렬화해 흘려보냄 (전체 목록을 메모리에 만들지 않음)"""
+    yield '{"items": [' if paginated else '['
+    serialize_seconds = 0.0
+    for index, item in enumerate(items):
+        started_at = time.perf_counter()
+        chunk = (',' if index else '') + json.dumps(jsonable_encoder(item), ensure_ascii=False)
+        serialize_seconds += time.perf_counter() - started_at
+        yield chunk
+    record_phase('serialize', serialize_seconds)
+    if paginated:
+        yield '], "next_cursor": ' + json.dumps(items.next_cursor) + '}'
+    else:
+        yield ']'
+
+@router.get("/")
+async def get_food_items(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    expiring_within_days: Optional[int] = Query(None, ge=0),
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+    service: AsyncFirestoreService = Depends(get_async_firestore_service)
+):
+    """사용자의 음식 아이템 목록 조회
+    
+    - limit을 주면 {"items": [...], "next_cursor": ...} 형태로 유통기한 순 페이지 단위 응답,
+      다음 페이지는 cursor=next_cursor로 요청 (limit이 없으면 기존처럼 정렬 없이 배열 전체)
+    - category, expiring_within_days(오늘부터 N일 이내 유통기한, 지난 것 포함) 필터
+    - fields=name,expiration_date 처럼 필요한 필드만 선택
+    - 응답에 ETag가 붙고, If-None-Match가 같으면 Firestore 조회 없이 304
+    """
+    try:
+        user_id = current_user['uid']
+        request_key = _request_key(
+            'list', limit=limit, cursor=cursor, category=category,
+            expiring_within_days=expiring_within_days, fields=fields,
+            # 유통기한 범위는 오늘 날짜 기준
+            today=today().isoformat() if expiring_within_days is not None else None,
+        )
+        version, etag, body = await service.cached_response(user_id, request_key)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        if body is not None:
+            return _cached_json(body, etag)
+        items = await service.query_food_items(
+            user_id,
+            limit=limit,
+            cursor=cursor,
+            category=category,
+            expiring_within_days=expiring_within_days,
+            fields=[field.strip() for field in fields.split(',') if field.strip()] if fields else None,
+        )
+        return StreamingResponse(
+            _tee_into_cache(
+                _stream_json(items, paginated=limit is not None), service.service, user_id, version, request_key,
+            ),
+            media_type="application/json",
+            headers=_cache_headers(etag),
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@router.get("/expiring")
+async def get_expiring_food_items(
+    within: int = Query(3, ge=0, le=365),
+    include_expired: bool = False,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+    service: AsyncFirestoreService = Depends(get_async_firestore_service)
+):
+    """오늘부터 within일 이내에 유통기한이 끝나는 음식 아이템 (임박한 순, 색인된 범위 쿼리)"""
     try:
-        items = firestore_service.get_food_items(current_user['uid'])
-        return items
+        user_id = current_user['uid']
+        request_key = _request_key(
+            'expiring', within=within, include_expired=include_expired, fields=fields, today=today().isoformat(),
+        )
+        version, etag, body = await service.cached_response(user_id, request_key)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        if body is not None:
+            return _cached_json(body, etag)
+        items = await service.query_expiring_food_items(
+            user_id,
+            within_days=within,
+            include_expired=include_expired,
+            fields=[field.strip() for field in fields.split(',') if field.strip()] if fields else None,
+        )
+        return StreamingResponse(
+            _tee_into_cache(_stream_json(items, paginated=False), service.service, user_id, version, request_key),
+            media_type="application/json",
+            headers=_cache_headers(etag),
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -36,17 +210,29 @@ async def get_food_items(current_user: dict = Depends(get_current_user)):
 @router.get("/{item_id}", response_model=dict)
 async def get_food_item(
     item_id: str,
-    current_user: dict = Depends(get_current_user)
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+    service: AsyncFirestoreService = Depends(get_async_firestore_service)
 ):
-    """특정 음식 아이템 조회"""
+    """특정 음식 아이템 조회 (ETag/If-None-Match 지원)"""
     try:
-        item = firestore_service.get_food_item(current_user['uid'], item_id)
+        user_id = current_user['uid']
+        request_key = _request_key('item', id=item_id)
+        version, etag, body = await service.cached_response(user_id, request_key)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        if body is not None:
+            return _cached_json(body, etag)
+        item = await service.get_food_item(user_id, item_id)
         if not item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="음식 아이템을 찾을 수 없습니다."
             )
-        return item
+        with timed_phase('serialize'):
+            body = JSONResponse(jsonable_encoder(item)).body
+        await service.store_response(user_id, version, request_key, body)
+        return _cached_json(body, etag)
     except HTTPException:
         raise
     except Exception as e:
@@ -59,11 +245,12 @@ async def get_food_item(
 async def update_food_item(
     item_id: str,
     update_data: FoodItemUpdate,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    service: AsyncFirestoreService = Depends(get_async_firestore_service)
 ):
     """음식 아이템 수정"""
     try:
-        success = firestore_service.update_food_item(current_user['uid'], item_id, update_data)
+        success = await service.update_food_item(current_user['uid'], item_id, update_data)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -81,12 +268,20 @@ async def update_food_item(
 @router.delete("/{item_id}", response_model=dict)
 async def delete_food_item(
     item_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    service: AsyncFirestoreService = Depends(get_async_firestore_service)
 ):
     """음식 아이템 삭제"""
     try:
-        firestore_service.delete_food_item(current_user['uid'], item_id)
+        success = await service.delete_food_item(current_user['uid'], item_id)
+        if not success:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="음식 아이템을 찾을 수 없습니다."
+            )
         return {"message": "음식 아이템이 삭제되었습니다."}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
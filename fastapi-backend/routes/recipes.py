@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
+from services.recipe_search import MAX_SEARCH_LIMIT, AsyncRecipeSearchService, get_async_recipe_search_service
+from middleware.auth import get_current_user
+
+router = APIRouter(prefix="/api/recipes", tags=["recipes"])
+
+@router.get("/search", response_model=dict)
+async def search_recipes(
+    q: str = Query(..., min_length=1, max_length=100, description="검색어 (레시피 이름/재료/태그, 부분 일치)"),
+    category: Optional[str] = Query(None, description="카테고리 필터 (한식, 양식 등)"),
+    offset: int = Query(0, ge=0, le=10000),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_LIMIT),
+    current_user: dict = Depends(get_current_user),
+    service: AsyncRecipeSearchService = Depends(get_async_recipe_search_service)
+):
+    """레시피 검색 (검색어의 모든 단어를 포함하는 레시피를 BM25 점수순으로)
+    
+    - 이름/태그/재료의 한글 1~2글자 조각 색인으로 부분 일치 (예: "찌개", "돼지고")
+    - 응답: {total, offset, limit, items: [...], facets: {category: {카테고리: 수}}}
+      facets는 category 필터를 적용하기 전 검색 결과 기준
+    """
+    try:
+        return await service.search(q, category=category, offset=offset, limit=limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
+from services.recommendation import AsyncRecommendationService, get_async_recommendation_service
+from middleware.auth import get_current_user
+
+router = APIRouter(prefix="/api/recommendations", tags=["recommendations"])
+
+@router.get("/", response_model=list)
+async def get_recommendations(
+    top_k: int = Query(20, ge=1, le=100, description="추천할 레시피 수"),
+    max_missing: Optional[int] = Query(None, ge=0, description="허용할 부족 재료 수 상한"),
+    only_full_match: bool = Query(False, description="모든 재료를 가진 레시피만"),
+    current_user: dict = Depends(get_current_user),
+    service: AsyncRecommendationService = Depends(get_async_recommendation_service)
+):
+    """보유 재료 기반 레시피 추천 (유통기한 임박 재료를 많이 쓰는 레시피 우선)"""
+    try:
+        return await service.recommend(
+            current_user['uid'],
+            top_k=top_k,
+            max_missing=max_missing,
+            only_full_match=only_full_match,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
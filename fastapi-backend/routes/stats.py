@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from services.firestore import AsyncFirestoreService, get_async_firestore_service
+from middleware.auth import get_current_user
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+@router.get("/", response_model=dict)
+async def get_stats(
+    current_user: dict = Depends(get_current_user),
+    service: AsyncFirestoreService = Depends(get_async_firestore_service)
+):
+    """음식 아이템 통계 (카테고리별/유통기한 구간별/유통기한 월별 보유 수, 월별 추가·소비·폐기 수)
+    
+    아이템을 만들고/고치고/지울 때 갱신되는 집계 문서 하나만 읽음
+    """
+    try:
+        return await service.get_food_item_stats(current_user['uid'])
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+# 응답 캐시 설정
+#   CACHE_BACKEND: memory (기본, 프로세스 내 LRU) | redis (REDIS_URL, 워커 여러 개가 캐시 공유) | none
+#   CACHE_TTL: 항목 유지 시간(초), 앱이 Firestore에 직접 쓴 변경은 이 시간 뒤에 반영됨
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+CACHE_TTL = float(os.getenv('CACHE_TTL', '300'))
+CACHE_MAX_SIZE = int(os.getenv('CACHE_MAX_SIZE', '10000'))
+# 이보다 큰 응답 본문은 캐시하지 않음 (바이트)
+CACHE_MAX_BODY_BYTES = int(os.getenv('CACHE_MAX_BODY_BYTES', str(1024 * 1024)))
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+class InMemoryCache:
+    """프로세스 내 LRU 캐시 (값은 bytes, 항목별 만료 시각)"""
+
+    def __init__(self, max_size: int = CACHE_MAX_SIZE, ttl: float = CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # 키 → (만료 시각, 값)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+class RedisCache:
+    """Redis 호환 클라이언트(get/set(ex=)/delete)를 쓰는 캐시
+
+    redis-py 클라이언트 대신 같은 메서드를 가진 로컬 대체 객체를 넘겨도 됨
+    """
+
+    def __init__(self, client, ttl: float = CACHE_TTL):
+        self.client = client
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes):
+        self.client.set(key, value, ex=max(1, int(self.ttl)))
+
+    def delete(self, key: str):
+        self.client.delete(key)
+
+def create_cache_backend(backend: str = CACHE_BACKEND):
+    """환경 변수 설정에 맞는 캐시 백엔드 (none이면 None)"""
+    if backend == 'none':
+        return None
+    if backend == 'redis':
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis 를 쓰려면 redis 패키지를 설치하세요.")
+        return RedisCache(redis.Redis.from_url(REDIS_URL))
+    if backend == 'memory':
+        return InMemoryCache()
+    raise ValueError(f"알 수 없는 CACHE_BACKEND입니다: {backend}")
+
+class FoodItemCache:
+    """사용자별 음식 아이템 응답 캐시
+
+    - 사용자마다 버전 토큰을 두고 캐시 키와 ETag에 포함 (FirestoreService로 쓰면 새 토큰으로 교체)
+      → 예전 항목은 지우지 않아도 다시 조회되지 않고 LRU/TTL로 사라짐
+    - 토큰은 무작위 값이라 워커마다 따로 만든 토큰이 겹쳐 잘못된 304가 나가지 않음
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def _version_key(user_id: str) -> str:
+        return f'food_items:{user_id}:version'
+
+    def version(self, user_id: str) -> str:
+        """사용자의 현재 버전 토큰 (없으면 새로 발급)"""
+        if self.backend is None:
+            return uuid.uuid4().hex
+        token = self.backend.get(self._version_key(user_id))
+        if token is None:
+            token = uuid.uuid4().hex.encode('ascii')
+            self.backend.set(self._version_key(user_id), token)
+        return token.decode('ascii') if isinstance(token, bytes) else token
+
+    def invalidate(self, user_id: str):
+        """사용자의 캐시 항목과 ETag를 모두 무효화"""
+        if self.backend is not None:
+            self.backend.set(self._version_key(user_id), uuid.uuid4().hex.encode('ascii'))
+
+    @staticmethod
+    def etag(version: str, request_key: str) -> str:
+        digest = hashlib.sha1(request_key.encode('utf-8')).hexdigest()[:16]
+        return f'W/"{version}.{digest}"'
+
+    def get(self, user_id: str, version: str, request_key: str) -> Optional[bytes]:
+        if self.backend is None:
+            return None
+        return self.backend.get(f'food_items:{user_id}:{version}:{request_key}')
+
+    def set(self, user_id: str, version: str, request_key: str, body: bytes):
+        if self.backend is not None and len(body) <= CACHE_MAX_BODY_BYTES:
+            self.backend.set(f'food_items:{user_id}:{version}:{request_key}', body)
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 etag와 일치하는지 (약한 비교, 여러 값과 * 지원)"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(',')]
+    if '*' in candidates:
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    return any((value[2:] if value.startswith('W/') else value) == opaque for value in candidates)
+
+food_item_cache = FoodItemCache(create_cache_backend())
@@ -0,0 +1,72 @@
+import os
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+# 유통기한 날짜를 해석할 기준 시간대 (기본 한국 시간, UTC+9)
+APP_TIMEZONE = timezone(timedelta(hours=float(os.getenv('APP_UTC_OFFSET_HOURS', '9'))))
+
+# 정렬/범위 조회용 유통기한 타임스탬프 필드 (날짜 문자열에서 계산, 해석 불가면 null)
+EXPIRATION_FIELD = 'expiration_at'
+# expiration_at을 계산하는 날짜 문자열 필드 (서버 API는 expiration_date, 앱이 직접 쓴 문서는 expirationDate)
+EXPIRATION_SOURCE_FIELDS = ('expiration_date', 'expirationDate')
+# expiration_at이 없는 문서도 유통기한을 알 수 있도록 select할 필드
+EXPIRATION_READ_FIELDS = (EXPIRATION_FIELD,) + EXPIRATION_SOURCE_FIELDS
+
+# 2025-09-23, 2025.09.23, 2025/9/23, 20250923 등
+DATE_PATTERN = re.compile(r'^\s*(\d{4})[-./]?(\d{1,2})[-./]?(\d{1,2})\.?\s*$')
+
+def start_of_day(day: date) -> datetime:
+    """해당 날짜 0시 (APP_TIMEZONE 기준, Firestore 타임스탬프로 저장 가능한 aware datetime)"""
+    return datetime.combine(day, time.min, tzinfo=APP_TIMEZONE)
+
+def today() -> date:
+    return datetime.now(APP_TIMEZONE).date()
+
+def parse_expiration_date(value) -> Optional[datetime]:
+    """자유 형식 유통기한 문자열 → 그 날짜 0시 타임스탬프 (해석할 수 없으면 None)
+
+    앱의 parseAnyDate와 같은 규칙: 시간이 붙은 ISO 문자열은 날짜만 사용
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(APP_TIMEZONE)
+        return start_of_day(value.date())
+    if isinstance(value, date):
+        return start_of_day(value)
+    text = str(value).strip()
+    if 'T' in text:
+        try:
+            return parse_expiration_date(datetime.fromisoformat(text.replace('Z', '+00:00')))
+        except ValueError:
+            return None
+    match = DATE_PATTERN.match(text)
+    if not match:
+        return None
+    try:
+        return start_of_day(date(*(int(part) for part in match.groups())))
+    except ValueError:
+        return None
+
+def source_expiration(item: Dict[str, Any]) -> Optional[datetime]:
+    """문서의 날짜 문자열 필드로 계산한 expiration_at (expiration_date 우선, 없으면 앱의 expirationDate)"""
+    for field in EXPIRATION_SOURCE_FIELDS:
+        if item.get(field):
+            return parse_expiration_date(item[field])
+    return None
+
+def item_expiration(item: Dict[str, Any]) -> Optional[datetime]:
+    """문서의 유통기한 타임스탬프 (expiration_at이 없거나 null이면 날짜 문자열에서 계산)"""
+    expiration_at = item.get(EXPIRATION_FIELD)
+    return expiration_at if expiration_at is not None else source_expiration(item)
+
+def expiry_window(within_days: int, include_expired: bool = False) -> Tuple[Optional[datetime], datetime]:
+    """오늘부터 within_days일 뒤까지 유통기한 범위 (시작 포함, 끝 미포함)
+
+    include_expired=True 이면 이미 지난 아이템도 포함 (시작 없음)
+    """
+    start = None if include_expired else start_of_day(today())
+    end = start_of_day(today() + timedelta(days=within_days + 1))
+    return start, end
@@ -1,24 +1,241 @@
-from typing import List, Optional, Dict, Any
+import asyncio
+import base64
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from config.firebase import get_firestore_client
-from models.food_item import FoodItemCreate, FoodItemUpdate, FoodItemResponse
+from models.food_item import FoodItemCreate, FoodItemUpdate, FoodItemResponse, FoodItemBatchUpdate
+from services.cache import FoodItemCache, food_item_cache
+from services.expiration import (
+    APP_TIMEZONE, EXPIRATION_FIELD, EXPIRATION_READ_FIELDS, expiry_window, item_expiration, parse_expiration_date, today,
+)
+from services.metrics import FIRESTORE_CALLS, FIRESTORE_QUEUE_WAIT, RESPONSE_CACHE_CALLS, current_phases, record_phase
+from services.stats import (
+    STATS_COLLECTION, STATS_DOCUMENT, StatsDelta, build_stats, item_delta, stats_writes, summarize_stats,
+)
+
+# Firestore WriteBatch 한 번에 담을 수 있는 최대 쓰기 수
+FIRESTORE_BATCH_LIMIT = 500
+
+# 목록 조회 시 fields= 로 선택할 수 있는 필드
+FOOD_ITEM_FIELDS = ('id', 'name', 'expiration_date', 'expiration_at', 'quantity', 'category', 'added_date', 'user_id')
+MAX_PAGE_SIZE = 500
+
+# 동기 Firestore 호출을 실행할 스레드 수 (워커 프로세스당 동시에 진행되는 Firestore RPC 상한)
+FIRESTORE_MAX_WORKERS = int(os.getenv('FIRESTORE_MAX_WORKERS', '32'))
+
+# migrations/backfill_expiration_at.py가 모든 문서에 expiration_at을 채운 뒤 쓰는 표식 문서
+# 표식이 생기기 전에는 expiration_at 정렬/범위 쿼리 대신 사용자의 아이템을 모두 읽어 메모리에서 처리
+MIGRATIONS_COLLECTION = 'migrations'
+EXPIRATION_MIGRATION = 'expiration_at'
+# 표식이 없을 때 다시 확인하는 주기 (초)
+EXPIRATION_MIGRATION_RECHECK = float(os.getenv('EXPIRATION_MIGRATION_RECHECK', '300'))
+
+def expiration_migration_ref(db):
+    return db.collection(MIGRATIONS_COLLECTION).document(EXPIRATION_MIGRATION)
+
+def expiration_backfilled(db) -> bool:
+    """expiration_at 백필이 끝났는지 (표식 문서 1개 읽기)"""
+    return expiration_migration_ref(db).get().exists
+
+def with_expiration(data: Dict[str, Any]) -> Dict[str, Any]:
+    """expiration_date가 있으면 expiration_at 타임스탬프를 함께 채운 dict 반환"""
+    if 'expiration_date' in data:
+        data = {**data, EXPIRATION_FIELD: parse_expiration_date(data['expiration_date'])}
+    return data
+
+def encode_cursor(expiration_at: Optional[datetime], doc_id: str) -> str:
+    """페이지 커서 (마지막 아이템의 정렬 키: 유통기한 타임스탬프 + 문서 ID)"""
+    value = expiration_at.isoformat() if expiration_at else None
+    raw = json.dumps([value, doc_id], ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        value, doc_id = json.loads(raw)
+        expiration_at = datetime.fromisoformat(value) if value is not None else None
+    except (ValueError, TypeError):
+        raise ValueError("잘못된 cursor입니다.")
+    if not isinstance(doc_id, str):
+        raise ValueError("잘못된 cursor입니다.")
+    return expiration_at, doc_id
+
+class ScannedDocument:
+    """ExpirationScan이 돌려주는 문서 (expiration_at을 계산해 채운 데이터)"""
+    
+    def __init__(self, doc_id: str, data: Dict[str, Any]):
+        self.id = doc_id
+        self._data = data
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return self._data
+
+def expiration_order_key(expiration_at: Optional[datetime], doc_id: str):
+    """Firestore의 (expiration_at, __name__) 정렬과 같은 순서 (null이 먼저)"""
+    return (expiration_at is not None, expiration_at.timestamp() if expiration_at else 0.0, doc_id)
+
+class ExpirationScan:
+    """expiration_at 백필 전의 유통기한 순 조회 (Firestore 쿼리처럼 stream()만 제공)
+    
+    사용자의 아이템을 모두 읽어 expiration_at이 없는 문서는 날짜 문자열에서 계산하고,
+    범위/정렬/커서/개수 제한을 메모리에서 처리 (커서는 Firestore 쿼리와 같은 형식)
+    """
+    
+    def __init__(
+        self,
+        query,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        after: Optional[Tuple[Optional[datetime], str]] = None,
+        limit: Optional[int] = None,
+    ):
+        self._query = query
+        self.start = start
+        self.end = end
+        self.after = after
+        self.limit = limit
+    
+    def stream(self):
+        docs = []
+        for doc in self._query.stream():
+            data = doc.to_dict() or {}
+            data[EXPIRATION_FIELD] = item_expiration(data)
+            expiration_at = data[EXPIRATION_FIELD]
+            # 범위 조건은 Firestore처럼 null을 제외
+            if self.start is not None or self.end is not None:
+                if expiration_at is None:
+                    continue
+                if self.start is not None and expiration_at < self.start:
+                    continue
+                if self.end is not None and expiration_at >= self.end:
+                    continue
+            docs.append(ScannedDocument(doc.id, data))
+        docs.sort(key=lambda doc: expiration_order_key(doc.to_dict()[EXPIRATION_FIELD], doc.id))
+        if self.after is not None:
+            after_key = expiration_order_key(*self.after)
+            docs = [doc for doc in docs if expiration_order_key(doc.to_dict()[EXPIRATION_FIELD], doc.id) > after_key]
+        return iter(docs[:self.limit] if self.limit is not None else docs)
+
+class FoodItemStream:
+    """목록 조회 결과를 문서 단위로 흘려보내는 이터러블
+    
+    prefetch()로 첫 문서를 미리 받아 쿼리 오류를 응답 전송 전에 드러내고,
+    순회가 끝나면 다음 페이지가 있을 때 next_cursor가 채워짐
+    """
+    
+    def __init__(self, query, limit: Optional[int], fields: Optional[List[str]]):
+        self._query = query
+        self.limit = limit
+        self.fields = fields
+        self.next_cursor: Optional[str] = None
+        self._first = []
+        self._iterator = None
+    
+    def _project(self, doc) -> Dict[str, Any]:
+        data = doc.to_dict() or {}
+        if not self.fields:
+            return data
+        return {field: doc.id if field == 'id' else data.get(field) for field in self.fields}
+    
+    def _generate(self):
+        # limit보다 1개 더 받아 다음 페이지 존재 여부 확인
+        last_doc = None
+        for count, doc in enumerate(self._query.stream()):
+            if self.limit is not None and count == self.limit:
+                last = last_doc.to_dict() or {}
+                self.next_cursor = encode_cursor(last.get(EXPIRATION_FIELD), last_doc.id)
+                break
+            last_doc = doc
+            yield self._project(doc)
+    
+    def prefetch(self) -> 'FoodItemStream':
+        self._iterator = self._generate()
+        self._first = list(itertools.islice(self._iterator, 1))
+        return self
+    
+    def __iter__(self):
+        if self._iterator is None:
+            self.prefetch()
+        yield from self._first
+        # 첫 문서 이후의 조회 시간 (응답을 보내는 동안 이어서 받음, 직렬화 시간은 빼고 잼)
+        fetched, outcome = 0.0, 'ok'
+        started_at = time.perf_counter()
+        try:
+            for item in self._iterator:
+                fetched += time.perf_counter() - started_at
+                yield item
+                started_at = time.perf_counter()
+            fetched += time.perf_counter() - started_at
+        except Exception:
+            outcome = 'error'
+            raise
+        finally:
+            FIRESTORE_CALLS.observe(fetched, method='FoodItemStream', outcome=outcome)
+            record_phase('firestore', fetched)
 
 class FirestoreService:
-    def __init__(self):
-        self.db = get_firestore_client()
+    def __init__(self, db=None, cache: Optional[FoodItemCache] = None):
+        # db를 넘기지 않으면 Firebase 앱/Firestore 클라이언트를 이때 처음 생성
+        self.db = db if db is not None else get_firestore_client()
+        # 음식 아이템 응답 캐시 (이 서비스로 쓰면 해당 사용자의 캐시를 무효화)
+        self.cache = cache or FoodItemCache(None)
+        self._backfilled = False
+        self._backfill_checked_at = float('-inf')
+    
+    def expiration_indexed(self) -> bool:
+        """expiration_at 정렬/범위 쿼리를 쓸 수 있는지 (백필 표식이 보이면 그 뒤로는 다시 읽지 않음)"""
+        if not self._backfilled and time.monotonic() - self._backfill_checked_at >= EXPIRATION_MIGRATION_RECHECK:
+            self._backfill_checked_at = time.monotonic()
+            self._backfilled = expiration_backfilled(self.db)
+        return self._backfilled
+    
+    def cached_response(self, user_id: str, request_key: str) -> Tuple[str, str, Optional[bytes]]:
+        """요청에 대한 (버전 토큰, ETag, 캐시된 응답 본문 또는 None)"""
+        version = self.cache.version(user_id)
+        return version, self.cache.etag(version, request_key), self.cache.get(user_id, version, request_key)
+    
+    def store_response(self, user_id: str, version: str, request_key: str, body: bytes):
+        self.cache.set(user_id, version, request_key, body)
+    
+    def _stats_ref(self, user_id: str):
+        return self.db.collection('users').document(user_id).collection(STATS_COLLECTION).document(STATS_DOCUMENT)
+    
+    def _stats_update(self, delta: StatsDelta, current: Optional[Dict[str, Any]], now: datetime) -> Dict[str, Any]:
+        """통계 문서에 set(merge=True)로 쓸 증감 (current는 0이 되는 키를 지우기 위한 현재 값)"""
+        # google.cloud.firestore는 무거운 패키지라 처음 쓸 때 import (앱 시작 시간에 포함되지 않도록)
+        from google.cloud.firestore import DELETE_FIELD, Increment
+        return {**stats_writes(delta, current, Increment, DELETE_FIELD), 'updatedAt': now}
+    
+    def _run_transaction(self, func):
+        """func(transaction)을 Firestore 트랜잭션으로 실행 (경합으로 중단되면 다시 실행)"""
+        from google.cloud.firestore import transactional
+        return transactional(func)(self.db.transaction())
     
     def create_food_item(self, user_id: str, food_item: FoodItemCreate) -> str:
-        """음식 아이템 생성"""
+        """음식 아이템 생성 (통계 문서 증가와 함께 한 번에 커밋)"""
         doc_ref = self.db.collection('users').document(user_id).collection('food_items').document()
         
-        data = {
+        now = datetime.now(APP_TIMEZONE)
+        data = with_expiration({
             **food_item.dict(),
             'added_date': datetime.now().isoformat(),
             'user_id': user_id,
             'id': doc_ref.id
-        }
+        })
         
-        doc_ref.set(data)
+        # 생성은 증가만 하므로 통계 문서를 읽지 않고 같은 배치에 Increment로 씀
+        batch = self.db.batch()
+        batch.set(doc_ref, data)
+        batch.set(self._stats_ref(user_id), self._stats_update(item_delta(None, data, now), None, now), merge=True)
+        batch.commit()
+        self.cache.invalidate(user_id)
         return doc_ref.id
     
     def get_food_items(self, user_id: str) -> List[Dict[str, Any]]:
@@ -26,28 +243,372 @@ class FirestoreService:
         docs = self.db.collection('users').document(user_id).collection('food_items').stream()
         return [doc.to_dict() for doc in docs]
     
+    def query_food_items(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        category: Optional[str] = None,
+        expiring_within_days: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+    ) -> FoodItemStream:
+        """음식 아이템 목록 조회 (필터/커서/필드 선택은 Firestore 쿼리로 처리)
+        
+        limit/cursor로 페이지를 나누거나 유통기한 범위로 거를 때만 유통기한 순으로 정렬
+        (Firestore 정렬은 정렬 필드가 없는 문서를 빼므로, 전체 목록은 정렬 없이 모든 문서를 반환,
+        expiration_at 백필 전에는 ExpirationScan으로 같은 순서를 메모리에서 만듦)
+        category와 유통기한 범위를 함께 쓰려면 (category, expiration_at, __name__) 복합 색인이 필요
+        """
+        if fields:
+            unknown = [field for field in fields if field not in FOOD_ITEM_FIELDS]
+            if unknown:
+                raise ValueError(f"선택할 수 없는 필드입니다: {', '.join(unknown)}")
+        
+        query = self.db.collection('users').document(user_id).collection('food_items')
+        if category:
+            query = query.where('category', '==', category)
+        until = None
+        if expiring_within_days is not None:
+            _, until = expiry_window(expiring_within_days, include_expired=True)
+        after = decode_cursor(cursor) if cursor else None
+        ordered = limit is not None or after is not None or until is not None
+        if ordered and not self.expiration_indexed():
+            if fields:
+                query = query.select(sorted(set(fields) - {'id'} | set(EXPIRATION_READ_FIELDS)))
+            scan = ExpirationScan(query, end=until, after=after, limit=limit + 1 if limit is not None else None)
+            return FoodItemStream(scan, limit, fields)
+        if until is not None:
+            query = query.where(EXPIRATION_FIELD, '<', until)
+        if ordered:
+            # 같은 유통기한은 문서 ID 순 (커서 위치가 유일하게 정해지도록)
+            query = query.order_by(EXPIRATION_FIELD).order_by('__name__')
+            if after is not None:
+                expiration_at, doc_id = after
+                query = query.start_after({EXPIRATION_FIELD: expiration_at, '__name__': doc_id})
+        if fields:
+            # 다음 페이지 커서 계산에 expiration_at이 필요
+            query = query.select(sorted(set(fields) - {'id'} | {EXPIRATION_FIELD}))
+        if limit is not None:
+            query = query.limit(limit + 1)
+        return FoodItemStream(query, limit, fields)
+    
+    def query_expiring_food_items(
+        self,
+        user_id: str,
+        within_days: int,
+        include_expired: bool = False,
+        fields: Optional[List[str]] = None,
+    ) -> FoodItemStream:
+        """오늘부터 within_days일 이내에 유통기한이 끝나는 아이템 (expiration_at 범위 쿼리, 임박한 순)
+        
+        expiration_at 백필 전에는 ExpirationScan으로 사용자의 아이템을 모두 읽어 거름
+        """
+        if fields:
+            unknown = [field for field in fields if field not in FOOD_ITEM_FIELDS]
+            if unknown:
+                raise ValueError(f"선택할 수 없는 필드입니다: {', '.join(unknown)}")
+        
+        start, end = expiry_window(within_days, include_expired)
+        query = self.db.collection('users').document(user_id).collection('food_items')
+        if not self.expiration_indexed():
+            if fields:
+                query = query.select(sorted(set(fields) - {'id'} | set(EXPIRATION_READ_FIELDS)))
+            return FoodItemStream(ExpirationScan(query, start=start, end=end), None, fields)
+        if start is not None:
+            query = query.where(EXPIRATION_FIELD, '>=', start)
+        query = query.where(EXPIRATION_FIELD, '<', end).order_by(EXPIRATION_FIELD)
+        if fields:
+            query = query.select(sorted(set(fields) - {'id'}) or [EXPIRATION_FIELD])
+        return FoodItemStream(query, None, fields)
+    
     def get_food_item(self, user_id: str, item_id: str) -> Optional[Dict[str, Any]]:
         """특정 음식 아이템 조회"""
         doc = self.db.collection('users').document(user_id).collection('food_items').document(item_id).get()
         return doc.to_dict() if doc.exists else None
     
     def update_food_item(self, user_id: str, item_id: str, update_data: FoodItemUpdate) -> bool:
-        """음식 아이템 수정"""
+        """음식 아이템 수정 (카테고리/유통기한이 바뀌면 같은 트랜잭션에서 통계 갱신, 없는 아이템이면 False)"""
         doc_ref = self.db.collection('users').document(user_id).collection('food_items').document(item_id)
+        stats_ref = self._stats_ref(user_id)
         
         # None이 아닌 필드만 업데이트
-        update_fields = {k: v for k, v in update_data.dict().items() if v is not None}
+        update_fields = with_expiration({k: v for k, v in update_data.dict().items() if v is not None})
+        if not update_fields:
+            return False
         
-        if update_fields:
-            doc_ref.update(update_fields)
+        now = datetime.now(APP_TIMEZONE)
+        def update(transaction) -> bool:
+            snapshot = doc_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return False
+            before = snapshot.to_dict() or {}
+            delta = item_delta(before, {**before, **update_fields}, now)
+            if delta:
+                current = stats_ref.get(transaction=transaction).to_dict()
+                transaction.set(stats_ref, self._stats_update(delta, current, now), merge=True)
+            transaction.update(doc_ref, update_fields)
             return True
-        return False
+        
+        updated = self._run_transaction(update)
+        if updated:
+            self.cache.invalidate(user_id)
+        return updated
     
     def delete_food_item(self, user_id: str, item_id: str) -> bool:
-        """음식 아이템 삭제"""
+        """음식 아이템 삭제 (같은 트랜잭션에서 통계 감소, 이미 없는 아이템이면 False)"""
         doc_ref = self.db.collection('users').document(user_id).collection('food_items').document(item_id)
-        doc_ref.delete()
-        return True
+        stats_ref = self._stats_ref(user_id)
+        
+        now = datetime.now(APP_TIMEZONE)
+        def delete(transaction) -> bool:
+            snapshot = doc_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return False
+            current = stats_ref.get(transaction=transaction).to_dict()
+            delta = item_delta(snapshot.to_dict() or {}, None, now)
+            transaction.set(stats_ref, self._stats_update(delta, current, now), merge=True)
+            transaction.delete(doc_ref)
+            return True
+        
+        deleted = self._run_transaction(delete)
+        if deleted:
+            self.cache.invalidate(user_id)
+        return deleted
+    
+    def get_food_item_stats(self, user_id: str) -> Dict[str, Any]:
+        """사용자 통계 (집계 문서 1개 읽기, 유통기한 구간은 오늘 기준)"""
+        return summarize_stats(self._stats_ref(user_id).get().to_dict(), today())
+    
+    def rebuild_food_item_stats(self, user_id: str) -> Dict[str, Any]:
+        """아이템 전체를 읽어 통계 문서를 다시 계산 (집계 도입 전 데이터 백필/복구용, monthly 이력은 유지)"""
+        stats_ref = self._stats_ref(user_id)
+        current = stats_ref.get().to_dict() or {}
+        items = (doc.to_dict() for doc in self._food_items_ref(user_id).select(
+            ['category', *EXPIRATION_READ_FIELDS, 'added_date']).stream())
+        stats = {**build_stats(items, current.get('monthly')), 'updatedAt': datetime.now(APP_TIMEZONE)}
+        stats_ref.set(stats)
+        return stats
+
+    def _food_items_ref(self, user_id: str):
+        return self.db.collection('users').document(user_id).collection('food_items')
+    
+    def batch_write_food_items(
+        self,
+        user_id: str,
+        creates: List[FoodItemCreate],
+        updates: List[FoodItemBatchUpdate],
+        deletes: List[str],
+    ) -> Dict[str, Any]:
+        """음식 아이템 일괄 생성/수정/삭제 (최대 499개씩 트랜잭션으로 커밋, 항목별 결과 반환)
+        
+        청크마다 트랜잭션 안에서 통계 문서와 수정/삭제 대상을 읽어 존재 여부와 통계 증감을 계산하고
+        통계 문서 쓰기를 함께 커밋 (동시에 들어온 다른 쓰기와 겹치면 트랜잭션이 다시 실행됨)
+        """
+        items_ref = self._food_items_ref(user_id)
+        stats_ref = self._stats_ref(user_id)
+        results: List[Dict[str, Any]] = []
+        operations = []  # (결과 dict, 종류, 문서 참조, 쓸 데이터)
+        now = datetime.now(APP_TIMEZONE)
+        added_date = datetime.now().isoformat()
+        
+        for index, food_item in enumerate(creates):
+            doc_ref = items_ref.document()
+            data = with_expiration({
+                **food_item.dict(),
+                'added_date': added_date,
+                'user_id': user_id,
+                'id': doc_ref.id
+            })
+            result = {'op': 'create', 'index': index, 'id': doc_ref.id, 'success': False, 'error': None}
+            results.append(result)
+            operations.append((result, 'create', doc_ref, data))
+        
+        for index, item in enumerate(updates):
+            result = {'op': 'update', 'index': index, 'id': item.id, 'success': False, 'error': None}
+            results.append(result)
+            # None이 아닌 필드만 업데이트
+            update_fields = with_expiration({k: v for k, v in item.dict(exclude={'id'}).items() if v is not None})
+            if not update_fields:
+                result['error'] = "수정할 필드가 없습니다."
+            else:
+                operations.append((result, 'update', items_ref.document(item.id), update_fields))
+        
+        for index, item_id in enumerate(deletes):
+            result = {'op': 'delete', 'index': index, 'id': item_id, 'success': False, 'error': None}
+            results.append(result)
+            operations.append((result, 'delete', items_ref.document(item_id), None))
+        
+        commits = 0
+        # 트랜잭션마다 통계 문서 쓰기 1개 자리를 남김
+        chunk_size = FIRESTORE_BATCH_LIMIT - 1
+        for start in range(0, len(operations), chunk_size):
+            chunk = operations[start:start + chunk_size]
+            try:
+                errors = self._run_transaction(partial(self._write_chunk, stats_ref, chunk, now))
+            except Exception as e:
+                # 트랜잭션은 원자적으로 커밋되므로 실패하면 해당 청크의 항목 전체가 실패
+                for result, _, _, _ in chunk:
+                    result['error'] = str(e)
+                continue
+            if any(error is None for error in errors):
+                commits += 1
+            for (result, _, _, _), error in zip(chunk, errors):
+                result['success'] = error is None
+                result['error'] = error
+        
+        if commits:
+            self.cache.invalidate(user_id)
+        return {'results': results, 'commits': commits}
+    
+    def _write_chunk(self, stats_ref, chunk, now: datetime, transaction) -> List[Optional[str]]:
+        """batch_write_food_items의 청크 하나를 트랜잭션으로 씀, 항목별 오류(성공이면 None) 반환"""
+        # 트랜잭션에서는 모든 읽기가 쓰기보다 먼저 (없는 문서를 update하면 커밋 전체가 실패하므로 존재 여부 확인)
+        refs = {ref.path: ref for _, kind, ref, _ in chunk if kind != 'create'}
+        refs[stats_ref.path] = stats_ref
+        states: Dict[str, Dict[str, Any]] = {}  # 문서 ID → 이 청크의 앞 항목까지 반영한 데이터
+        current_stats = None
+        for doc in self.db.get_all(list(refs.values()), transaction=transaction):
+            if doc.exists and doc.reference.path == stats_ref.path:
+                current_stats = doc.to_dict()
+            elif doc.exists:
+                states[doc.id] = doc.to_dict() or {}
+        
+        errors: List[Optional[str]] = []
+        chunk_delta = StatsDelta()
+        for _, kind, doc_ref, data in chunk:
+            error = None
+            if kind == 'create':
+                transaction.set(doc_ref, data)
+                chunk_delta.update(item_delta(None, data, now))
+            elif kind == 'update':
+                before = states.get(doc_ref.id)
+                if before is None:
+                    error = "음식 아이템을 찾을 수 없습니다."
+                else:
+                    states[doc_ref.id] = {**before, **data}
+                    transaction.update(doc_ref, data)
+                    chunk_delta.update(item_delta(before, states[doc_ref.id], now))
+            else:
+                before = states.pop(doc_ref.id, None)
+                transaction.delete(doc_ref)
+                if before is not None:
+                    chunk_delta.update(item_delta(before, None, now))
+            errors.append(error)
+        
+        chunk_delta = StatsDelta({path: amount for path, amount in chunk_delta.items() if amount})
+        if chunk_delta:
+            transaction.set(stats_ref, self._stats_update(chunk_delta, current_stats, now), merge=True)
+        return errors
+
+class AsyncFirestoreService:
+    """FirestoreService의 비동기 버전
+    
+    동기 Firestore 호출을 제한된 크기의 스레드 풀에서 실행해 이벤트 루프를 막지 않음
+    (한 워커에서 여러 요청의 Firestore I/O가 동시에 진행됨)
+    """
+    
+    def __init__(self, service: FirestoreService, max_workers: int = FIRESTORE_MAX_WORKERS):
+        self.service = service
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='firestore')
+    
+    def close(self):
+        self._executor.shutdown(wait=False)
+    
+    async def _run(self, func, *args, name: Optional[str] = None, metric=FIRESTORE_CALLS, phase: str = 'firestore'):
+        """func(*args)를 스레드 풀에서 실행하고 대기/실행 시간을 메트릭에 기록 (실행 시간은 metric과 phase 단계에)"""
+        name = name or func.__name__
+        # 스레드 풀에는 컨텍스트가 전달되지 않으므로 현재 요청의 단계별 시간을 직접 넘김
+        phases = current_phases()
+        submitted_at = time.perf_counter()
+
+        def timed():
+            started_at = time.perf_counter()
+            FIRESTORE_QUEUE_WAIT.observe(started_at - submitted_at)
+            record_phase('firestore_wait', started_at - submitted_at, phases)
+            outcome = 'ok'
+            try:
+                return func(*args)
+            except Exception:
+                outcome = 'error'
+                raise
+            finally:
+                elapsed = time.perf_counter() - started_at
+                metric.observe(elapsed, method=name, outcome=outcome)
+                record_phase(phase, elapsed, phases)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, timed)
+    
+    # 응답 캐시는 Firestore를 거치지 않으므로 Firestore 호출 메트릭 대신 캐시 메트릭과 cache 단계에 기록
+    async def cached_response(self, user_id: str, request_key: str) -> Tuple[str, str, Optional[bytes]]:
+        return await self._run(self.service.cached_response, user_id, request_key,
+                               metric=RESPONSE_CACHE_CALLS, phase='cache')
+    
+    async def store_response(self, user_id: str, version: str, request_key: str, body: bytes):
+        await self._run(self.service.store_response, user_id, version, request_key, body,
+                        metric=RESPONSE_CACHE_CALLS, phase='cache')
+    
+    async def create_food_item(self, user_id: str, food_item: FoodItemCreate) -> str:
+        return await self._run(self.service.create_food_item, user_id, food_item)
+    
+    async def get_food_items(self, user_id: str) -> List[Dict[str, Any]]:
+        return await self._run(self.service.get_food_items, user_id)
+    
+    async def query_food_items(self, user_id: str, **options) -> FoodItemStream:
+        """쿼리를 만들고 첫 문서까지 스레드 풀에서 받아 둔 FoodItemStream 반환"""
+        def build_and_prefetch():
+            return self.service.query_food_items(user_id, **options).prefetch()
+        return await self._run(build_and_prefetch, name='query_food_items')
+    
+    async def query_expiring_food_items(self, user_id: str, **options) -> FoodItemStream:
+        def build_and_prefetch():
+            return self.service.query_expiring_food_items(user_id, **options).prefetch()
+        return await self._run(build_and_prefetch, name='query_expiring_food_items')
+    
+    async def get_food_item(self, user_id: str, item_id: str) -> Optional[Dict[str, Any]]:
+        return await self._run(self.service.get_food_item, user_id, item_id)
+    
+    async def update_food_item(self, user_id: str, item_id: str, update_data: FoodItemUpdate) -> bool:
+        return await self._run(self.service.update_food_item, user_id, item_id, update_data)
+    
+    async def get_food_item_stats(self, user_id: str) -> Dict[str, Any]:
+        return await self._run(self.service.get_food_item_stats, user_id)
+    
+    async def delete_food_item(self, user_id: str, item_id: str) -> bool:
+        return await self._run(self.service.delete_food_item, user_id, item_id)
+    
+    async def batch_write_food_items(
+        self,
+        user_id: str,
+        creates: List[FoodItemCreate],
+        updates: List[FoodItemBatchUpdate],
+        deletes: List[str],
+    ) -> Dict[str, Any]:
+        return await self._run(self.service.batch_write_food_items, user_id, creates, updates, deletes)
+
+# 싱글톤 인스턴스 (import 시점이 아니라 처음 요청될 때 생성)
+_async_firestore_service: Optional[AsyncFirestoreService] = None
+_service_lock = threading.Lock()
+
+def get_async_firestore_service() -> AsyncFirestoreService:
+    """라우트에 Depends로 주입하는 AsyncFirestoreService
+    
+    테스트/벤치마크에서는 app.dependency_overrides로 다른 db를 쓰는 인스턴스로 바꿀 수 있음
+    """
+    global _async_firestore_service
+    if _async_firestore_service is None:
+        with _service_lock:
+            if _async_firestore_service is None:
+                _async_firestore_service = AsyncFirestoreService(FirestoreService(cache=food_item_cache))
+    return _async_firestore_service
+
+def get_firestore_service() -> FirestoreService:
+    return get_async_firestore_service().service
 
-# 싱글톤 인스턴스
-firestore_service = FirestoreService()
\ No newline at end of file
+def close_firestore_service():
+    """앱 종료 시 스레드 풀 정리 (만들어진 적이 없으면 아무것도 하지 않음)"""
+    global _async_firestore_service
+    with _service_lock:
+        if _async_firestore_service is not None:
+            _async_firestore_service.close()
+            _async_firestore_service = None
@@ -0,0 +1,324 @@
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+# 지연 히스토그램 구간 상한 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 요청 단위 샘플링 프로파일러
+#   PROFILE_TOKEN을 설정하면 X-Profile 헤더 값이 같은 요청만 프로파일 (설정하지 않으면 꺼짐)
+#   PROFILE_MIN_MS보다 오래 걸린 요청의 프로파일만 보관 (최근 PROFILE_KEEP개, /metrics/profiles로 조회)
+PROFILE_HEADER = 'x-profile'
+PROFILE_TOKEN = os.getenv('PROFILE_TOKEN')
+PROFILE_MIN_MS = float(os.getenv('PROFILE_MIN_MS', '100'))
+PROFILE_INTERVAL = float(os.getenv('PROFILE_INTERVAL_MS', '5')) / 1000
+PROFILE_KEEP = 20
+# 샘플에서 제외할 대기 중인 스레드의 최상위 함수 (이벤트 루프 select, 스레드 풀 대기)
+IDLE_FRAMES = ('select', 'wait', 'poll', '_worker')
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}'] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+class CounterMetric(_Metric):
+    kind = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, value: float, **labels):
+        """다른 곳에서 세고 있는 누적값을 그대로 옮겨 담을 때 (add_collector에서)"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}' for key, value in values]
+
+class GaugeMetric(CounterMetric):
+    kind = 'gauge'
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+class HistogramMetric(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, *args, buckets: Iterable[float] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], list] = {}  # 라벨 → [구간별 개수, 합계, 개수]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return entry[2] if entry else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, ([*entry[0]], entry[1], entry[2])) for key, entry in self._values.items())
+        lines = []
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound!r}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}')
+            labels = _format_labels(self.label_names, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+class MetricsRegistry:
+    """프로세스 내 메트릭 모음 (/metrics에서 Prometheus 텍스트 형식으로 내보냄)
+
+    uvicorn 워커를 여러 개 띄우면 워커마다 따로 집계되므로 Prometheus에서 워커별로 수집해 합산
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors = []
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Iterable[str] = ()) -> CounterMetric:
+        return self._add(CounterMetric(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Iterable[str] = ()) -> GaugeMetric:
+        return self._add(GaugeMetric(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Iterable[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> HistogramMetric:
+        return self._add(HistogramMetric(name, documentation, labels, buckets=buckets))
+
+    def add_collector(self, collect):
+        """내보낼 때마다 호출되는 함수 (다른 모듈의 현재 상태를 게이지 등에 옮겨 담는 용도)"""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        for collect in self._collectors:
+            try:
+                collect()
+            except Exception as e:
+                logger.warning("메트릭 수집 실패: %s", e)
+        return '\n'.join(line for metric in self._metrics for line in metric.render()) + '\n'
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram(
+    'http_request_duration_seconds', '요청 처리 시간 (응답 본문 전송 완료까지)', ('method', 'route'))
+REQUESTS = registry.counter('http_requests_total', '처리한 요청 수', ('method', 'route', 'status'))
+REQUEST_ERRORS = registry.counter(
+    'http_request_errors_total', '4xx/5xx 응답 또는 처리 중 예외가 난 요청 수', ('method', 'route', 'status'))
+IN_FLIGHT = registry.gauge('http_requests_in_flight', '처리 중인 요청 수')
+REQUEST_PHASE = registry.histogram(
+    'http_request_phase_seconds', '요청 하나에서 단계별로 쓴 시간 합계 (auth, cache, firestore, firestore_wait, serialize)',
+    ('method', 'route', 'phase'))
+TOKEN_VERIFICATION = registry.histogram(
+    'auth_token_verification_seconds', 'ID 토큰 확인 시간 (cache_hit: 캐시, verified: 서명 검증, invalid: 거부)',
+    ('result',))
+FIRESTORE_CALLS = registry.histogram(
+    'firestore_call_duration_seconds', 'FirestoreService 메서드 실행 시간', ('method', 'outcome'))
+FIRESTORE_QUEUE_WAIT = registry.histogram(
+    'firestore_executor_wait_seconds', 'Firestore 스레드 풀에서 실행을 기다린 시간')
+RESPONSE_CACHE_CALLS = registry.histogram(
+    'response_cache_call_duration_seconds', '음식 아이템 응답 캐시 조회/저장 시간 (Firestore 호출 아님)', ('method', 'outcome'))
+
+# 현재 요청의 단계별 시간 (미들웨어가 요청마다 새 dict를 넣음, 요청 밖에서는 None)
+_request_phases: ContextVar[Optional[Counter]] = ContextVar('request_phases', default=None)
+
+def record_phase(phase: str, seconds: float, phases: Optional[Counter] = None):
+    """현재 요청의 phase 시간에 더함 (스레드 풀처럼 컨텍스트가 전달되지 않는 곳은 phases를 직접 넘김)"""
+    phases = phases if phases is not None else _request_phases.get()
+    if phases is not None:
+        phases[phase] += seconds
+
+def current_phases() -> Optional[Counter]:
+    return _request_phases.get()
+
+@contextmanager
+def timed_phase(phase: str):
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, time.perf_counter() - started_at)
+
+class TimedJSONResponse(JSONResponse):
+    """JSON 인코딩 시간을 serialize 단계로 기록하는 기본 응답 클래스"""
+
+    def render(self, content: Any) -> bytes:
+        with timed_phase('serialize'):
+            return super().render(content)
+
+class SamplingProfiler:
+    """별도 스레드에서 PROFILE_INTERVAL마다 모든 스레드의 호출 스택을 수집
+
+    결과는 접힌 스택 형식(바깥;...;안쪽 → 샘플 수)이라 flamegraph 도구에 바로 넣을 수 있음
+    프로세스 전체를 샘플링하므로 동시에 처리 중인 다른 요청의 스택도 섞임
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+            frame = frame.f_back
+        return ';'.join(reversed(parts))
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id and frame.f_code.co_name not in IDLE_FRAMES:
+                    self.samples[self._collapse(frame)] += 1
+
+    def start(self) -> 'SamplingProfiler':
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+recent_profiles: deque = deque(maxlen=PROFILE_KEEP)
+# 프로파일러는 프로세스 전체를 샘플링하므로 한 번에 하나만
+_profile_lock = threading.Lock()
+
+def profiling_requested(headers: Iterable[Tuple[bytes, bytes]]) -> bool:
+    if not PROFILE_TOKEN:
+        return False
+    return any(name == PROFILE_HEADER.encode() and value.decode('latin-1') == PROFILE_TOKEN for name, value in headers)
+
+class MetricsMiddleware:
+    """요청마다 지연/상태/단계별 시간을 기록하는 ASGI 미들웨어
+
+    - route 라벨은 경로 템플릿(/api/food-items/{item_id}), 라우트에 맞지 않은 요청은 unmatched
+    - 스트리밍 응답은 본문 전송이 끝난 시점까지 측정
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        phases = Counter()
+        token = _request_phases.set(phases)
+        profiler = None
+        if (profiling_requested(scope.get('headers') or ()) and not scope['path'].startswith('/metrics')
+                and _profile_lock.acquire(blocking=False)):
+            profiler = SamplingProfiler().start()
+        status_code = 500
+        started_at = time.perf_counter()
+        IN_FLIGHT.inc()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            status_code = 500
+            raise
+        finally:
+            elapsed = time.perf_counter() - started_at
+            IN_FLIGHT.dec()
+            _request_phases.reset(token)
+            route = scope.get('route')
+            route_path = getattr(route, 'path', None) or 'unmatched'
+            method = scope['method']
+            REQUEST_LATENCY.observe(elapsed, method=method, route=route_path)
+            REQUESTS.inc(method=method, route=route_path, status=status_code)
+            if status_code >= 400:
+                REQUEST_ERRORS.inc(method=method, route=route_path, status=status_code)
+            for phase, seconds in phases.items():
+                REQUEST_PHASE.observe(seconds, method=method, route=route_path, phase=phase)
+            if profiler is not None:
+                samples = profiler.stop()
+                _profile_lock.release()
+                if elapsed * 1000 >= PROFILE_MIN_MS:
+                    recent_profiles.append({
+                        'method': method,
+                        'path': scope.get('path'),
+                        'route': route_path,
+                        'status': status_code,
+                        'duration_ms': elapsed * 1000,
+                        'phases_ms': {phase: seconds * 1000 for phase, seconds in phases.items()},
+                        'samples': dict(samples.most_common()),
+                    })
+                    logger.warning("느린 요청 프로파일 저장: %s %s %.0fms", method, scope.get('path'), elapsed * 1000)
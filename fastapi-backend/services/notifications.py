@@ -0,0 +1,247 @@
+import json
+import os
+import urllib.request
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from services.expiration import APP_TIMEZONE, EXPIRATION_READ_FIELDS, item_expiration, start_of_day, today
+from services.firestore import EXPIRATION_FIELD, FIRESTORE_BATCH_LIMIT, expiration_backfilled
+
+# 유통기한 며칠 전에 알릴지 (앱 알림 설정 기본값 expiryDays와 같음: 3일 전, 1일 전, 당일)
+NOTIFY_DAYS_BEFORE = [int(value) for value in os.getenv('NOTIFY_DAYS_BEFORE', '3,1,0').split(',') if value.strip()]
+# 한 번에 읽을 아이템 수 (스윕 메모리는 페이지 크기 + 발송 묶음 크기에 비례)
+NOTIFICATION_PAGE_SIZE = int(os.getenv('NOTIFICATION_PAGE_SIZE', '1000'))
+# 사용자 문서/발송 기록을 한 번에 읽고 알림을 한 번에 보내는 사용자 수
+NOTIFICATION_FLUSH_USERS = int(os.getenv('NOTIFICATION_FLUSH_USERS', '100'))
+# 다이제스트 data에 담을 아이템 수 (나머지는 개수만)
+DIGEST_MAX_ITEMS = 20
+
+EXPO_PUSH_URL = os.getenv('EXPO_PUSH_URL', 'https://exp.host/--/api/v2/push/send')
+EXPO_ACCESS_TOKEN = os.getenv('EXPO_ACCESS_TOKEN')
+EXPO_BATCH_LIMIT = 100
+
+# 사용자별 발송 기록: users/{uid}/notification_state/expiry = {day: YYYY-MM-DD, sent: ['아이템ID:남은일수', ...]}
+NOTIFICATION_STATE_COLLECTION = 'notification_state'
+NOTIFICATION_STATE_DOCUMENT = 'expiry'
+
+class InMemoryPushSender:
+    """보낸 메시지를 메모리에 쌓아 두는 발송기 (테스트/드라이런용)
+
+    fail_user_ids에 든 사용자의 메시지는 실패로 처리
+    """
+
+    def __init__(self, fail_user_ids: Iterable[str] = ()):
+        self.sent: List[Dict[str, Any]] = []
+        self.fail_user_ids = set(fail_user_ids)
+
+    def send(self, messages: List[Dict[str, Any]]) -> List[bool]:
+        results = []
+        for message in messages:
+            ok = message['data']['userId'] not in self.fail_user_ids
+            if ok:
+                self.sent.append(message)
+            results.append(ok)
+        return results
+
+class ExpoPushSender:
+    """Expo 푸시 API 발송기 (앱이 users/{uid}.expoPushToken에 저장한 토큰으로 전송, 요청당 최대 100개)"""
+
+    def __init__(self, url: str = EXPO_PUSH_URL, access_token: Optional[str] = EXPO_ACCESS_TOKEN, timeout: float = 30.0):
+        self.url = url
+        self.access_token = access_token
+        self.timeout = timeout
+
+    def _post(self, messages: List[Dict[str, Any]]) -> List[bool]:
+        headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        if self.access_token:
+            headers['Authorization'] = f'Bearer {self.access_token}'
+        request = urllib.request.Request(self.url, data=json.dumps(messages).encode('utf-8'), headers=headers)
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            tickets = json.loads(response.read()).get('data', [])
+        return [isinstance(ticket, dict) and ticket.get('status') == 'ok' for ticket in tickets]
+
+    def send(self, messages: List[Dict[str, Any]]) -> List[bool]:
+        results: List[bool] = []
+        for start in range(0, len(messages), EXPO_BATCH_LIMIT):
+            chunk = messages[start:start + EXPO_BATCH_LIMIT]
+            try:
+                outcome = self._post(chunk)
+            except Exception:
+                # 요청 자체가 실패하면 묶음 전체를 실패로 보고 다음 스윕에서 다시 보냄
+                outcome = []
+            results.extend(outcome + [False] * (len(chunk) - len(outcome)))
+        return results
+
+def digest_message(push_token: str, user_id: str, day: date, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """사용자 한 명의 알림 대상 아이템들 → 푸시 메시지 1개 (앱의 유통기한 알림 문구와 같은 형식)"""
+    items = sorted(items, key=lambda item: (item['daysLeft'], item.get('name') or ''))
+    first = items[0]
+    if len(items) == 1:
+        title = '유통기한 만료 알림' if first['daysLeft'] == 0 else '유통기한 임박 알림'
+        body = (f"{first['name']}의 유통기한이 오늘입니다." if first['daysLeft'] == 0
+                else f"{first['name']}의 유통기한이 {first['daysLeft']}일 남았습니다.")
+    else:
+        title = '유통기한 임박 알림'
+        today_count = sum(1 for item in items if item['daysLeft'] == 0)
+        body = f"{first['name']} 외 {len(items) - 1}개 음식의 유통기한이 임박했습니다."
+        if today_count:
+            body += f" (오늘 만료 {today_count}개)"
+    return {
+        'to': push_token,
+        'title': title,
+        'body': body,
+        'sound': 'default',
+        'channelId': 'expiry',
+        'data': {
+            'type': 'expiry_digest',
+            'userId': user_id,
+            'day': day.isoformat(),
+            'total': len(items),
+            'items': [
+                {'foodId': item['id'], 'foodName': item['name'], 'daysLeft': item['daysLeft']}
+                for item in items[:DIGEST_MAX_ITEMS]
+            ],
+        },
+    }
+
+class ExpiryNotificationScheduler:
+    """유통기한 알림 스윕
+
+    - 오늘 기준 NOTIFY_DAYS_BEFORE일 뒤가 유통기한인 아이템을 전체 사용자에서 한 번의 컬렉션 그룹 쿼리로 조회
+      (expiration_at은 날짜 0시로 정규화되어 있어 날짜 구간 = 타임스탬프 값 하나, in 조건으로 조회)
+    - 문서 경로(__name__) 순으로 NOTIFICATION_PAGE_SIZE개씩 읽으므로 같은 사용자의 아이템이 연속으로 나오고,
+      사용자가 바뀔 때마다 다이제스트를 만들어 메모리 사용량이 전체 아이템 수와 무관함
+    - 사용자별 발송 기록(날짜 + 보낸 아이템ID:남은일수)으로 같은 날 다시 돌려도 중복 발송하지 않음
+      (발송 성공 후 기록하므로 기록 직전에 중단되면 한 번 더 보낼 수 있음)
+
+    컬렉션 그룹 food_items의 expiration_at 단일 필드 색인(컬렉션 그룹 범위)이 필요
+    expiration_at 백필 표식이 없으면 in 쿼리 대신 전체 아이템을 같은 순서로 훑어 날짜 문자열로 대상을 고름
+    """
+
+    def __init__(
+        self,
+        db,
+        sender,
+        days_before: Iterable[int] = NOTIFY_DAYS_BEFORE,
+        page_size: int = NOTIFICATION_PAGE_SIZE,
+        flush_users: int = NOTIFICATION_FLUSH_USERS,
+    ):
+        self.db = db
+        self.sender = sender
+        self.days_before = sorted(set(days_before))
+        self.page_size = page_size
+        # 발송 기록을 WriteBatch 하나로 쓰므로 최대 500명
+        self.flush_users = min(flush_users, FIRESTORE_BATCH_LIMIT)
+
+    def due_query(self, day: date):
+        buckets = [start_of_day(day + timedelta(days=days)) for days in self.days_before]
+        return (self.db.collection_group('food_items')
+                .where(EXPIRATION_FIELD, 'in', buckets)
+                .order_by('__name__')
+                .select(['name', EXPIRATION_FIELD]))
+
+    def scan_query(self):
+        """백필 전: expiration_at이 없는 문서도 포함해 모든 아이템을 문서 경로 순으로"""
+        return (self.db.collection_group('food_items')
+                .order_by('__name__')
+                .select(['name', *EXPIRATION_READ_FIELDS]))
+
+    def iter_due_items(self, day: date) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(사용자 ID, {id, name, daysLeft}) 를 사용자 순서대로 흘려보냄 (페이지 단위 조회)"""
+        indexed = expiration_backfilled(self.db)
+        query = self.due_query(day) if indexed else self.scan_query()
+        due = {start_of_day(day + timedelta(days=days)) for days in self.days_before}
+        last_doc = None
+        while True:
+            page = query.start_after(last_doc) if last_doc is not None else query
+            count = 0
+            for doc in page.limit(self.page_size).stream():
+                count += 1
+                last_doc = doc
+                data = doc.to_dict() or {}
+                expiration_at = data[EXPIRATION_FIELD] if indexed else item_expiration(data)
+                if expiration_at not in due:
+                    continue
+                expiration_day = expiration_at.astimezone(APP_TIMEZONE).date()
+                yield doc.reference.parent.parent.id, {
+                    'id': doc.id,
+                    'name': data.get('name') or '',
+                    'daysLeft': (expiration_day - day).days,
+                }
+            if count < self.page_size:
+                return
+
+    def iter_user_items(self, day: date) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """사용자마다 (사용자 ID, 알림 대상 아이템 목록)"""
+        current_user, items = None, []
+        for user_id, item in self.iter_due_items(day):
+            if user_id != current_user and items:
+                yield current_user, items
+                items = []
+            current_user = user_id
+            items.append(item)
+        if items:
+            yield current_user, items
+
+    def _user_ref(self, user_id: str):
+        return self.db.collection('users').document(user_id)
+
+    def _state_ref(self, user_id: str):
+        return self._user_ref(user_id).collection(NOTIFICATION_STATE_COLLECTION).document(NOTIFICATION_STATE_DOCUMENT)
+
+    def _flush(self, day: date, pending: List[Tuple[str, List[Dict[str, Any]]]], stats: Dict[str, int], dry_run: bool):
+        """사용자 묶음: 사용자 문서/발송 기록을 한 번에 읽고, 보낼 알림을 한 번에 보내고, 기록을 한 배치로 씀"""
+        refs = []
+        for user_id, _ in pending:
+            refs += [self._user_ref(user_id), self._state_ref(user_id)]
+        documents = {doc.reference.path: doc.to_dict() for doc in self.db.get_all(refs) if doc.exists}
+
+        messages, records = [], []
+        for user_id, items in pending:
+            state = documents.get(self._state_ref(user_id).path) or {}
+            already_sent = set(state.get('sent') or []) if state.get('day') == day.isoformat() else set()
+            fresh = [item for item in items if f"{item['id']}:{item['daysLeft']}" not in already_sent]
+            if not fresh:
+                stats['duplicates'] += 1
+                continue
+            push_token = (documents.get(self._user_ref(user_id).path) or {}).get('expoPushToken')
+            if not push_token:
+                stats['no_token'] += 1
+                continue
+            messages.append(digest_message(push_token, user_id, day, fresh))
+            sent_keys = already_sent | {f"{item['id']}:{item['daysLeft']}" for item in fresh}
+            records.append((user_id, sorted(sent_keys)))
+
+        if not messages:
+            return
+        # 드라이런은 보내지 않고 보낼 대상만 셈 (발송 기록도 쓰지 않으므로 보내면 매번 중복 발송됨)
+        results = [True] * len(messages) if dry_run else self.sender.send(messages)
+        batch = self.db.batch()
+        writes = 0
+        for (user_id, sent_keys), ok in zip(records, results):
+            if not ok:
+                stats['failed'] += 1
+                continue
+            stats['sent'] += 1
+            if not dry_run:
+                batch.set(self._state_ref(user_id), {'day': day.isoformat(), 'sent': sent_keys,
+                                                     'updatedAt': datetime.now(APP_TIMEZONE)})
+                writes += 1
+        if writes:
+            batch.commit()
+
+    def sweep(self, day: Optional[date] = None, dry_run: bool = False) -> Dict[str, int]:
+        """한 번의 스윕 (dry_run이면 알림을 보내지 않고 발송 기록도 쓰지 않음, sent는 보낼 대상 수), 처리 통계 반환"""
+        day = day or today()
+        stats = dict.fromkeys(('items', 'users', 'sent', 'duplicates', 'no_token', 'failed'), 0)
+        pending = []
+        for user_id, items in self.iter_user_items(day):
+            stats['users'] += 1
+            stats['items'] += len(items)
+            pending.append((user_id, items))
+            if len(pending) >= self.flush_users:
+                self._flush(day, pending, stats, dry_run)
+                pending = []
+        if pending:
+            self._flush(day, pending, stats, dry_run)
+        return stats
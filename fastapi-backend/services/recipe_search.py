@@ -0,0 +1,391 @@
+import asyncio
+import logging
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config.firebase import get_firestore_client
+from services.firestore import FIRESTORE_MAX_WORKERS
+from services.recommendation import RECIPE_INDEX_TTL, ingredient_name
+
+logger = logging.getLogger(__name__)
+
+# 크롤러 동기화 표식을 확인하는 주기 (초, 표식 문서 1개 읽기)
+RECIPE_SEARCH_REFRESH = float(os.getenv('RECIPE_SEARCH_REFRESH', '60'))
+# recipe_crawler/firestore_sync.py가 동기화를 마칠 때마다 쓰는 문서 (syncedAt이 바뀌면 바뀐 레시피 반영)
+# 표식이 없으면(다른 업로드 스크립트) RECIPE_INDEX_TTL마다 contentHash 목록을 비교
+RECIPE_SYNC_COLLECTION = 'recipe_sync'
+RECIPE_SYNC_DOCUMENT = 'recipes'
+
+# BM25F: 필드별 가중치를 곱한 단어 빈도/문서 길이로 BM25 계산
+FIELD_WEIGHTS = {'name': 3.0, 'tags': 2.0, 'ingredients': 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 검색 결과에 담는 필드 (조리 순서 등 큰 필드는 상세 화면에서 문서를 직접 읽음)
+SUMMARY_FIELDS = ('name', 'category', 'tags', 'imageUrl', 'ingredients', 'servings', 'cookingTime', 'difficulty')
+INDEXED_FIELDS = SUMMARY_FIELDS + ('normalizedIngredients', 'contentHash')
+MAX_SEARCH_LIMIT = 100
+UNCATEGORIZED = '기타'
+# 바뀐 레시피를 get_all로 읽을 때 한 번에 요청할 문서 수
+GET_ALL_CHUNK = 300
+# 삭제/변경으로 죽은 문서 비율이 이보다 크면 게시 목록에서 걷어내고 번호를 다시 매김
+COMPACT_DEAD_RATIO = 0.25
+
+WORD_PATTERN = re.compile(r'[0-9a-z가-힣]+')
+DIGIT_PATTERN = re.compile(r'\d')
+
+def search_words(text: str) -> List[str]:
+    """검색/색인용 단어 (NFKC 정규화, 소문자, 한글/영문/숫자 외 문자로 분리)"""
+    return WORD_PATTERN.findall(unicodedata.normalize('NFKC', text or '').lower())
+
+def query_terms(word: str) -> List[str]:
+    """검색어 단어 → 문서에 모두 있어야 하는 n-gram (1글자는 그 글자, 2글자 이상은 연속 2글자 조각)"""
+    if len(word) == 1:
+        return [word]
+    return [word[start:start + 2] for start in range(len(word) - 1)]
+
+def document_terms(word: str) -> List[str]:
+    """문서 단어 → 색인 n-gram (1글자 검색어도 부분 일치하도록 글자 하나씩도 넣음)"""
+    return [*word, *map(str.__add__, word, word[1:])]
+
+def recipe_texts(recipe: Dict[str, Any]) -> Dict[str, List[str]]:
+    """필드 → 색인할 문자열 목록 (재료는 원래 이름과 크롤러가 정규화한 대표 이름)"""
+    ingredients = (recipe.get('ingredients') or []) + (recipe.get('normalizedIngredients') or [])
+    return {
+        'name': [recipe.get('name') or ''],
+        'tags': [tag for tag in recipe.get('tags') or [] if isinstance(tag, str)],
+        'ingredients': [ingredient_name(ingredient) for ingredient in ingredients],
+    }
+
+def term_frequencies(recipe: Dict[str, Any]) -> Tuple[Dict[str, float], float]:
+    """레시피 → (n-gram별 가중 빈도, 가중 문서 길이)"""
+    frequencies: Dict[str, float] = {}
+    length = 0.0
+    for field, texts in recipe_texts(recipe).items():
+        weight = FIELD_WEIGHTS[field]
+        words = search_words(' '.join(texts))
+        if field == 'ingredients':
+            # 재료의 200g, 1큰술 같은 분량 단어는 제외
+            words = [word for word in words if not DIGIT_PATTERN.search(word)]
+        for word in words:
+            terms = document_terms(word)
+            for term in terms:
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+            length += weight * len(terms)
+    return frequencies, length
+
+def _id_ranks(ids: List[str]) -> np.ndarray:
+    ranks = np.empty(len(ids), dtype=np.int32)
+    ranks[np.argsort(np.array(ids, dtype=str), kind='stable')] = np.arange(len(ids), dtype=np.int32)
+    return ranks
+
+def _empty_result(offset: int, limit: int) -> Dict[str, Any]:
+    return {'total': 0, 'offset': offset, 'limit': limit, 'items': [], 'facets': {'category': {}}}
+
+class RecipeSearchIndex:
+    """레시피 검색용 n-gram 역색인 (한 번 만든 뒤에는 바꾸지 않고 apply로 새 색인을 만듦)
+
+    - 게시 목록: n-gram → (문서 번호 배열, 가중 빈도 배열), 문서 번호 오름차순
+    - 바뀐 레시피는 새 번호로 뒤에 붙이고 예전 번호는 live 배열에서 지움 (바뀐 n-gram의 배열만 새로 만듦)
+    - 문서 빈도는 검색할 때 live인 문서만 세므로 삭제가 쌓여도 BM25 점수가 정확함
+    - 검색은 가장 짧은 게시 목록에서 시작해 나머지 목록을 이진 탐색으로 거르므로 결과 후보 수에 비례
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.summaries: List[Dict[str, Any]] = []
+        self.positions: Dict[str, int] = {}  # 레시피 ID → 살아 있는 문서 번호
+        self.hashes: Dict[str, Optional[str]] = {}  # 레시피 ID → contentHash
+        self.category_names: List[str] = []
+        self.category_codes: Dict[str, int] = {}
+        self.categories = np.zeros(0, dtype=np.int32)
+        self.lengths = np.zeros(0, dtype=np.float32)
+        self.live = np.zeros(0, dtype=bool)
+        self.id_ranks = np.zeros(0, dtype=np.int32)  # 문서 번호 → 레시피 ID 정렬 순위 (같은 점수의 순서)
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.total_length = 0.0
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def dead_ratio(self) -> float:
+        return 1 - len(self.positions) / len(self.ids) if self.ids else 0.0
+
+    def _copy(self) -> 'RecipeSearchIndex':
+        index = RecipeSearchIndex.__new__(RecipeSearchIndex)
+        index.__dict__.update(self.__dict__)
+        for name in ('ids', 'summaries', 'category_names'):
+            setattr(index, name, list(getattr(self, name)))
+        for name in ('positions', 'hashes', 'category_codes', 'postings'):
+            setattr(index, name, dict(getattr(self, name)))
+        return index
+
+    def _category_code(self, category: str) -> int:
+        code = self.category_codes.get(category)
+        if code is None:
+            code = self.category_codes[category] = len(self.category_names)
+            self.category_names.append(category)
+        return code
+
+    def apply(
+        self,
+        upserts: Iterable[Tuple[str, Dict[str, Any]]] = (),
+        deletes: Iterable[str] = (),
+    ) -> 'RecipeSearchIndex':
+        """(레시피 ID, 문서) 추가/변경과 삭제를 반영한 새 색인 (기존 색인은 그대로라 검색 중에 바꿔도 안전)"""
+        index = self._copy()
+        removed = [index.positions.pop(recipe_id) for recipe_id in deletes if recipe_id in index.positions]
+        for recipe_id in deletes:
+            index.hashes.pop(recipe_id, None)
+
+        lengths, categories = [], []
+        new_postings: Dict[str, Tuple[List[int], List[float]]] = {}
+        for recipe_id, recipe in upserts:
+            if recipe_id in index.positions:
+                removed.append(index.positions.pop(recipe_id))
+            docno = len(index.ids)
+            frequencies, length = term_frequencies(recipe)
+            for term, frequency in frequencies.items():
+                entry = new_postings.get(term)
+                if entry is None:
+                    entry = new_postings[term] = ([], [])
+                entry[0].append(docno)
+                entry[1].append(frequency)
+            index.ids.append(recipe_id)
+            index.summaries.append({field: recipe.get(field) for field in SUMMARY_FIELDS})
+            index.positions[recipe_id] = docno
+            index.hashes[recipe_id] = recipe.get('contentHash')
+            categories.append(index._category_code(recipe.get('category') or UNCATEGORIZED))
+            lengths.append(length)
+
+        index.lengths = np.concatenate([self.lengths, np.array(lengths, dtype=np.float32)])
+        index.categories = np.concatenate([self.categories, np.array(categories, dtype=np.int32)])
+        index.live = np.concatenate([self.live, np.ones(len(lengths), dtype=bool)])
+        if removed:
+            index.live[removed] = False
+        index.total_length = float(index.lengths[index.live].sum(dtype=np.float64))
+        index.id_ranks = _id_ranks(index.ids)
+        # 새 번호는 기존 번호보다 크므로 이어 붙여도 오름차순 유지
+        for term, (docs, tfs) in new_postings.items():
+            docs_array = np.array(docs, dtype=np.int32)
+            tfs_array = np.array(tfs, dtype=np.float32)
+            existing = index.postings.get(term)
+            if existing is not None:
+                docs_array = np.concatenate([existing[0], docs_array])
+                tfs_array = np.concatenate([existing[1], tfs_array])
+            index.postings[term] = (docs_array, tfs_array)
+        return index
+
+    def compacted(self, dead_ratio: float = COMPACT_DEAD_RATIO) -> 'RecipeSearchIndex':
+        """죽은 문서 비율이 dead_ratio를 넘으면 죽은 문서를 뺀 새 색인, 아니면 그대로"""
+        if self.dead_ratio <= dead_ratio:
+            return self
+        live = self.live
+        renumber = np.cumsum(live, dtype=np.int64).astype(np.int32) - 1
+        index = self._copy()
+        keep = np.flatnonzero(live)
+        index.ids = [self.ids[docno] for docno in keep]
+        index.summaries = [self.summaries[docno] for docno in keep]
+        index.positions = {recipe_id: docno for docno, recipe_id in enumerate(index.ids)}
+        index.lengths = self.lengths[keep]
+        index.categories = self.categories[keep]
+        index.live = np.ones(len(keep), dtype=bool)
+        index.id_ranks = _id_ranks(index.ids)
+        index.postings = {}
+        for term, (docs, tfs) in self.postings.items():
+            alive = live[docs]
+            if alive.any():
+                index.postings[term] = (renumber[docs[alive]], tfs[alive])
+        return index
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """검색어의 모든 단어를 포함하는 레시피를 BM25 점수순으로 (카테고리 집계는 category 필터 전 기준)"""
+        terms = list(dict.fromkeys(term for word in search_words(query) for term in query_terms(word)))
+        live_count = len(self.positions)
+        if not terms or not live_count:
+            return _empty_result(offset, limit)
+        lists = []
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                return _empty_result(offset, limit)
+            lists.append(posting)
+        lists.sort(key=lambda posting: len(posting[0]))
+
+        # 가장 짧은 목록의 살아 있는 문서에서 시작해 나머지 목록에 모두 있는 문서만 남김
+        candidates = lists[0][0][self.live[lists[0][0]]]
+        for docs, _ in lists[1:]:
+            if not len(candidates):
+                break
+            found = np.searchsorted(docs, candidates)
+            candidates = candidates[docs[np.minimum(found, len(docs) - 1)] == candidates]
+        if not len(candidates):
+            return _empty_result(offset, limit)
+
+        average_length = self.total_length / live_count
+        norms = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[candidates] / average_length)
+        scores = np.zeros(len(candidates), dtype=np.float64)
+        for docs, tfs in lists:
+            document_frequency = int(np.count_nonzero(self.live[docs]))
+            idf = math.log(1 + (live_count - document_frequency + 0.5) / (document_frequency + 0.5))
+            frequency = tfs[np.searchsorted(docs, candidates)]
+            scores += idf * frequency * (BM25_K1 + 1) / (frequency + norms)
+
+        candidate_categories = self.categories[candidates]
+        counts = np.bincount(candidate_categories, minlength=len(self.category_names))
+        facets = {self.category_names[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+        if category is not None:
+            code = self.category_codes.get(category)
+            keep = candidate_categories == code if code is not None else np.zeros(len(candidates), dtype=bool)
+            candidates, scores = candidates[keep], scores[keep]
+
+        total = len(candidates)
+        needed = min(total, offset + limit)
+        if needed < total:
+            # 상위 needed번째 점수 이상만 남김 (경계의 동점은 모두 남겨 ID 순으로 자름)
+            threshold = np.partition(scores, total - needed)[total - needed]
+            top = scores >= threshold
+            candidates, scores = candidates[top], scores[top]
+        # 점수 내림차순, 같으면 레시피 ID 순 (색인을 갱신해도 같은 순서)
+        order = np.lexsort((self.id_ranks[candidates], -scores))[offset:needed]
+        items = [
+            {'id': self.ids[docno], **self.summaries[docno], 'score': float(score)}
+            for docno, score in zip(candidates[order].tolist(), scores[order].tolist())
+        ]
+        return {'total': total, 'offset': offset, 'limit': limit, 'items': items, 'facets': {'category': facets}}
+
+class RecipeSearchService:
+    """recipes 컬렉션 검색 색인을 메모리에 두고, 크롤러가 동기화할 때 바뀐 레시피만 다시 읽어 반영
+
+    RECIPE_SEARCH_REFRESH마다 동기화 표식(recipe_sync/recipes.syncedAt)을 확인하고, 바뀌었으면
+    contentHash 목록을 색인의 해시와 비교해 추가/변경된 문서만 get_all로 읽고 사라진 문서는 지움
+    """
+
+    def __init__(
+        self,
+        db=None,
+        refresh_interval: float = RECIPE_SEARCH_REFRESH,
+        full_sync_interval: float = RECIPE_INDEX_TTL,
+    ):
+        self.db = db if db is not None else get_firestore_client()
+        self.refresh_interval = refresh_interval
+        self.full_sync_interval = full_sync_interval
+        self._index: Optional[RecipeSearchIndex] = None
+        self._synced_at = None
+        self._checked_at = 0.0
+        self._listed_at = 0.0
+        self._lock = threading.Lock()
+
+    def _recipes_ref(self):
+        return self.db.collection('recipes')
+
+    def _sync_marker(self):
+        snapshot = self.db.collection(RECIPE_SYNC_COLLECTION).document(RECIPE_SYNC_DOCUMENT).get()
+        return (snapshot.to_dict() or {}).get('syncedAt') if snapshot.exists else None
+
+    def _load(self):
+        # 표식을 먼저 읽어야 전체를 읽는 동안 끝난 동기화를 다음 확인에서 놓치지 않음
+        self._synced_at = self._sync_marker()
+        docs = self._recipes_ref().select(list(INDEXED_FIELDS)).stream()
+        self._index = RecipeSearchIndex().apply((doc.id, doc.to_dict() or {}) for doc in docs)
+        self._checked_at = self._listed_at = time.monotonic()
+
+    def refresh(self, force: bool = False) -> Dict[str, int]:
+        """동기화 표식이 바뀌었으면(표식이 없으면 full_sync_interval마다) 바뀐 레시피만 반영, 반영 수 반환"""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._load()
+                    return {'upserted': len(self._index), 'deleted': 0}
+        marker = self._sync_marker()
+        now = time.monotonic()
+        self._checked_at = now
+        if not force:
+            if marker is not None and marker == self._synced_at:
+                return {'upserted': 0, 'deleted': 0}
+            if marker is None and now - self._listed_at < self.full_sync_interval:
+                return {'upserted': 0, 'deleted': 0}
+
+        index = self._index
+        remote = {doc.id: (doc.to_dict() or {}).get('contentHash')
+                  for doc in self._recipes_ref().select(['contentHash']).stream()}
+        deleted = [recipe_id for recipe_id in index.positions if recipe_id not in remote]
+        # contentHash가 없는 문서(크롤러 동기화 이전 업로드)는 새로 생겼을 때만 읽음
+        changed = [recipe_id for recipe_id, content_hash in remote.items()
+                   if recipe_id not in index.positions
+                   or (content_hash is not None and index.hashes.get(recipe_id) != content_hash)]
+        upserts = []
+        for start in range(0, len(changed), GET_ALL_CHUNK):
+            refs = [self._recipes_ref().document(recipe_id) for recipe_id in changed[start:start + GET_ALL_CHUNK]]
+            upserts += [(doc.id, doc.to_dict() or {})
+                        for doc in self.db.get_all(refs, field_paths=list(INDEXED_FIELDS)) if doc.exists]
+        if upserts or deleted:
+            self._index = index.apply(upserts, deleted).compacted()
+        self._synced_at = marker
+        self._listed_at = now
+        return {'upserted': len(upserts), 'deleted': len(deleted)}
+
+    def get_index(self) -> RecipeSearchIndex:
+        if self._index is None:
+            self.refresh()
+        elif time.monotonic() - self._checked_at >= self.refresh_interval and self._lock.acquire(blocking=False):
+            # 확인은 한 요청만 하고, 나머지 요청은 기존 색인으로 바로 응답
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning("레시피 검색 색인 갱신 실패: %s", e)
+            finally:
+                self._lock.release()
+        return self._index
+
+    def search(self, query: str, **options) -> Dict[str, Any]:
+        return self.get_index().search(query, **options)
+
+class AsyncRecipeSearchService:
+    """RecipeSearchService의 비동기 버전 (색인 생성/갱신/검색을 스레드 풀에서 실행)"""
+
+    def __init__(self, service: RecipeSearchService, max_workers: int = FIRESTORE_MAX_WORKERS):
+        self.service = service
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='recipe-search')
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    async def search(self, query: str, **options) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(self.service.search, query, **options))
+
+# 싱글톤 인스턴스 (처음 요청될 때 생성, 라우트에는 Depends로 주입)
+_async_recipe_search_service: Optional[AsyncRecipeSearchService] = None
+_service_lock = threading.Lock()
+
+def get_async_recipe_search_service() -> AsyncRecipeSearchService:
+    global _async_recipe_search_service
+    if _async_recipe_search_service is None:
+        with _service_lock:
+            if _async_recipe_search_service is None:
+                _async_recipe_search_service = AsyncRecipeSearchService(RecipeSearchService())
+    return _async_recipe_search_service
+
+def close_recipe_search_service():
+    global _async_recipe_search_service
+    with _service_lock:
+        if _async_recipe_search_service is not None:
+            _async_recipe_search_service.close()
+            _async_recipe_search_service = None
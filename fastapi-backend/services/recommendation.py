@@ -0,0 +1,341 @@
+import asyncio
+import logging
+import math
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from config.firebase import get_firestore_client
+from services.expiration import EXPIRATION_FIELD, EXPIRATION_READ_FIELDS, item_expiration
+from services.firestore import FIRESTORE_MAX_WORKERS
+
+# 재료 대표 이름 규칙과 동의어 사전은 크롤러와 함께 쓰는 저장소 루트의 shared 패키지에 있음
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from shared.ingredient_names import DEFAULT_SYNONYMS_PATH, load_synonyms  # noqa: E402
+from shared.ingredient_names import canonical_name as shared_canonical_name  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# 레시피 색인을 다시 읽어 올 주기 (초, 크롤러가 recipes 컬렉션을 갱신하는 주기보다 짧게)
+RECIPE_INDEX_TTL = float(os.getenv('RECIPE_INDEX_TTL', '3600'))
+# 색인과 추천 결과에 쓰는 레시피 필드 (조리 순서 등 큰 필드는 상세 화면에서 레시피 문서를 직접 읽음)
+RECIPE_FIELDS = ('name', 'category', 'tags', 'imageUrl', 'ingredients', 'normalizedIngredients',
+                 'servings', 'cookingTime', 'difficulty')
+
+# 앱(recommendation.js)의 scoreRecipe 기본 가중치
+DEFAULT_WEIGHTS = {'urgency': 1.2, 'match': 2.0, 'missing': 1.0}
+URGENCY_HORIZON_DAYS = 14
+NO_EXPIRATION_DAYS = 9999
+
+# 재료 동의어 사전 (기본은 크롤러가 normalizedName을 만들 때 쓰는 shared/ingredient_synonyms.json)
+# 지정한 파일이 없으면 load_synonyms가 FileNotFoundError를 내서 서버 시작이 실패함
+INGREDIENT_SYNONYMS_PATH = os.getenv('INGREDIENT_SYNONYMS_PATH', DEFAULT_SYNONYMS_PATH)
+SYNONYMS = load_synonyms(INGREDIENT_SYNONYMS_PATH)
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+DIGIT_PATTERN = re.compile(r'\d')
+
+def canonical_name(name: str) -> str:
+    """재료 이름 → 대표 이름 (예: "파" → "대파", "달걀" → "계란")"""
+    return shared_canonical_name(name, SYNONYMS)
+
+def normalize_name(text: str) -> str:
+    """앱의 normalizeName과 같은 규칙 (앞뒤 공백 제거, 소문자, 연속 공백 하나로)"""
+    return WHITESPACE_PATTERN.sub(' ', (text or '').strip().lower())
+
+def ingredient_words(text: str) -> List[str]:
+    """재료 이름 → 매칭에 쓸 단어 목록 (200g, 1큰술처럼 숫자가 들어간 분량 단어 제외)"""
+    return [word for word in normalize_name(text).split(' ') if word and not DIGIT_PATTERN.search(word)]
+
+def is_water(ingredient) -> bool:
+    """물은 필요한 재료 수와 부족 재료 계산에서 제외 (앱과 같은 규칙, 정규화된 재료는 원래 이름으로 판단)"""
+    text = ingredient.get('name') if isinstance(ingredient, dict) else ingredient
+    name = (text or '').strip()
+    return name == '물' or name == 'water' or name.startswith('물')
+
+def recipe_ingredients(recipe: Dict[str, Any]) -> List[Any]:
+    """크롤러가 정규화한 재료 목록이 있으면 그것을, 없으면 원래 재료 목록 사용"""
+    return recipe.get('normalizedIngredients') or recipe.get('ingredients') or []
+
+def ingredient_keys(ingredient) -> Set[str]:
+    """색인에 넣을 재료 키 (정규화된 재료는 대표 이름 하나, 아니면 단어별 대표 이름)"""
+    if isinstance(ingredient, dict) and ingredient.get('normalizedName'):
+        return {ingredient['normalizedName']}
+    return {canonical_name(word) for word in ingredient_words(ingredient_name(ingredient))} - {''}
+
+def ingredient_name(ingredient) -> str:
+    if isinstance(ingredient, dict):
+        return ingredient.get('normalizedName') or ingredient.get('name') or ''
+    return ingredient or ''
+
+def missing_entry(ingredient) -> Dict[str, Any]:
+    """부족 재료 표시용 {name, quantity, unit} (앱의 scoreRecipe 결과와 같은 모양)"""
+    if isinstance(ingredient, dict):
+        unit = ingredient.get('unit')
+        return {
+            'name': (ingredient.get('name') or '').strip(),
+            'quantity': ingredient.get('quantity') if ingredient.get('quantity') is not None else 1,
+            'unit': unit.strip() if isinstance(unit, str) else unit,
+        }
+    return {'name': (ingredient or '').strip(), 'quantity': 1, 'unit': None}
+
+def days_until(expiration_at: Optional[datetime], now: datetime) -> int:
+    if expiration_at is None:
+        return NO_EXPIRATION_DAYS
+    if expiration_at.tzinfo is None:
+        expiration_at = expiration_at.replace(tzinfo=timezone.utc)
+    return math.ceil((expiration_at - now).total_seconds() / 86400)
+
+class RecipeIndex:
+    """recipes 컬렉션을 메모리에 올린 재료 역색인
+
+    - 재료 슬롯: 레시피마다 물을 뺀 재료 하나가 슬롯 하나 (slot_recipe, slot_ingredient 배열)
+    - 재료 키 → 슬롯 번호 배열 (크롤러가 정규화한 재료는 대표 이름, 예전 문서는 단어별 대표 이름)
+    - 키의 2글자 조각 → 키 목록 (팬트리 단어를 포함하는 키를 전체 스캔 없이 찾기 위함)
+    팬트리 재료의 대표 이름이 키에 있으면 그대로 매칭하고, 없으면 앱과 같이
+    한쪽이 다른 쪽을 포함하는 키를 매칭으로 보며,
+    점수 계산은 매칭된 슬롯에 대해서만 numpy로 한 번에 수행 (레시피 수가 아니라 매칭 수에 비례)
+    """
+
+    def __init__(self, recipes: Iterable[Dict[str, Any]]):
+        self.recipes: List[Dict[str, Any]] = []
+        needed_counts: List[int] = []
+        slot_recipe: List[int] = []
+        slot_ingredient: List[int] = []
+        postings: Dict[str, List[int]] = {}
+
+        for recipe in recipes:
+            recipe_index = len(self.recipes)
+            needed = 0
+            for ingredient_index, ingredient in enumerate(recipe_ingredients(recipe)):
+                name = ingredient_name(ingredient)
+                if not name or is_water(ingredient):
+                    continue
+                needed += 1
+                slot = len(slot_recipe)
+                slot_recipe.append(recipe_index)
+                slot_ingredient.append(ingredient_index)
+                for key in ingredient_keys(ingredient):
+                    postings.setdefault(key, []).append(slot)
+            self.recipes.append(recipe)
+            needed_counts.append(needed)
+
+        self.needed_counts = np.array(needed_counts, dtype=np.int32)
+        self.slot_recipe = np.array(slot_recipe, dtype=np.int32)
+        self.slot_ingredient = np.array(slot_ingredient, dtype=np.int32)
+        self.postings = {word: np.array(slots, dtype=np.int32) for word, slots in postings.items()}
+        self.bigrams: Dict[str, Set[str]] = {}
+        self.chars: Dict[str, Set[str]] = {}
+        for word in self.postings:
+            for char in set(word):
+                self.chars.setdefault(char, set()).add(word)
+            for start in range(len(word) - 1):
+                self.bigrams.setdefault(word[start:start + 2], set()).add(word)
+
+    def __len__(self):
+        return len(self.recipes)
+
+    def pantry_keys(self, pantry_name: str) -> Set[str]:
+        """팬트리 재료 이름과 매칭되는 색인 키
+
+        대표 이름이 색인에 있으면 해시 조회 한 번으로 끝나고,
+        없을 때만 단어별로 포함 관계(앱의 부분 문자열 매칭 규칙)를 찾음
+        """
+        key = canonical_name(pantry_name)
+        if key in self.postings:
+            return {key}
+        matched = set()
+        for word in ingredient_words(pantry_name):
+            matched |= self.matching_words(canonical_name(word))
+        return matched
+
+    def matching_words(self, pantry_word: str) -> Set[str]:
+        """팬트리 단어와 매칭되는 재료 단어 (서로 포함 관계)"""
+        matched = set()
+        # 재료 단어 ⊂ 팬트리 단어: 팬트리 단어의 모든 부분 문자열을 사전에서 조회
+        length = len(pantry_word)
+        for start in range(length):
+            for end in range(start + 1, length + 1):
+                if pantry_word[start:end] in self.postings:
+                    matched.add(pantry_word[start:end])
+        # 팬트리 단어 ⊂ 재료 단어: 2글자 조각 색인의 교집합 후보만 확인
+        if length == 1:
+            candidates = self.chars.get(pantry_word, set())
+        else:
+            candidates = None
+            for start in range(length - 1):
+                words = self.bigrams.get(pantry_word[start:start + 2])
+                if not words:
+                    candidates = set()
+                    break
+                candidates = set(words) if candidates is None else candidates & words
+        matched.update(word for word in candidates if pantry_word in word)
+        return matched
+
+    def recommend(
+        self,
+        pantry: List[Dict[str, Any]],
+        top_k: int = 20,
+        max_missing: Optional[int] = None,
+        only_full_match: bool = False,
+        weights: Optional[Dict[str, float]] = None,
+        now: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """팬트리 재료로 만들 수 있는 레시피 상위 top_k (점수 = 긴급도·매칭 비율·부족 재료 가중합)
+
+        재료가 여러 팬트리 아이템과 매칭되면 가장 임박한 유통기한으로 긴급도 계산,
+        팬트리 재료와 하나도 겹치지 않는 레시피는 후보에서 제외
+        """
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        now = now or datetime.now(timezone.utc)
+
+        # 색인 키 → 매칭된 팬트리 재료 중 가장 임박한 유통기한까지 남은 일수
+        key_days: Dict[str, int] = {}
+        for item in pantry:
+            days = days_until(item.get('expiration_at'), now)
+            for key in self.pantry_keys(item.get('normalizedName') or item.get('name') or ''):
+                if days < key_days.get(key, NO_EXPIRATION_DAYS + 1):
+                    key_days[key] = days
+
+        slot_arrays, day_arrays = [], []
+        for key, days in key_days.items():
+            slots = self.postings[key]
+            slot_arrays.append(slots)
+            day_arrays.append(np.full(len(slots), days, dtype=np.int32))
+        if not slot_arrays:
+            return []
+
+        # 슬롯별로 가장 작은 남은 일수만 남김 (슬롯, 일수 순 정렬 후 슬롯의 첫 항목)
+        slots = np.concatenate(slot_arrays)
+        days = np.concatenate(day_arrays)
+        order = np.lexsort((days, slots))
+        slots, first = np.unique(slots[order], return_index=True)
+        days = days[order][first]
+
+        # 후보 레시피별 매칭 수/긴급도 합산
+        candidates, slot_candidate = np.unique(self.slot_recipe[slots], return_inverse=True)
+        match_counts = np.bincount(slot_candidate)
+        urgency = np.bincount(slot_candidate, weights=np.maximum(0, URGENCY_HORIZON_DAYS - days))
+        needed = self.needed_counts[candidates]
+        missing_counts = needed - match_counts
+        ratio = np.divide(match_counts, needed, out=np.zeros(len(candidates)), where=needed > 0)
+        scores = (weights['urgency'] * urgency
+                  + weights['match'] * ratio
+                  - weights['missing'] * missing_counts)
+
+        keep = np.ones(len(candidates), dtype=bool)
+        if only_full_match:
+            keep &= missing_counts == 0
+        if max_missing is not None:
+            keep &= missing_counts <= max_missing
+        kept = np.flatnonzero(keep)
+        # 점수 내림차순, 같으면 레시피 순서대로
+        ranked = kept[np.lexsort((candidates[kept], -scores[kept]))][:top_k]
+
+        results = []
+        for position in ranked:
+            recipe_index = int(candidates[position])
+            recipe = self.recipes[recipe_index]
+            matched = set(self.slot_ingredient[slots[slot_candidate == position]].tolist())
+            missing = [
+                missing_entry(ingredient)
+                for ingredient_index, ingredient in enumerate(recipe_ingredients(recipe))
+                if ingredient_name(ingredient) and not is_water(ingredient)
+                and ingredient_index not in matched
+            ]
+            results.append({
+                **recipe,
+                'score': float(scores[position]),
+                'matchCount': int(match_counts[position]),
+                'neededCount': int(needed[position]),
+                'missing': missing,
+            })
+        return results
+
+class RecommendationService:
+    """recipes 컬렉션을 한 번 읽어 RecipeIndex를 만들고 RECIPE_INDEX_TTL마다 다시 읽음
+
+    TTL이 지나면 한 요청만 다시 읽고, 그동안 다른 요청은 기존 색인으로 바로 응답
+    """
+
+    def __init__(self, db=None, ttl: float = RECIPE_INDEX_TTL):
+        self.db = db if db is not None else get_firestore_client()
+        self.ttl = ttl
+        self._index: Optional[RecipeIndex] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _expired(self) -> bool:
+        return self._index is None or time.monotonic() - self._loaded_at >= self.ttl
+
+    def _load(self):
+        docs = self.db.collection('recipes').select(list(RECIPE_FIELDS)).stream()
+        self._index = RecipeIndex({'id': doc.id, **(doc.to_dict() or {})} for doc in docs)
+        self._loaded_at = time.monotonic()
+
+    def get_index(self) -> RecipeIndex:
+        if self._index is None:
+            with self._lock:
+                # 다른 스레드가 먼저 읽었으면 그 결과 사용
+                if self._index is None:
+                    self._load()
+        elif self._expired() and self._lock.acquire(blocking=False):
+            try:
+                if self._expired():
+                    self._load()
+            except Exception as e:
+                logger.warning("레시피 추천 색인 갱신 실패: %s", e)
+            finally:
+                self._lock.release()
+        return self._index
+
+    def load_pantry(self, user_id: str) -> List[Dict[str, Any]]:
+        """보유 재료 (expiration_at이 없는 문서는 날짜 문자열에서 계산)"""
+        items_ref = self.db.collection('users').document(user_id).collection('food_items')
+        items = [doc.to_dict() or {} for doc in items_ref.select(['name', *EXPIRATION_READ_FIELDS]).stream()]
+        return [{'name': item.get('name'), EXPIRATION_FIELD: item_expiration(item)} for item in items]
+
+    def recommend(self, user_id: str, **options) -> List[Dict[str, Any]]:
+        return self.get_index().recommend(self.load_pantry(user_id), **options)
+
+class AsyncRecommendationService:
+    """RecommendationService의 비동기 버전 (색인 생성/팬트리 조회/점수 계산을 스레드 풀에서 실행)"""
+
+    def __init__(self, service: RecommendationService, max_workers: int = FIRESTORE_MAX_WORKERS):
+        self.service = service
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='recommendation')
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    async def recommend(self, user_id: str, **options) -> List[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(self.service.recommend, user_id, **options))
+
+# 싱글톤 인스턴스 (처음 요청될 때 생성, 라우트에는 Depends로 주입)
+_async_recommendation_service: Optional[AsyncRecommendationService] = None
+_service_lock = threading.Lock()
+
+def get_async_recommendation_service() -> AsyncRecommendationService:
+    global _async_recommendation_service
+    if _async_recommendation_service is None:
+        with _service_lock:
+            if _async_recommendation_service is None:
+                _async_recommendation_service = AsyncRecommendationService(RecommendationService())
+    return _async_recommendation_service
+
+def close_recommendation_service():
+    global _async_recommendation_service
+    with _service_lock:
+        if _async_recommendation_service is not None:
+            _async_recommendation_service.close()
+            _async_recommendation_service = None
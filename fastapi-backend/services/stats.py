@@ -0,0 +1,126 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from services.expiration import APP_TIMEZONE, item_expiration
+
+# 사용자별 통계 집계 문서: users/{uid}/stats/food_items
+#   total: 현재 보유 아이템 수
+#   byCategory: {카테고리: 현재 보유 수}
+#   byExpiryDate: {YYYY-MM-DD 또는 none: 현재 보유 수} → 조회할 때 오늘 기준 구간/월별로 묶음
+#   monthly: {YYYY-MM: {added, consumed, wasted}} 이력 (삭제 시 유통기한 전이면 consumed, 지났으면 wasted)
+STATS_COLLECTION = 'stats'
+STATS_DOCUMENT = 'food_items'
+UNCATEGORIZED = '기타'
+NO_EXPIRATION = 'none'
+# 값이 0이 되면 문서에서 지우는 맵 (현재 상태), monthly는 이력이라 남겨 둠
+PRUNED_MAPS = ('byCategory', 'byExpiryDate')
+
+# 조회 응답의 유통기한 구간 (오늘부터 남은 일수 상한, 앱의 임박 기준 3일과 같음)
+EXPIRY_BUCKETS = (('expiringSoon', 3), ('thisWeek', 7))
+
+StatsDelta = Counter  # 필드 경로 튜플 → 증감량
+
+def expiry_key(item: Dict[str, Any]) -> str:
+    """아이템의 유통기한 날짜 키 (APP_TIMEZONE 기준, 해석할 수 없으면 none)"""
+    expiration_at = item_expiration(item)
+    if expiration_at is None:
+        return NO_EXPIRATION
+    return expiration_at.astimezone(APP_TIMEZONE).date().isoformat()
+
+def category_key(item: Dict[str, Any]) -> str:
+    return item.get('category') or UNCATEGORIZED
+
+def month_key(moment: datetime) -> str:
+    return moment.astimezone(APP_TIMEZONE).strftime('%Y-%m')
+
+def item_delta(
+    before: Optional[Dict[str, Any]],
+    after: Optional[Dict[str, Any]],
+    now: datetime,
+) -> StatsDelta:
+    """아이템 하나가 before → after로 바뀔 때의 통계 증감 (생성은 before=None, 삭제는 after=None)"""
+    delta = StatsDelta()
+    for item, sign in ((before, -1), (after, 1)):
+        if item is None:
+            continue
+        delta[('total',)] += sign
+        delta[('byCategory', category_key(item))] += sign
+        delta[('byExpiryDate', expiry_key(item))] += sign
+    month = month_key(now)
+    if before is None and after is not None:
+        delta[('monthly', month, 'added')] += 1
+    elif before is not None and after is None:
+        expiry = expiry_key(before)
+        wasted = expiry != NO_EXPIRATION and expiry < now.astimezone(APP_TIMEZONE).date().isoformat()
+        delta[('monthly', month, 'wasted' if wasted else 'consumed')] += 1
+    # 카테고리/유통기한이 그대로인 수정은 서로 상쇄
+    return StatsDelta({path: amount for path, amount in delta.items() if amount})
+
+def field_value(stats: Optional[Dict[str, Any]], path: Tuple[str, ...]) -> int:
+    value: Any = stats or {}
+    for part in path:
+        if not isinstance(value, dict):
+            return 0
+        value = value.get(part)
+    return value if isinstance(value, int) else 0
+
+def stats_writes(delta: StatsDelta, current: Optional[Dict[str, Any]], increment, delete_field) -> Dict[str, Any]:
+    """증감 → set(merge=True)에 넘길 중첩 dict (Firestore Increment, 0이 되는 현재 상태 키는 삭제)"""
+    writes: Dict[str, Any] = {}
+    for path, amount in delta.items():
+        target = writes
+        for part in path[:-1]:
+            target = target.setdefault(part, {})
+        if path[0] in PRUNED_MAPS and field_value(current, path) + amount <= 0:
+            target[path[-1]] = delete_field
+        else:
+            target[path[-1]] = increment(amount)
+    return writes
+
+def build_stats(items: Iterable[Dict[str, Any]], monthly: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """현재 아이템 전체로 통계 문서를 새로 계산 (monthly 이력이 없으면 added_date로 added만 채움)"""
+    by_category, by_expiry, added = Counter(), Counter(), Counter()
+    total = 0
+    for item in items:
+        total += 1
+        by_category[category_key(item)] += 1
+        by_expiry[expiry_key(item)] += 1
+        added_date = item.get('added_date')
+        if monthly is None and isinstance(added_date, str) and len(added_date) >= 7:
+            added[added_date[:7]] += 1
+    if monthly is None:
+        monthly = {month: {'added': count} for month, count in added.items()}
+    return {
+        'total': total,
+        'byCategory': dict(by_category),
+        'byExpiryDate': dict(by_expiry),
+        'monthly': monthly,
+    }
+
+def summarize_stats(stats: Optional[Dict[str, Any]], today: date) -> Dict[str, Any]:
+    """집계 문서 → /api/stats 응답 (유통기한 구간은 오늘 기준으로 계산)"""
+    stats = stats or {}
+    by_expiry = {key: count for key, count in (stats.get('byExpiryDate') or {}).items() if count > 0}
+    limits = [(name, (today + timedelta(days=days)).isoformat()) for name, days in EXPIRY_BUCKETS]
+    today_key = today.isoformat()
+    buckets = dict.fromkeys(['expired'] + [name for name, _ in EXPIRY_BUCKETS] + ['later', 'noExpiration'], 0)
+    by_month: Counter = Counter()
+    for key, count in by_expiry.items():
+        if key == NO_EXPIRATION:
+            buckets['noExpiration'] += count
+            continue
+        by_month[key[:7]] += count
+        if key < today_key:
+            buckets['expired'] += count
+            continue
+        bucket = next((name for name, limit in limits if key <= limit), 'later')
+        buckets[bucket] += count
+    return {
+        'total': stats.get('total', 0),
+        'byCategory': {key: count for key, count in (stats.get('byCategory') or {}).items() if count > 0},
+        'byExpiry': buckets,
+        'byExpiryMonth': dict(sorted(by_month.items())),
+        'monthly': dict(sorted((stats.get('monthly') or {}).items())),
+        'updatedAt': stats.get('updatedAt'),
+    }
@@ -0,0 +1,74 @@
+"""
+유통기한 알림 스케줄러
+매일 정해진 시각(APP_TIMEZONE 기준)에 전체 사용자의 유통기한 임박 아이템을 한 번에 조회해
+사용자마다 다이제스트 푸시 1개를 보냄 (앱이 기기마다 아이템별로 알림을 예약하던 것을 서버에서 대신 처리)
+
+사용법:
+    cd fastapi-backend
+    python workers/expiry_notifier.py                 # 매일 NOTIFY_TIME(기본 09:00)에 스윕
+    python workers/expiry_notifier.py --once          # 지금 한 번만 스윕
+    python workers/expiry_notifier.py --once --dry-run   # 보내지 않고 대상만 확인
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.firebase import get_firestore_client  # noqa: E402
+from services.expiration import APP_TIMEZONE  # noqa: E402
+from services.notifications import ExpiryNotificationScheduler, ExpoPushSender, InMemoryPushSender  # noqa: E402
+
+NOTIFY_TIME = os.getenv('NOTIFY_TIME', '09:00')
+
+
+def next_run_at(now, at):
+    """now 이후 처음 오는 at(HH:MM) 시각"""
+    hour, minute = (int(part) for part in at.split(':'))
+    run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return run_at if run_at > now else run_at + timedelta(days=1)
+
+
+def run_sweep(scheduler, day=None, dry_run=False):
+    started_at = time.perf_counter()
+    stats = scheduler.sweep(day, dry_run=dry_run)
+    elapsed = time.perf_counter() - started_at
+    sent_label = '발송 대상(드라이런)' if dry_run else '발송'
+    print(f"🔔 {day or '오늘'} 스윕 완료 ({elapsed:.1f}초): 아이템 {stats['items']}개, 사용자 {stats['users']}명, "
+          f"{sent_label} {stats['sent']}, 중복 생략 {stats['duplicates']}, 토큰 없음 {stats['no_token']}, 실패 {stats['failed']}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="유통기한 알림 스케줄러")
+    parser.add_argument('--once', action='store_true', help='한 번만 스윕하고 종료')
+    parser.add_argument('--at', default=NOTIFY_TIME, help=f'매일 스윕할 시각 HH:MM (기본 {NOTIFY_TIME})')
+    parser.add_argument('--day', default=None, help='기준 날짜 YYYY-MM-DD (--once와 함께, 기본 오늘)')
+    parser.add_argument('--sender', choices=['expo', 'memory'], default='expo', help='푸시 발송기 (memory: 보내지 않음)')
+    parser.add_argument('--dry-run', action='store_true', help='알림을 보내지 않고 발송 기록도 쓰지 않음 (대상만 확인)')
+    args = parser.parse_args()
+
+    # 드라이런은 발송기를 거치지 않지만, 실수로 보내지 않도록 메모리 발송기로 고정
+    sender = ExpoPushSender() if args.sender == 'expo' and not args.dry_run else InMemoryPushSender()
+    scheduler = ExpiryNotificationScheduler(get_firestore_client(), sender)
+
+    if args.once:
+        run_sweep(scheduler, date.fromisoformat(args.day) if args.day else None, dry_run=args.dry_run)
+        return
+
+    while True:
+        run_at = next_run_at(datetime.now(APP_TIMEZONE), args.at)
+        print(f"⏰ 다음 스윕: {run_at.isoformat()}")
+        time.sleep(max(0.0, (run_at - datetime.now(APP_TIMEZONE)).total_seconds()))
+        try:
+            run_sweep(scheduler, dry_run=args.dry_run)
+        except Exception as e:
+            # 다음 날 스윕은 계속 (발송 기록이 없는 사용자는 다음 스윕에서 다시 대상이 됨)
+            print(f"❌ 스윕 실패: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+비동기 레시피 크롤링 엔진
+키워드별 검색/상세 페이지 요청을 제한된 동시성 풀에서 처리하고,
+요청 간 고정 sleep 대신 호스트별 토큰 버킷으로 요청 속도를 제한
+
+- fetch 단계: 스레드 풀에서 네트워크 I/O만 수행하고 원본 bytes 반환
+- parse 단계: ProcessPoolExecutor 파서 워커가 bytes를 받아 레시피 dict 반환
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlparse
+
+from improved_recipe_crawler import (
+    CrawlFrontier,
+    build_search_url,
+    is_valid_recipe,
+    normalize_recipe_url,
+    parse_recipe_page,
+    parse_search_results,
+    score_recipe,
+    select_best_recipe,
+)
+
+
+class TokenBucket:
+    """토큰 버킷 (초당 rate개 토큰 보충, 최대 burst개 저장)"""
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        """토큰 1개를 얻을 때까지 대기"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """호스트별 토큰 버킷 모음"""
+
+    def __init__(self, requests_per_second, burst=1):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._buckets = {}
+
+    async def acquire(self, url):
+        host = urlparse(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self.requests_per_second, self.burst)
+            self._buckets[host] = bucket
+        await bucket.acquire()
+
+
+class AsyncRecipeCrawler:
+    """제한된 동시성 + 호스트별 속도 제한으로 키워드를 병렬 크롤링"""
+
+    def __init__(self, session, concurrency=8, requests_per_second=2.0, burst=1,
+                 max_pages=2, max_recipes_per_keyword=10, timeout=None, parser_workers=None,
+                 parse_page=parse_recipe_page, parse_search=parse_search_results, checkpoint=None):
+        """timeout: 요청 타임아웃 (None이면 세션 전송 계층의 연결/읽기 타임아웃 사용)
+        parser_workers: 파서 프로세스 수 (None이면 CPU 코어 수, 0이면 이벤트 루프에서 직접 파싱)
+        parse_page / parse_search: 상세/검색 페이지 파서 (프로세스 풀로 넘길 수 있는 모듈 함수)
+        checkpoint: 수집 레시피/키워드 완료를 즉시 기록할 CrawlCheckpoint (선택)
+        """
+        self.checkpoint = checkpoint
+        self.frontier = CrawlFrontier()
+        self.session = session
+        self.parse_page = parse_page
+        self.parse_search = parse_search
+        self.concurrency = concurrency
+        self.max_pages = max_pages
+        self.max_recipes_per_keyword = max_recipes_per_keyword
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(requests_per_second, burst)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        if parser_workers is None:
+            parser_workers = os.cpu_count() or 1
+        self.parser_workers = parser_workers
+        self._parse_executor = ProcessPoolExecutor(max_workers=parser_workers) if parser_workers > 0 else None
+        self._semaphore = None
+
+    async def fetch(self, url):
+        """속도 제한을 지키며 URL 본문(bytes)을 가져옴"""
+        async with self._semaphore:
+            # 캐시에서 바로 응답 가능한 요청은 속도 제한 토큰을 쓰지 않음
+            will_hit = getattr(self.session, 'will_hit', None)
+            if not (will_hit and will_hit(url)):
+                await self.limiter.acquire(url)
+            loop = asyncio.get_running_loop()
+            kwargs = {} if self.timeout is None else {'timeout': self.timeout}
+            response = await loop.run_in_executor(self._executor, partial(self.session.get, url, **kwargs))
+            response.raise_for_status()
+            return response.content
+
+    async def parse(self, func, *args):
+        """파싱 함수를 파서 워커 프로세스에서 실행 (워커가 없으면 직접 실행)"""
+        if self._parse_executor is None:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._parse_executor, func, *args)
+
+    async def search(self, keyword):
+        """검색 페이지들을 동시에 가져와 페이지 순서대로 URL 병합"""
+        pages = range(1, self.max_pages + 1)
+        results = await asyncio.gather(
+            *(self.fetch(build_search_url(keyword, page)) for page in pages),
+            return_exceptions=True,
+        )
+        recipe_urls = []
+        seen = set()
+        for page, content in zip(pages, results):
+            if isinstance(content, Exception):
+                print(f"    ❌ 검색 실패: {keyword} (페이지 {page}) - {content}")
+                continue
+            page_urls, _ = await self.parse(self.parse_search, content)
+            for url in page_urls:
+                if url not in seen:
+                    seen.add(url)
+                    recipe_urls.append(url)
+        return recipe_urls
+
+    async def extract(self, url):
+        """레시피 상세 페이지를 가져와 파싱 (실패 시 None)"""
+        url = normalize_recipe_url(url)
+        try:
+            content = await self.fetch(url)
+            return await self.parse(self.parse_page, content, url)
+        except Exception as e:
+            print(f"    ❌ 레시피 추출 실패: {url} - {e}")
+            return None
+
+    async def crawl_keyword(self, keyword):
+        """키워드 하나를 크롤링하여 최고 점수 레시피 반환"""
+        recipe_urls = await self.search(keyword)
+        if not recipe_urls:
+            print(f"    ⚠️ '{keyword}' 검색 결과 없음")
+            if self.checkpoint:
+                self.checkpoint.mark_keyword_done(keyword, None)
+            return None
+
+        # 다른 키워드가 이미 요청한 레시피는 같은 Task를 기다림 (레시피당 한 번만 요청/파싱)
+        # gather는 입력 순서대로 결과를 돌려주므로 동점 처리도 순차 모드와 동일
+        tasks = [
+            self.frontier.lookup(keyword, url, lambda u: asyncio.ensure_future(self.extract(u)))[0]
+            for url in recipe_urls[:self.max_recipes_per_keyword]
+        ]
+        results = await asyncio.gather(*tasks)
+        keyword_recipes = []
+        for recipe_data in results:
+            if is_valid_recipe(recipe_data):
+                if 'score' not in recipe_data:
+                    recipe_data['score'] = score_recipe(recipe_data)
+                keyword_recipes.append(recipe_data)
+                if self.checkpoint:
+                    self.checkpoint.record_recipe(keyword, recipe_data)
+
+        best_recipe = select_best_recipe(keyword_recipes)
+        if best_recipe:
+            print(f"    🏆 '{keyword}' 최고 점수 레시피 선택: {best_recipe['name']} (점수: {best_recipe['score']})")
+        else:
+            print(f"    ❌ '{keyword}' 유효한 레시피 없음")
+        if self.checkpoint:
+            self.checkpoint.mark_keyword_done(keyword, best_recipe)
+        return best_recipe
+
+    async def crawl(self, keywords):
+        """모든 키워드를 병렬로 크롤링 (키워드 순서대로 결과 dict 구성)"""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        started_at = time.monotonic()
+        try:
+            results = await asyncio.gather(*(self.crawl_keyword(keyword) for keyword in keywords))
+        finally:
+            self._executor.shutdown(wait=False)
+            if self._parse_executor is not None:
+                self._parse_executor.shutdown()
+
+        selected_recipes = {}
+        for keyword, best_recipe in zip(keywords, results):
+            if best_recipe:
+                selected_recipes[keyword] = best_recipe
+        self.frontier.print_stats()
+        print(f"\n⏱️ 비동기 크롤링 소요 시간: {time.monotonic() - started_at:.1f}초")
+        return selected_recipes
+
+
+def crawl_keywords_async(session, keywords, concurrency=8, requests_per_second=2.0, burst=1,
+                         max_pages=2, max_recipes_per_keyword=10, parser_workers=None,
+                         parse_page=parse_recipe_page, parse_search=parse_search_results, checkpoint=None):
+    """비동기 엔진으로 키워드 목록을 크롤링 (요리별 최고 점수 레시피 반환)"""
+    crawler = AsyncRecipeCrawler(
+        session,
+        concurrency=concurrency,
+        requests_per_second=requests_per_second,
+        burst=burst,
+        max_pages=max_pages,
+        max_recipes_per_keyword=max_recipes_per_keyword,
+        parser_workers=parser_workers,
+        parse_page=parse_page,
+        parse_search=parse_search,
+        checkpoint=checkpoint,
+    )
+    return asyncio.run(crawler.crawl(keywords))
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+레시피 일괄 점수 계산 (NumPy)
+score_recipe와 같은 규칙을 레시피 여러 개에 한 번에 적용
+
+- 특징(재료 수, 단계 수, 단계 평균/최대 길이, 이름 키워드 포함 여부)을 배열로 한 번 계산해 두고
+  가중치 표만 바꿔 가며 다시 점수를 매길 수 있음
+- 키워드별 최고 점수 레시피(동점이면 먼저 수집된 레시피)를 한 번의 정렬로 선택
+- 체크포인트(recipes.jsonl)에 기록된 레시피 전체를 새 가중치로 다시 평가하는 CLI 제공
+
+사용법:
+    python batch_scoring.py --checkpoint-dir checkpoints --weights my_weights.json
+"""
+
+import argparse
+import copy
+import json
+
+import numpy as np
+
+from checkpoint import iter_recorded_recipes
+
+# score_recipe의 기본 가중치 표 (구간 표는 [상한, 점수] 순서대로, 처음으로 값 <= 상한인 구간 적용)
+DEFAULT_WEIGHTS = {
+    'keyword_bonus': {"초간단": 25, "간단": 15, "원팬": 10, "자취": 10, "한그릇": 8, "빠른": 8, "쉽게": 8},
+    'keyword_bonus_cap': 40,
+    'celebrity_keywords': ["백종원", "백선생"],
+    'celebrity_bonus': 10,
+    'ingredient_count_tiers': [[4, 50], [6, 40], [9, 25], [12, 15]],
+    'ingredient_count_default': 5,
+    'step_count_tiers': [[3, 40], [5, 30], [8, 15]],
+    'step_count_default': 0,
+    # 단계가 하나도 없으면 적용하지 않음
+    'avg_step_length_tiers': [[60, 20], [100, 12], [140, 6]],
+    'avg_step_length_default': 0,
+    'long_step_length': 260,
+    'long_step_penalty': 10,
+    'base': 10,
+}
+
+
+def merge_weights(overrides=None):
+    """기본 가중치 표에 덮어쓸 항목만 반영한 사본"""
+    weights = copy.deepcopy(DEFAULT_WEIGHTS)
+    weights.update(overrides or {})
+    return weights
+
+
+def weight_keywords(weights):
+    """가중치 표가 참조하는 이름 키워드 전체 (특징 계산에 필요)"""
+    return list(dict.fromkeys(list(weights['keyword_bonus']) + list(weights['celebrity_keywords'])))
+
+
+class RecipeFeatures:
+    """레시피 N개의 점수 특징 (모두 길이 N 배열, keyword_hits만 N × 키워드 수)"""
+
+    def __init__(self, ingredient_count, step_count, step_length_sum, max_step_length, keyword_hits, keywords):
+        self.ingredient_count = ingredient_count
+        self.step_count = step_count
+        self.max_step_length = max_step_length
+        self.keyword_hits = keyword_hits
+        self.keywords = list(keywords)
+        # 단계가 없는 레시피는 평균 길이 0 (점수 계산에서 따로 제외)
+        self.avg_step_length = np.divide(
+            step_length_sum, step_count,
+            out=np.zeros(len(step_count), dtype=np.float64), where=step_count > 0,
+        )
+
+    def __len__(self):
+        return len(self.ingredient_count)
+
+    def hits(self, keyword):
+        return self.keyword_hits[:, self.keywords.index(keyword)]
+
+
+def features_from_columns(names, ingredient_counts, step_lengths, step_offsets, keywords):
+    """열 단위 데이터 → RecipeFeatures
+
+    step_lengths: 모든 레시피 단계 길이를 이어 붙인 배열
+    step_offsets: 레시피 i의 단계가 step_lengths[step_offsets[i]:step_offsets[i + 1]] (길이 N + 1)
+    """
+    names = np.asarray(names, dtype=str)
+    step_lengths = np.asarray(step_lengths, dtype=np.int64)
+    step_offsets = np.asarray(step_offsets, dtype=np.int64)
+    count = len(names)
+    step_count = np.diff(step_offsets)
+    owners = np.repeat(np.arange(count), step_count)
+    step_length_sum = np.bincount(owners, weights=step_lengths, minlength=count)
+    max_step_length = np.zeros(count, dtype=np.int64)
+    np.maximum.at(max_step_length, owners, step_lengths)
+    keyword_hits = np.zeros((count, len(keywords)), dtype=bool)
+    if count:
+        for column, keyword in enumerate(keywords):
+            keyword_hits[:, column] = np.char.find(names, keyword) >= 0
+    return RecipeFeatures(
+        np.asarray(ingredient_counts, dtype=np.int64), step_count,
+        step_length_sum, max_step_length, keyword_hits, keywords,
+    )
+
+
+def extract_features(recipes, keywords):
+    """레시피 dict 목록 → RecipeFeatures"""
+    names, ingredient_counts, step_lengths, step_offsets = [], [], [], [0]
+    for recipe in recipes:
+        names.append(recipe.get('name', ''))
+        ingredient_counts.append(len(recipe.get('ingredients', [])))
+        steps = recipe.get('steps', [])
+        step_lengths.extend(map(len, steps))
+        step_offsets.append(step_offsets[-1] + len(steps))
+    return features_from_columns(names, ingredient_counts, step_lengths, step_offsets, keywords)
+
+
+def tier_points(values, tiers, default):
+    """값마다 처음으로 값 <= 상한인 구간의 점수 (어느 구간에도 없으면 default)"""
+    conditions = [values <= limit for limit, _ in tiers]
+    choices = [points for _, points in tiers]
+    return np.select(conditions, choices, default=default)
+
+
+def score_features(features, weights=None):
+    """RecipeFeatures → 점수 배열 (기본 가중치면 score_recipe와 같은 값)"""
+    weights = merge_weights(weights)
+    scores = np.zeros(len(features), dtype=np.float64)
+
+    keyword_bonus = np.zeros(len(features), dtype=np.float64)
+    for keyword, points in weights['keyword_bonus'].items():
+        keyword_bonus += features.hits(keyword) * points
+    scores += np.minimum(keyword_bonus, weights['keyword_bonus_cap'])
+
+    celebrity = np.zeros(len(features), dtype=bool)
+    for keyword in weights['celebrity_keywords']:
+        celebrity |= features.hits(keyword)
+    scores += celebrity * weights['celebrity_bonus']
+
+    scores += tier_points(features.ingredient_count, weights['ingredient_count_tiers'],
+                          weights['ingredient_count_default'])
+    scores += tier_points(features.step_count, weights['step_count_tiers'], weights['step_count_default'])
+    scores += np.where(
+        features.step_count > 0,
+        tier_points(features.avg_step_length, weights['avg_step_length_tiers'], weights['avg_step_length_default']),
+        0,
+    )
+    scores -= (features.max_step_length > weights['long_step_length']) * weights['long_step_penalty']
+    scores += weights['base']
+    return scores
+
+
+def score_recipes(recipes, weights=None):
+    """레시피 dict 목록 → 점수 배열"""
+    weights = merge_weights(weights)
+    return score_features(extract_features(recipes, weight_keywords(weights)), weights)
+
+
+def best_per_group(scores, groups, group_count):
+    """그룹별 최고 점수 위치 (동점이면 앞쪽, 레시피가 없는 그룹은 -1)"""
+    scores = np.asarray(scores)
+    groups = np.asarray(groups, dtype=np.int64)
+    best = np.full(group_count, -1, dtype=np.int64)
+    if not len(scores):
+        return best
+    # 그룹 → 점수 내림차순 → 원래 순서로 정렬한 뒤 그룹마다 첫 항목
+    order = np.lexsort((np.arange(len(scores)), -scores, groups))
+    sorted_groups = groups[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sorted_groups[1:] != sorted_groups[:-1]
+    best[sorted_groups[first]] = order[first]
+    return best
+
+
+def score_and_select(keyword_recipes, weights=None):
+    """{키워드: [레시피, ...]} → ({키워드: 점수 목록}, {키워드: 최고 점수 레시피})"""
+    keywords = list(keyword_recipes)
+    recipes, groups = [], []
+    for group, keyword in enumerate(keywords):
+        recipes.extend(keyword_recipes[keyword])
+        groups.extend([group] * len(keyword_recipes[keyword]))
+    scores = score_recipes(recipes, weights)
+    best = best_per_group(scores, groups, len(keywords))
+
+    scores_by_keyword, selected = {}, {}
+    offset = 0
+    for group, keyword in enumerate(keywords):
+        size = len(keyword_recipes[keyword])
+        scores_by_keyword[keyword] = scores[offset:offset + size].tolist()
+        offset += size
+        if best[group] >= 0:
+            selected[keyword] = recipes[best[group]]
+    return scores_by_keyword, selected
+
+
+def load_checkpoint_corpus(checkpoint_dir):
+    """체크포인트 recipes.jsonl → {키워드: [레시피, ...]} (기록 순서 유지, --resume으로 다시 기록된 레시피는 한 번만)"""
+    keyword_recipes, seen = {}, set()
+    for keyword, recipe in iter_recorded_recipes(checkpoint_dir):
+        key = (keyword, recipe.get('id'))
+        if key in seen:
+            continue
+        seen.add(key)
+        keyword_recipes.setdefault(keyword, []).append(recipe)
+    return keyword_recipes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="체크포인트 레시피 일괄 재평가")
+    parser.add_argument('--checkpoint-dir', required=True, help='recipes.jsonl이 있는 체크포인트 디렉터리')
+    parser.add_argument('--weights', default=None, help='기본 가중치 표에 덮어쓸 JSON 파일')
+    parser.add_argument('--show-weights', action='store_true', help='기본 가중치 표 출력 후 종료')
+    args = parser.parse_args()
+
+    if args.show_weights:
+        print(json.dumps(DEFAULT_WEIGHTS, ensure_ascii=False, indent=2))
+        return
+
+    overrides = None
+    if args.weights:
+        with open(args.weights, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+
+    keyword_recipes = load_checkpoint_corpus(args.checkpoint_dir)
+    total = sum(len(recipes) for recipes in keyword_recipes.values())
+    print(f"📊 키워드 {len(keyword_recipes)}개, 레시피 {total}개 재평가")
+
+    _, current = score_and_select(keyword_recipes)
+    scores_by_keyword, selected = score_and_select(keyword_recipes, overrides)
+    changed = 0
+    for keyword, recipe in selected.items():
+        best_score = max(scores_by_keyword[keyword])
+        if current.get(keyword, {}).get('id') != recipe.get('id'):
+            changed += 1
+            print(f"    🔄 {keyword}: {current[keyword]['name']} → {recipe['name']} (점수: {best_score:g})")
+    print(f"✅ 선택이 바뀐 키워드 {changed}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벤치마크 기준선용 레시피 추출기 (고정본)
+키워드 매처/lxml 추출기 도입 전 improved_recipe_crawler.py의
+parse_search_results, parse_recipe_page와 보조 함수를 그대로 옮겨 둔 것
+→ bench_extract.py가 "변경 전" 처리량을 재현할 때만 사용 (수정하지 말 것)
+"""
+
+import random
+import re
+import time
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+BASE_URL = "https://www.10000recipe.com"
+
+RECIPE_NUMBER_PATTERN = re.compile(r'/recipe/(\d+)')
+
+def parse_search_results(content):
+    """검색 결과 페이지에서 레시피 URL 목록 추출 (페이지 내 순서 유지)"""
+    soup = BeautifulSoup(content, 'html.parser')
+    recipe_urls = []
+
+    # 레시피 링크 추출
+    recipe_links = soup.find_all('a', href=re.compile(r'/recipe/\d+'))
+
+    for link in recipe_links:
+        href = link.get('href')
+        if href and '/recipe/' in href:
+            full_url = urljoin(BASE_URL, href)
+            if full_url not in recipe_urls:
+                recipe_urls.append(full_url)
+
+    return recipe_urls, len(recipe_links)
+
+
+def clean_ingredient_text(text):
+    """재료 텍스트 정리 (구매/조리도구 제거)"""
+    # "구매" 제거
+    text = re.sub(r'구매$', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    # 조리도구 키워드 제거
+    utensil_keywords = [
+        '도마','칼','조리용나이프','나이프','스푼','수저','숟가락','젓가락','집게','뒤집개','국자','거품기','볼','그릇',
+        '냄비','팬','프라이팬','오븐','전자레인지','믹서기','블렌더','체','망','찜기','압력솥','계량컵','계량스푼','요리도구','조리도구', '뚝배기'
+    ]
+    lowered = text.lower()
+    for k in utensil_keywords:
+        if k in lowered:
+            return ''
+    return text
+
+def extract_servings(soup, rng=random):
+    """몇인분인지 추출 (찾지 못하면 rng로 기본값 생성)"""
+    try:
+        # 여러 패턴으로 인분 정보 찾기
+        patterns = [
+            r'(\d+)인분',
+            r'(\d+)인',
+            r'(\d+)명',
+            r'(\d+)인용'
+        ]
+
+        text_content = soup.get_text()
+
+        for pattern in patterns:
+            match = re.search(pattern, text_content)
+            if match:
+                return int(match.group(1))
+
+        # 기본값
+        return rng.randint(1, 4)
+
+    except:
+        return rng.randint(1, 4)
+
+def clean_recipe_steps(steps):
+    """레시피 단계 정리 (불필요한 내용 제거, 간결화)"""
+    cleaned_steps = []
+    remove_prefix_patterns = [r'^[0-9]+\.\s*', r'^[가-힣A-Za-z]*\s*:']
+    ban_words = ['이야기', '후기', '소감', '잡담', '광고', '이벤트', '판매', '구독', '좋아요', '댓글', '공유']
+    tip_words = ['팁', 'TIP', '참고', '주의', '노하우']
+
+    for step in steps:
+        if not step:
+            continue
+        # 너무 짧은 단계 제거 (5글자 미만)
+        if len(step) < 5:
+            continue
+
+        # 번호/라벨 제거
+        for pat in remove_prefix_patterns:
+            step = re.sub(pat, '', step)
+        # 괄호/대괄호는 더이상 제거하지 않음 (보조설명 유지)
+        # 팁/주석 섹션 잘라내기
+        for w in tip_words:
+            idx = step.find(w)
+            if idx != -1 and idx > 0:
+                step = step[:idx]
+                break
+        # 광고/잡담 포함 단계 제외
+        if any(w in step for w in ban_words):
+            continue
+        # 공백 정리
+        step = re.sub(r'\s+', ' ', step).strip()
+        # 이미 단계 추출에서 보조설명을 괄호로 처리했으므로 추가 처리 불필요
+        # 너무 긴 문장은 자르기 (보조설명이 포함되므로 제한을 늘림)
+        if len(step) > 300:
+            step = step[:300].rstrip() + '…'
+        if step and len(step) >= 5:
+            cleaned_steps.append(step)
+
+    return cleaned_steps
+
+def get_recipe_number(url):
+    """레시피 URL에서 만개의 레시피 고유 번호 추출 (없으면 None)"""
+    match = RECIPE_NUMBER_PATTERN.search(url or '')
+    return int(match.group(1)) if match else None
+
+def make_recipe_id(url):
+    """원본 URL 번호 기반의 고정 문서 ID (재크롤링해도 같은 ID)"""
+    recipe_number = get_recipe_number(url)
+    if recipe_number is None:
+        return f"crawled_{int(time.time())}_{random.randint(1000, 9999)}"
+    return f"recipe_{recipe_number}"
+
+def parse_recipe_page(content, url):
+    """레시피 상세 페이지 HTML에서 레시피 데이터 추출"""
+    soup = BeautifulSoup(content, 'html.parser')
+
+    # 레시피 제목
+    title_elem = soup.find('h3', class_='view2_summary_info3') or soup.find('h1', class_='view2_summary_info3')
+    if not title_elem:
+        title_elem = soup.find('h3') or soup.find('h1')
+
+    title = title_elem.get_text(strip=True) if title_elem else "제목 없음"
+    # 밀키트 레시피 제외
+    if '밀키트' in title:
+        return None
+
+    # 레시피 이미지 (만개의 레시피 이미지만)
+    img_elem = soup.find('img', class_='view2_summary_img') or soup.find('img', {'class': re.compile(r'.*summary_img.*')})
+    if not img_elem:
+        img_elem = soup.find('img', {'src': re.compile(r'.*recipe.*')}) or soup.find('img', {'src': re.compile(r'.*food.*')})
+
+    image_url = ""
+    if img_elem and img_elem.get('src'):
+        img_src = img_elem.get('src')
+        if img_src.startswith('//'):
+            image_url = 'https:' + img_src
+        elif img_src.startswith('/'):
+            image_url = BASE_URL + img_src
+        elif img_src.startswith('http'):
+            image_url = img_src
+
+    # 재료 정보
+    ingredients = []
+    ingredient_sections = soup.find_all('div', class_='ready_ingre3')
+
+    for section in ingredient_sections:
+        ingredient_items = section.find_all('li')
+        for item in ingredient_items:
+            ingredient_text = item.get_text(strip=True)
+            if ingredient_text and ingredient_text != '재료':
+                # 재료 텍스트 정리
+                cleaned_ingredient = clean_ingredient_text(ingredient_text)
+                # 밀키트 언급 포함 시 제외
+                if cleaned_ingredient and '밀키트' not in cleaned_ingredient:
+                    ingredients.append(cleaned_ingredient)
+
+    # 조리법
+    steps = []
+    # 1순위: 데스크톱의 명확한 단계 블록(id=stepDivN)
+    step_items = soup.find_all('div', id=re.compile(r'^stepDiv\d+$'))
+    # 대체: 넓은 선택자 (모바일/변형 대응)
+    if not step_items:
+        step_sections = soup.select('div.view_step, section.view_step, div.rd_step, section.rd_step, [class*="step"]')
+        step_items = []
+        for section in step_sections:
+            step_items.extend(section.select('div.view_step_cont, div.rd_step_cont, li.view_step_cont, .step_cont, .step_txt, li'))
+
+    for item in step_items:
+        # 1) 메인 텍스트와 보조설명을 HTML 구조로 분리
+        main_text = ''
+        sub_text = ''
+
+        # 메인 텍스트: media-body에서 step_add 클래스 제외한 부분
+        main_elem = item.find('div', class_='media-body')
+        if main_elem:
+            # step_add 클래스 요소들 제거하고 메인 텍스트 추출
+            main_elem_copy = main_elem.__copy__()
+            for tip_elem in main_elem_copy.find_all('p', class_='step_add'):
+                tip_elem.decompose()
+            main_text = main_elem_copy.get_text('\n', strip=True)
+            # 모든 일반 줄을 메인 텍스트로 사용 (줄바꿈을 공백으로)
+            main_lines = [ln.strip() for ln in main_text.split('\n') if ln.strip()]
+            main_text = ' '.join(main_lines) if main_lines else ''
+
+        # 보조설명: step_add 클래스 요소들
+        tip_elements = item.find_all('p', class_='step_add')
+        tip_texts = []
+        for tip_elem in tip_elements:
+            tip_text = tip_elem.get_text(' ', strip=True)
+            if tip_text:
+                tip_texts.append(tip_text)
+
+        if tip_texts:
+            sub_text = ' '.join(tip_texts)
+
+        # 2) 불릿(•)으로 시작하는 보조설명도 찾기
+        raw_text = item.get_text('\n', strip=True)
+        lines = [ln.strip() for ln in raw_text.split('\n') if ln and ln.strip()]
+
+        bullet_lines = []
+        for line in lines:
+            if re.match(r'^[•ㆍ●★☆◆◇▪▫]\s*', line):
+                bullet_text = re.sub(r'^[•ㆍ●★☆◆◇▪▫]+\s*', '', line).strip()
+                if bullet_text:
+                    bullet_lines.append(bullet_text)
+
+        if bullet_lines:
+            bullet_text = ' '.join(bullet_lines)
+            sub_text = (sub_text + ' ' + bullet_text).strip() if sub_text else bullet_text
+
+        # 3) 작은 회색/보조 span 들 수집하여 보조설명에 추가
+        sub_elements = item.find_all('span', class_=re.compile(r'(small|gray|tip|note)', re.I))
+        extra_subs = [se.get_text(' ', strip=True) for se in sub_elements if se.get_text(strip=True)]
+        if extra_subs:
+            sub_text = (sub_text + ' ' + ' '.join(extra_subs)).strip() if sub_text else ' '.join(extra_subs)
+
+        # 4) 결합 및 정리
+        step_text = main_text.strip()
+        if step_text and sub_text:
+            step_text = f"{step_text} ({sub_text})"
+        elif not step_text and sub_text:
+            step_text = sub_text
+        elif not step_text:
+            # 메인 텍스트가 없으면 전체 텍스트 사용
+            step_text = ' '.join([ln.strip() for ln in lines if ln.strip()])
+
+        step_text = re.sub(r'\s+', ' ', step_text).strip()
+
+        if step_text and '밀키트' not in step_text:
+            steps.append(step_text)
+
+    # 조리법 정리
+    steps = clean_recipe_steps(steps)
+
+    # 태그
+    tags = []
+    tag_elements = soup.find_all('a', href=re.compile(r'/recipe/list\.html\?q='))
+    for tag_elem in tag_elements:
+        tag_text = tag_elem.get_text(strip=True)
+        if tag_text and len(tag_text) > 1:
+            tags.append(tag_text)
+
+    # 페이지에 없는 값(인분/조리시간/난이도)은 레시피 번호로 시드한 난수로 채움
+    # → 같은 레시피는 매번 같은 값이 나와 내용 해시가 안정적으로 유지됨
+    recipe_number = get_recipe_number(url)
+    rng = random.Random(recipe_number) if recipe_number is not None else random
+
+    # 인분 수 추출
+    servings = extract_servings(soup, rng)
+
+    # 기본 정보
+    recipe_id = make_recipe_id(url)
+
+    # 요리 카테고리 판단
+    category = "한식"
+    if any(keyword in title for keyword in ["파스타", "스파게티", "피자", "스테이크", "샐러드", "그라탕", "오믈렛"]):
+        category = "양식"
+    elif any(keyword in title for keyword in ["초밥", "라멘", "우동", "돈카츠", "텐푸라", "규동", "가츠동"]):
+        category = "일식"
+    elif any(keyword in title for keyword in ["짜장면", "짬뽕", "탕수육", "깐풍기", "마파두부", "춘권", "만두"]):
+        category = "중식"
+
+    recipe_data = {
+        "id": recipe_id,
+        "name": title,
+        "ingredients": ingredients,
+        "steps": steps,
+        "tags": tags[:5],  # 최대 5개 태그
+        "imageUrl": image_url,
+        "sourceUrl": url,
+        "category": category,
+        "servings": servings,
+        "cookingTime": rng.randint(15, 120),  # 15-120분
+        "difficulty": rng.choice(["쉬움", "보통", "어려움"]),
+    }
+
+    return recipe_data
+
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+크롤링 파이프라인 리플레이 벤치마크
+저장된 검색/레시피 HTML 픽스처를 로컬 HTTP 서버로 띄워 실제 사이트 없이 크롤링 전체를 재현하고
+단계별 시간(fetch/parse/clean/servings/score/upload-serialize), pages/s, 페이지 지연 p50/p99, 최대 RSS를 측정
+
+- 검색: /recipe/list.html?q=키워드&page=1 → fixtures/search/<키워드>.html
+  (픽스처가 없는 키워드는 검색 픽스처를 순환해서 응답, 2페이지부터는 빈 결과)
+- 레시피: /recipe/<번호> → fixtures/recipes/<번호>.html (없는 번호는 레시피 픽스처를 순환해서 응답)
+- --server-delay-ms로 응답마다 네트워크 지연을 흉내 낼 수 있음 (기본 0: 파싱 경로만 측정)
+- --mode both 이면 순차/비동기 모드를 각각 별도 프로세스에서 실행해 최대 RSS가 섞이지 않게 함
+- 비동기 모드에서 파서 워커 프로세스를 쓰면(--parser-workers > 0) clean/servings 시간은 워커 안에서 쓰여
+  집계되지 않고, parse 시간에는 프로세스 간 전달 시간이 포함됨
+- 비동기 모드의 페이지 지연에는 동시성 제한(세마포어/토큰 버킷) 대기 시간이 포함됨
+
+사용법:
+    cd recipe_crawler
+    python benchmarks/bench_crawl.py                                  # 순차 vs 비동기 비교
+    python benchmarks/bench_crawl.py --mode async --concurrency 16 --keywords 20
+    python benchmarks/bench_crawl.py --keywords 10 --server-delay-ms 50    # 네트워크 지연 포함 비교
+    python benchmarks/bench_crawl.py --parser bs4 --json              # 결과를 JSON 한 줄로 출력
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CRAWLER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CRAWLER_DIR)
+
+import improved_recipe_crawler as crawler  # noqa: E402
+import async_crawler  # noqa: E402
+from firestore_sync import recipe_content_hash  # noqa: E402
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+EMPTY_SEARCH_PAGE = '<html><body><ul class="common_sp_list_ul"></ul></body></html>'.encode('utf-8')
+STAGES = ('fetch', 'search-parse', 'parse', 'clean', 'servings', 'score', 'upload-serialize')
+
+
+class FixtureStore:
+    """fixtures/search, fixtures/recipes 디렉터리의 HTML을 메모리에 올려 두고 요청 경로로 응답"""
+
+    def __init__(self, directory):
+        self.search_pages = self._load(os.path.join(directory, 'search'))
+        self.recipe_pages = self._load(os.path.join(directory, 'recipes'))
+        if not self.search_pages or not self.recipe_pages:
+            raise ValueError(f"검색/레시피 픽스처가 필요합니다: {directory}")
+        self._search_list = [self.search_pages[name] for name in sorted(self.search_pages)]
+        self._recipe_list = [self.recipe_pages[name] for name in sorted(self.recipe_pages)]
+
+    @staticmethod
+    def _load(directory):
+        pages = {}
+        if not os.path.isdir(directory):
+            return pages
+        for filename in sorted(os.listdir(directory)):
+            name, ext = os.path.splitext(filename)
+            if ext == '.html':
+                with open(os.path.join(directory, filename), 'rb') as f:
+                    pages[name] = f.read()
+        return pages
+
+    def keywords(self):
+        return sorted(self.search_pages)
+
+    def search_page(self, keyword, page):
+        if page > 1:
+            return EMPTY_SEARCH_PAGE
+        if keyword in self.search_pages:
+            return self.search_pages[keyword]
+        return self._search_list[zlib.crc32(keyword.encode('utf-8')) % len(self._search_list)]
+
+    def recipe_page(self, number):
+        if number in self.recipe_pages:
+            return self.recipe_pages[number]
+        return self._recipe_list[int(number) % len(self._recipe_list)]
+
+    def resolve(self, path):
+        """요청 경로 → HTML bytes (해당 없음이면 None)"""
+        parsed = urlparse(path)
+        if parsed.path == '/recipe/list.html':
+            query = parse_qs(parsed.query)
+            keyword = query.get('q', [''])[0]
+            page = int(query.get('page', ['1'])[0])
+            return self.search_page(keyword, page)
+        match = crawler.RECIPE_NUMBER_PATTERN.fullmatch(parsed.path)
+        if match:
+            return self.recipe_page(match.group(1))
+        return None
+
+
+def start_server(store, delay=0.0):
+    """픽스처를 응답하는 로컬 HTTP 서버를 백그라운드 스레드로 시작 (반환: server, base_url)"""
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive로 실제 세션과 비슷하게 연결 재사용
+        disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 지연 ACK로 40ms씩 밀리는 것 방지
+
+        def do_GET(self):
+            if delay:
+                time.sleep(delay)
+            body = store.resolve(self.path)
+            if body is None:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
+
+
+class StageTimer:
+    """단계별 소요 시간 기록 (스레드에서 동시에 호출해도 list.append만 사용)"""
+
+    def __init__(self):
+        self.samples = {stage: [] for stage in STAGES}
+        self.page_latencies = []
+
+    def wrap(self, stage, func):
+        samples = self.samples[stage]
+
+        def timed(*args, **kwargs):
+            started_at = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter() - started_at)
+        return timed
+
+    def totals(self):
+        return {stage: sum(values) for stage, values in self.samples.items()}
+
+
+class ReplaySession:
+    """만개의 레시피 URL을 로컬 리플레이 서버로 바꿔 요청하는 세션 래퍼"""
+
+    def __init__(self, session, local_base, timer):
+        self.session = session
+        self.local_base = local_base
+        self.last_from_cache = False
+        self._get = timer.wrap('fetch', self._replay_get)
+
+    def _replay_get(self, url, **kwargs):
+        if url.startswith(crawler.BASE_URL):
+            url = self.local_base + url[len(crawler.BASE_URL):]
+        return self.session.get(url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self._get(url, **kwargs)
+
+
+def percentile(values, pct):
+    """nearest-rank 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb():
+    """이 프로세스와 종료된 자식 프로세스(파서 워커)의 최대 RSS (MB)"""
+    # Linux는 KB, macOS는 bytes 단위
+    unit = 1 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit
+    return own / 2**20, children / 2**20
+
+
+def instrument(timer):
+    """크롤러 모듈의 단계 함수들을 시간 측정 래퍼로 교체 (이 프로세스 안에서만 유효)"""
+    crawler.clean_recipe_steps = timer.wrap('clean', crawler.clean_recipe_steps)
+    crawler.extract_servings_from_text = timer.wrap('servings', crawler.extract_servings_from_text)
+    crawler.score_recipe = timer.wrap('score', crawler.score_recipe)
+    async_crawler.score_recipe = crawler.score_recipe
+
+    # 순차 모드의 페이지 지연 = 레시피 1개 fetch + parse
+    extract_recipe_data = crawler.extract_recipe_data
+
+    def timed_extract(*args, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            return extract_recipe_data(*args, **kwargs)
+        finally:
+            timer.page_latencies.append(time.perf_counter() - started_at)
+    crawler.extract_recipe_data = timed_extract
+
+
+class TimedAsyncRecipeCrawler(async_crawler.AsyncRecipeCrawler):
+    """페이지 지연과 파싱 시간을 기록하는 비동기 크롤러"""
+
+    def __init__(self, *args, timer, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timer = timer
+
+    async def parse(self, func, *args):
+        stage = 'parse' if func is self.parse_page else 'search-parse'
+        started_at = time.perf_counter()
+        try:
+            return await super().parse(func, *args)
+        finally:
+            self.timer.samples[stage].append(time.perf_counter() - started_at)
+
+    async def extract(self, url):
+        started_at = time.perf_counter()
+        try:
+            return await super().extract(url)
+        finally:
+            self.timer.page_latencies.append(time.perf_counter() - started_at)
+
+
+def select_parsers(parser):
+    if parser == 'lxml':
+        from fast_extractor import parse_recipe_page_fast, parse_search_results_fast
+        return parse_recipe_page_fast, parse_search_results_fast
+    return crawler.parse_recipe_page, crawler.parse_search_results
+
+
+def serialize_for_upload(timer, recipes):
+    """업로드 직렬화 단계: 내용 해시 + 체크포인트 JSONL 한 줄 생성"""
+    serialize = timer.wrap('upload-serialize', lambda recipe: (
+        recipe_content_hash(recipe), json.dumps({'recipe': recipe}, ensure_ascii=False)
+    ))
+    for recipe in recipes:
+        serialize(recipe)
+
+
+def run_mode(args):
+    """한 가지 모드로 픽스처 크롤링을 실행하고 측정 결과 dict 반환"""
+    store = FixtureStore(args.fixtures)
+    server, local_base = start_server(store, delay=args.server_delay_ms / 1000)
+    timer = StageTimer()
+    instrument(timer)
+    crawler.REQUEST_DELAY_RANGE = (0, 0)
+
+    keywords = store.keywords()
+    if args.keywords:
+        keywords = [keywords[i] if i < len(keywords) else f"벤치마크{i}" for i in range(args.keywords)]
+    parse_page, parse_search = select_parsers(args.parser)
+    session = ReplaySession(crawler.get_session(), local_base, timer)
+
+    output = io.StringIO()
+    started_at = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+        if args.mode == 'async':
+            engine = TimedAsyncRecipeCrawler(
+                session,
+                concurrency=args.concurrency,
+                requests_per_second=args.rps,
+                burst=args.concurrency,
+                max_pages=args.max_pages,
+                max_recipes_per_keyword=args.max_recipes,
+                parser_workers=args.parser_workers,
+                parse_page=parse_page,
+                parse_search=parse_search,
+                timer=timer,
+            )
+            selected = asyncio.run(engine.crawl(keywords))
+        else:
+            selected = crawler.crawl_keywords_sequential(
+                session,
+                keywords,
+                max_pages=args.max_pages,
+                max_recipes_per_keyword=args.max_recipes,
+                parse_page=timer.wrap('parse', parse_page),
+                parse_search=timer.wrap('search-parse', parse_search),
+            )
+        serialize_for_upload(timer, selected.values())
+    elapsed = time.perf_counter() - started_at
+    server.shutdown()
+
+    own_rss, children_rss = peak_rss_mb()
+    pages = len(timer.page_latencies)
+    return {
+        'mode': args.mode,
+        'parser': args.parser,
+        'keywords': len(keywords),
+        'selected': len(selected),
+        'pages': pages,
+        'requests': len(timer.samples['fetch']),
+        'elapsed': elapsed,
+        'pages_per_sec': pages / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(timer.page_latencies, 50) * 1000,
+        'p99_ms': percentile(timer.page_latencies, 99) * 1000,
+        'stages': timer.totals(),
+        'peak_rss_mb': own_rss,
+        'children_peak_rss_mb': children_rss,
+    }
+
+
+def print_result(result):
+    print(f"\n📊 [{result['mode']}/{result['parser']}] 키워드 {result['keywords']}개, "
+          f"레시피 페이지 {result['pages']}개, 요청 {result['requests']}개, 선택 {result['selected']}개")
+    print(f"   ⏱️ 전체 {result['elapsed']:.2f}초 → {result['pages_per_sec']:.1f} pages/s")
+    print(f"   📈 페이지 지연 p50 {result['p50_ms']:.1f}ms / p99 {result['p99_ms']:.1f}ms")
+    print("   🧩 단계별 누적 시간 (parse는 clean/servings 포함):")
+    for stage in STAGES:
+        print(f"      - {stage}: {result['stages'][stage] * 1000:.1f}ms")
+    rss = f"   💾 최대 RSS {result['peak_rss_mb']:.1f}MB"
+    if result['children_peak_rss_mb']:
+        rss += f" (파서 워커 최대 {result['children_peak_rss_mb']:.1f}MB)"
+    print(rss)
+
+
+def run_isolated(mode, argv):
+    """모드별로 별도 프로세스에서 실행해 결과 dict 수집 (최대 RSS 분리)"""
+    command = [sys.executable, os.path.abspath(__file__), *argv, '--mode', mode, '--json']
+    completed = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="크롤링 파이프라인 리플레이 벤치마크")
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES_DIR,
+                        help='recipes/, search/ 하위 폴더에 HTML이 있는 디렉터리')
+    parser.add_argument('--mode', choices=['sequential', 'async', 'both'], default='both',
+                        help='실행할 크롤링 모드 (기본: 둘 다 실행해 비교)')
+    parser.add_argument('--parser', choices=['lxml', 'bs4'], default='lxml', help='HTML 추출기')
+    parser.add_argument('--keywords', type=int, default=0,
+                        help='크롤링할 키워드 수 (기본: 검색 픽스처 수, 더 많으면 픽스처를 순환)')
+    parser.add_argument('--max-pages', type=int, default=2, help='키워드당 검색 페이지 수')
+    parser.add_argument('--max-recipes', type=int, default=10, help='키워드당 레시피 수')
+    parser.add_argument('--concurrency', type=int, default=8, help='비동기 모드 동시 요청 수')
+    parser.add_argument('--rps', type=float, default=1000.0,
+                        help='비동기 모드 초당 요청 수 (기본값은 사실상 제한 없음)')
+    parser.add_argument('--parser-workers', type=int, default=0,
+                        help='비동기 모드 파서 프로세스 수 (기본 0: 이벤트 루프에서 파싱, 단계별 시간 전체 집계)')
+    parser.add_argument('--server-delay-ms', type=float, default=0.0,
+                        help='리플레이 서버 응답 지연 (ms, 네트워크 지연 흉내)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON 한 줄로 출력')
+    parser.add_argument('--verbose', action='store_true', help='크롤러 로그 출력')
+    return parser.parse_args(argv)
+
+
+def main():
+    argv = sys.argv[1:]
+    args = parse_args(argv)
+    if args.mode != 'both':
+        result = run_mode(args)
+        if args.json:
+            print(json.dumps(result, ensure_ascii=False))
+        else:
+            print_result(result)
+        return
+
+    # --mode/--json은 자식 프로세스에서 다시 지정
+    child_argv = [arg for arg in argv if arg not in ('--json', '--mode', 'both')]
+    results = [run_isolated(mode, child_argv) for mode in ('sequential', 'async')]
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False))
+        return
+    for result in results:
+        print_result(result)
+    sequential, concurrent = results
+    if sequential['pages_per_sec']:
+        print(f"\n🚀 비동기/순차 처리량: {concurrent['pages_per_sec'] / sequential['pages_per_sec']:.1f}배")
+
+
+if __name__ == "__main__":
+    main()
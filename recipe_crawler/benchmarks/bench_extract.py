@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+레시피 추출기 벤치마크
+저장된 HTML 픽스처로 변경 전 추출기(baseline_extractor, 고정본),
+현재 BeautifulSoup 추출기(parse_recipe_page), lxml 단일 패스 추출기(parse_recipe_page_fast)의
+초당 처리 페이지 수를 비교 (배수는 변경 전 기준)
+
+사용법:
+    cd recipe_crawler
+    python benchmarks/bench_extract.py --rounds 20
+    python benchmarks/bench_extract.py --fixtures /path/to/saved_pages   # 직접 저장한 페이지로 측정
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+CRAWLER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CRAWLER_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from improved_recipe_crawler import BASE_URL, parse_recipe_page, parse_search_results  # noqa: E402
+from fast_extractor import parse_recipe_page_fast, parse_search_results_fast  # noqa: E402
+import baseline_extractor as baseline  # noqa: E402
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_pages(directory):
+    """디렉터리의 *.html 파일을 (URL, bytes) 목록으로 로드 (파일명 = 레시피 번호)"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, 'rb') as f:
+            pages.append((f"{BASE_URL}/recipe/{name}", f.read()))
+    return pages
+
+
+def measure(parse, pages, rounds):
+    """rounds회 반복 파싱 후 초당 페이지 수 반환"""
+    started_at = time.perf_counter()
+    for _ in range(rounds):
+        for url, content in pages:
+            parse(content, url)
+    elapsed = time.perf_counter() - started_at
+    return len(pages) * rounds / elapsed
+
+
+def same_fields(expected, actual):
+    """기준 결과에 있는 필드만 비교 (이후 추가된 normalizedIngredients 등은 제외)"""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return all(actual.get(key) == value for key, value in expected.items())
+    return expected == actual
+
+
+def check_same_output(pages, reference, candidate):
+    """두 추출기의 결과가 같은지 확인, 다른 페이지 URL 목록 반환"""
+    return [url for url, content in pages if not same_fields(reference(content, url), candidate(content, url))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="레시피 추출기 벤치마크")
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES_DIR,
+                        help='recipes/, search/ 하위 폴더에 HTML이 있는 디렉터리')
+    parser.add_argument('--rounds', type=int, default=20, help='반복 횟수 (기본 20)')
+    args = parser.parse_args()
+
+    recipe_pages = load_pages(os.path.join(args.fixtures, 'recipes'))
+    search_pages = load_pages(os.path.join(args.fixtures, 'search'))
+    print(f"📂 픽스처: 레시피 {len(recipe_pages)}개, 검색 {len(search_pages)}개 ({args.fixtures})")
+
+    suites = [
+        ('레시피 상세', recipe_pages, baseline.parse_recipe_page, [
+            ('현재 BeautifulSoup', parse_recipe_page),
+            ('lxml', parse_recipe_page_fast),
+        ]),
+        ('검색 결과', search_pages, lambda c, u: baseline.parse_search_results(c), [
+            ('현재 BeautifulSoup', lambda c, u: parse_search_results(c)),
+            ('lxml', lambda c, u: parse_search_results_fast(c)),
+        ]),
+    ]
+    for label, pages, before, candidates in suites:
+        if not pages:
+            continue
+        before_rate = measure(before, pages, args.rounds)
+        print(f"📊 {label}: 변경 전 {before_rate:.1f} pages/s")
+        for name, after in candidates:
+            mismatches = check_same_output(pages, before, after)
+            if mismatches:
+                print(f"⚠️ {label} {name}: 변경 전과 결과가 다른 페이지 {len(mismatches)}개 - {mismatches[:5]}")
+            after_rate = measure(after, pages, args.rounds)
+            print(f"   → {name} {after_rate:.1f} pages/s ({after_rate / before_rate:.1f}배)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+레시피 스냅샷 로딩 벤치마크
+합성 레시피 N개를 JSONL(체크포인트 형식)과 열 단위 스냅샷으로 저장한 뒤,
+각각 별도 프로세스에서 불러와 로딩 시간, 최대 RSS 증가량, 무작위 접근/전체 재평가 시간을 비교
+
+사용법:
+    cd recipe_crawler
+    python benchmarks/bench_snapshot.py --recipes 100000
+    python benchmarks/bench_snapshot.py --recipes 20000 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+CRAWLER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CRAWLER_DIR)
+
+from batch_scoring import merge_weights, score_features, score_recipes, weight_keywords  # noqa: E402
+from ingredient_normalizer import normalize_ingredients  # noqa: E402
+from recipe_snapshot import export_snapshot, load_snapshot  # noqa: E402
+
+INGREDIENT_NAMES = ['돼지고기', '소고기', '대파', '양파', '마늘', '간장', '설탕', '고춧가루', '두부', '김치',
+                    '계란', '우유', '버터', '감자', '당근', '애호박', '참기름', '소금', '후추', '물']
+UNITS = ['g', '개', '큰술', '작은술', '컵', 'ml', '약간']
+RANDOM_ACCESS_COUNT = 1000
+
+
+def make_recipe(index, rng):
+    """크롤러 출력과 같은 모양의 합성 레시피"""
+    ingredients = [f"{rng.choice(INGREDIENT_NAMES)} {rng.randint(1, 300)}{rng.choice(UNITS)}"
+                   for _ in range(rng.randint(3, 14))]
+    normalized, tokens = normalize_ingredients(ingredients)
+    steps = [f"{step + 1}번째 단계: " + '재료를 넣고 중불에서 잘 볶아 줍니다. ' * rng.randint(1, 6)
+             for step in range(rng.randint(2, 10))]
+    return {
+        'id': f'recipe_{index}',
+        'name': f"{rng.choice(['간단', '초간단', '백종원', '자취', ''])} 레시피 {index}",
+        'ingredients': ingredients,
+        'normalizedIngredients': normalized,
+        'ingredientTokens': tokens,
+        'steps': steps,
+        'tags': rng.sample(['한식', '간단', '자취', '반찬', '국물'], rng.randint(0, 3)),
+        'imageUrl': f'https://recipe1.ezmember.co.kr/cache/recipe/{index}.jpg',
+        'sourceUrl': f'https://www.10000recipe.com/recipe/{index}',
+        'category': rng.choice(['한식', '양식', '일식', '중식']),
+        'servings': rng.randint(1, 4),
+        'cookingTime': rng.randint(15, 120),
+        'difficulty': rng.choice(['쉬움', '보통', '어려움']),
+        'score': float(rng.randint(20, 160)),
+    }
+
+
+def max_rss_mb():
+    # Linux는 KB, macOS는 바이트 단위
+    unit = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2**20
+
+
+def measure(kind, path):
+    """한 가지 형식을 불러와 측정 (별도 프로세스에서 실행)"""
+    weights = merge_weights()
+    baseline_rss = max_rss_mb()
+    started_at = time.perf_counter()
+    if kind == 'json':
+        with open(path, 'r', encoding='utf-8') as f:
+            recipes = [json.loads(line)['recipe'] for line in f]
+    else:
+        recipes = load_snapshot(path)
+    load_seconds = time.perf_counter() - started_at
+    load_rss = max_rss_mb() - baseline_rss
+
+    rng = random.Random(0)
+    started_at = time.perf_counter()
+    for _ in range(RANDOM_ACCESS_COUNT):
+        recipe = recipes[rng.randrange(len(recipes))]
+        recipe['name'], recipe['ingredients']
+    access_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    if kind == 'json':
+        score_recipes(recipes, weights)
+    else:
+        score_features(recipes.features(weight_keywords(weights)), weights)
+    score_seconds = time.perf_counter() - started_at
+
+    return {
+        'format': kind,
+        'recipes': len(recipes),
+        'file_mb': os.path.getsize(path) / 2**20,
+        'load_ms': load_seconds * 1000,
+        'load_rss_mb': load_rss,
+        'random_access_us': access_seconds / RANDOM_ACCESS_COUNT * 1e6,
+        'rescore_ms': score_seconds * 1000,
+        'max_rss_mb': max_rss_mb(),
+    }
+
+
+def run_isolated(kind, path):
+    command = [sys.executable, os.path.abspath(__file__), '--measure', kind, '--path', path]
+    completed = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="레시피 스냅샷 로딩 벤치마크")
+    parser.add_argument('--recipes', type=int, default=100000, help='합성 레시피 수 (기본 100000)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON 한 줄로 출력')
+    parser.add_argument('--measure', choices=['json', 'snapshot'], default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--path', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.path)))
+        return
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        jsonl_path = os.path.join(directory, 'recipes.jsonl')
+        snapshot_path = os.path.join(directory, 'recipes.snap')
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            for index in range(args.recipes):
+                record = {'keyword': '벤치마크', 'recipe': make_recipe(index, rng)}
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        started_at = time.perf_counter()
+        with open(jsonl_path, 'r', encoding='utf-8') as f:
+            export_snapshot((json.loads(line)['recipe'] for line in f), snapshot_path)
+        export_ms = (time.perf_counter() - started_at) * 1000
+
+        results = [run_isolated('json', jsonl_path), run_isolated('snapshot', snapshot_path)]
+
+    if args.json:
+        print(json.dumps({'export_ms': export_ms, 'results': results}))
+        return
+    print(f"📦 레시피 {args.recipes}개, 스냅샷 내보내기 {export_ms:.0f}ms")
+    for result in results:
+        print(f"   {result['format']:>8}: 파일 {result['file_mb']:.1f}MB, 로딩 {result['load_ms']:.1f}ms "
+              f"(RSS +{result['load_rss_mb']:.1f}MB), 무작위 접근 {result['random_access_us']:.1f}µs/개, "
+              f"전체 재평가 {result['rescore_ms']:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
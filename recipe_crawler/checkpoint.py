@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+크롤링 체크포인트 (JSONL)
+점수가 매겨진 레시피를 만들어지는 즉시 recipes.jsonl에 한 줄씩 추가하고,
+키워드 처리가 끝날 때마다 journal.jsonl에 완료 기록을 남김
+
+- --resume: journal에 완료로 기록된 키워드는 건너뜀
+- 업로드는 파일을 한 줄씩 읽어 키워드별 최고 점수 레시피만 흘려보냄 (전체를 메모리에 올리지 않음)
+- 프로세스가 중간에 죽어 마지막 줄이 잘린 경우 해당 줄은 무시
+"""
+
+import json
+import os
+import threading
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'checkpoints')
+RECIPES_FILE = 'recipes.jsonl'
+JOURNAL_FILE = 'journal.jsonl'
+
+
+def _iter_jsonl(path):
+    """JSONL 파일을 한 줄씩 읽기 (파일이 없거나 깨진 줄은 건너뜀)"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+class CrawlCheckpoint:
+    """recipes.jsonl + journal.jsonl 로 구성된 크롤링 체크포인트"""
+
+    def __init__(self, directory=DEFAULT_CHECKPOINT_DIR, resume=False):
+        self.directory = directory
+        self.recipes_path = os.path.join(directory, RECIPES_FILE)
+        self.journal_path = os.path.join(directory, JOURNAL_FILE)
+        os.makedirs(directory, exist_ok=True)
+        mode = 'a' if resume else 'w'
+        self._recipes_file = open(self.recipes_path, mode, encoding='utf-8')
+        self._journal_file = open(self.journal_path, mode, encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def _append(self, f, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record_recipe(self, keyword, recipe):
+        """점수가 매겨진 레시피 1개 기록"""
+        self._append(self._recipes_file, {'keyword': keyword, 'recipe': recipe})
+
+    def mark_keyword_done(self, keyword, best_recipe):
+        """키워드 처리 완료 기록 (유효한 레시피가 없으면 best_recipe=None)"""
+        self._append(self._journal_file, {
+            'keyword': keyword,
+            'bestId': best_recipe['id'] if best_recipe else None,
+        })
+
+    def completed_keywords(self):
+        return completed_keywords(self.directory)
+
+    def close(self):
+        with self._lock:
+            self._recipes_file.close()
+            self._journal_file.close()
+
+
+def completed_keywords(directory=DEFAULT_CHECKPOINT_DIR):
+    """journal에 완료로 기록된 키워드 → 최고 점수 레시피 ID (없으면 None)"""
+    done = {}
+    for record in _iter_jsonl(os.path.join(directory, JOURNAL_FILE)):
+        done[record['keyword']] = record.get('bestId')
+    return done
+
+
+def iter_selected_recipes(directory=DEFAULT_CHECKPOINT_DIR):
+    """완료된 키워드별 최고 점수 레시피를 파일 순서대로 하나씩 반환"""
+    best_ids = completed_keywords(directory)
+    emitted = set()
+    for record in _iter_jsonl(os.path.join(directory, RECIPES_FILE)):
+        keyword = record.get('keyword')
+        recipe = record.get('recipe') or {}
+        if keyword in emitted or best_ids.get(keyword) is None:
+            continue
+        if recipe.get('id') == best_ids[keyword]:
+            emitted.add(keyword)
+            yield recipe
+
+
+def iter_recorded_recipes(directory=DEFAULT_CHECKPOINT_DIR):
+    """기록된 (키워드, 레시피)를 파일 순서대로 하나씩 반환 (선택되지 않은 후보 포함)"""
+    for record in _iter_jsonl(os.path.join(directory, RECIPES_FILE)):
+        if record.get('keyword') and record.get('recipe'):
+            yield record['keyword'], record['recipe']
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+lxml 기반 단일 패스 레시피 추출기
+improved_recipe_crawler.parse_recipe_page(BeautifulSoup)와 같은 결과를 내면서
+
+- 문서 전체는 한 번만 순회하며 제목/이미지/재료/단계/태그 후보를 동시에 수집
+- 단계 블록마다 한 번만 순회하며 메인 텍스트/step_add/보조 span/전체 줄을 함께 수집
+  (media-body 복사 후 decompose, find_all 반복 호출 없음)
+- 정규식과 키워드 매처는 모듈 로드 시 한 번만 컴파일
+
+잘못 중첩된 마크업(예: <li> 안의 <li>)은 lxml이 html.parser와 다르게 트리를 보정하므로
+그런 페이지에서는 결과가 다를 수 있습니다 (benchmarks/bench_extract.py로 확인).
+"""
+
+import re
+from urllib.parse import urljoin
+
+from lxml import html
+
+from improved_recipe_crawler import (
+    BASE_URL,
+    RECIPE_NUMBER_PATTERN,
+    STEP_SUB_CLASS_PATTERN,
+    build_recipe_data,
+    clean_ingredient_text,
+    compose_step_text,
+    normalize_image_url,
+)
+
+STEP_DIV_ID_PATTERN = re.compile(r'^stepDiv\d+$')
+TAG_HREF_PATTERN = re.compile(r'/recipe/list\.html\?q=')
+CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.I)
+
+# BeautifulSoup get_text()가 건너뛰는 요소 (주석/스크립트/스타일/템플릿)
+SKIP_TEXT_TAGS = frozenset(['script', 'style', 'template'])
+
+_PARSERS = {}
+
+
+def _get_parser(encoding):
+    parser = _PARSERS.get(encoding)
+    if parser is None:
+        parser = html.HTMLParser(encoding=encoding)
+        _PARSERS[encoding] = parser
+    return parser
+
+
+def parse_html(content):
+    """bytes/str HTML을 lxml 트리로 파싱 (meta charset 우선, 기본 utf-8)"""
+    if isinstance(content, str):
+        return html.document_fromstring(content)
+    match = CHARSET_PATTERN.search(content[:4096])
+    encoding = match.group(1).decode('ascii').lower() if match else 'utf-8'
+    try:
+        parser = _get_parser(encoding)
+    except LookupError:
+        parser = _get_parser('utf-8')
+    return html.document_fromstring(content, parser=parser)
+
+
+def _is_text_element(el):
+    """텍스트를 수집할 일반 요소인지 (주석/PI/스크립트류 제외)"""
+    return isinstance(el.tag, str) and el.tag not in SKIP_TEXT_TAGS
+
+
+def _class_tokens(el):
+    value = el.get('class')
+    return value.split() if value else ()
+
+
+def iter_strings(el):
+    """el 하위 텍스트 노드를 문서 순서대로 (el 자신의 tail 제외)"""
+    if el.text and _is_text_element(el):
+        yield el.text
+    for child in el:
+        if _is_text_element(child):
+            yield from iter_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def text_of(el, separator='', strip=True):
+    """BeautifulSoup get_text(separator, strip=True)와 같은 결과"""
+    if strip:
+        return separator.join(s.strip() for s in iter_strings(el) if s.strip())
+    return separator.join(iter_strings(el))
+
+
+def _split_lines(strings):
+    """get_text('\n', strip=True) 결과를 줄 단위로 나눈 것과 같은 줄 목록"""
+    lines = []
+    for s in strings:
+        s = s.strip()
+        if not s:
+            continue
+        for ln in s.split('\n'):
+            ln = ln.strip()
+            if ln:
+                lines.append(ln)
+    return lines
+
+
+def _join_stripped(strings, separator=' '):
+    return separator.join(s.strip() for s in strings if s.strip())
+
+
+class _StepCollector:
+    """단계 블록 한 번 순회로 필요한 텍스트를 모두 모으는 수집기"""
+
+    def __init__(self):
+        self.all_strings = []
+        self.main_strings = []
+        self.has_main = False
+        self.tip_groups = []
+        self.span_groups = []
+
+    def add(self, text, in_main, tip_buf, span_bufs):
+        self.all_strings.append(text)
+        if in_main:
+            self.main_strings.append(text)
+        if tip_buf is not None:
+            tip_buf.append(text)
+        for buf in span_bufs:
+            buf.append(text)
+
+    def walk(self, el, in_main, tip_buf, span_bufs):
+        if el.text:
+            self.add(el.text, in_main, tip_buf, span_bufs)
+        for child in el:
+            if _is_text_element(child):
+                child_in_main, child_tip, child_spans = in_main, tip_buf, span_bufs
+                tag = child.tag
+                classes = _class_tokens(child)
+                # 첫 번째 div.media-body만 메인 텍스트 영역
+                if not self.has_main and tag == 'div' and 'media-body' in classes:
+                    self.has_main = True
+                    child_in_main = True
+                if tag == 'p' and 'step_add' in classes:
+                    child_tip = []
+                    self.tip_groups.append(child_tip)
+                    child_in_main = False
+                if tag == 'span' and STEP_SUB_CLASS_PATTERN.search(child.get('class') or ''):
+                    span_buf = []
+                    self.span_groups.append(span_buf)
+                    child_spans = span_bufs + [span_buf]
+                self.walk(child, child_in_main, child_tip, child_spans)
+            if child.tail:
+                self.add(child.tail, in_main, tip_buf, span_bufs)
+
+
+def extract_step_text(item):
+    """단계 블록 하나를 한 번 순회해 단계 문장 생성"""
+    collector = _StepCollector()
+    collector.walk(item, False, None, [])
+
+    main_text = ' '.join(_split_lines(collector.main_strings)) if collector.has_main else ''
+    tip_texts = [t for t in (_join_stripped(group) for group in collector.tip_groups) if t]
+    extra_subs = [t for t in (_join_stripped(group) for group in collector.span_groups) if t]
+    lines = _split_lines(collector.all_strings)
+    return compose_step_text(main_text, tip_texts, lines, extra_subs)
+
+
+def _is_step_section(el):
+    # div.view_step, section.view_step, div.rd_step, section.rd_step 은 모두 [class*="step"]에 포함
+    return 'step' in (el.get('class') or '')
+
+
+def _is_step_item(el):
+    tag = el.tag
+    if tag == 'li':
+        return True
+    classes = _class_tokens(el)
+    if 'step_cont' in classes or 'step_txt' in classes:
+        return True
+    if tag == 'div' and ('view_step_cont' in classes or 'rd_step_cont' in classes):
+        return True
+    return False
+
+
+def _fallback_step_items(root):
+    """stepDivN 블록이 없는 페이지(모바일/변형)의 단계 후보"""
+    step_items = []
+    for section in root.iter():
+        if section is root or not isinstance(section.tag, str) or not _is_step_section(section):
+            continue
+        for el in section.iterdescendants():
+            if isinstance(el.tag, str) and _is_step_item(el):
+                step_items.append(el)
+    return step_items
+
+
+def parse_recipe_page_fast(content, url):
+    """레시피 상세 페이지 HTML에서 레시피 데이터 추출 (parse_recipe_page와 동일 결과)"""
+    root = parse_html(content)
+
+    # 문서 1회 순회로 후보 요소 수집
+    title_h3 = title_h1 = first_h3 = first_h1 = None
+    img_summary = img_summary_like = img_recipe = img_food = None
+    ingredient_sections = []
+    step_items = []
+    tag_elements = []
+    for el in root.iter():
+        tag = el.tag
+        if not isinstance(tag, str):
+            continue
+        if tag == 'h3' or tag == 'h1':
+            is_title = 'view2_summary_info3' in _class_tokens(el)
+            if tag == 'h3':
+                if first_h3 is None:
+                    first_h3 = el
+                if is_title and title_h3 is None:
+                    title_h3 = el
+            else:
+                if first_h1 is None:
+                    first_h1 = el
+                if is_title and title_h1 is None:
+                    title_h1 = el
+        elif tag == 'img':
+            class_attr = el.get('class')
+            src = el.get('src')
+            if class_attr is not None:
+                if img_summary is None and 'view2_summary_img' in class_attr.split():
+                    img_summary = el
+                if img_summary_like is None and 'summary_img' in class_attr:
+                    img_summary_like = el
+            if src is not None:
+                if img_recipe is None and 'recipe' in src:
+                    img_recipe = el
+                if img_food is None and 'food' in src:
+                    img_food = el
+        elif tag == 'div':
+            if 'ready_ingre3' in _class_tokens(el):
+                ingredient_sections.append(el)
+            div_id = el.get('id')
+            if div_id and STEP_DIV_ID_PATTERN.search(div_id):
+                step_items.append(el)
+        elif tag == 'a':
+            href = el.get('href')
+            if href and TAG_HREF_PATTERN.search(href):
+                tag_elements.append(el)
+
+    # 레시피 제목
+    title_elem = title_h3 if title_h3 is not None else title_h1
+    if title_elem is None:
+        title_elem = first_h3 if first_h3 is not None else first_h1
+    title = text_of(title_elem) if title_elem is not None else "제목 없음"
+    # 밀키트 레시피 제외
+    if '밀키트' in title:
+        return None
+
+    # 레시피 이미지 (만개의 레시피 이미지만)
+    img_elem = next(
+        (el for el in (img_summary, img_summary_like, img_recipe, img_food) if el is not None), None
+    )
+    image_url = normalize_image_url(img_elem.get('src') if img_elem is not None else None)
+
+    # 재료 정보
+    ingredients = []
+    for section in ingredient_sections:
+        for item in section.iterdescendants('li'):
+            ingredient_text = text_of(item)
+            if ingredient_text and ingredient_text != '재료':
+                cleaned_ingredient = clean_ingredient_text(ingredient_text)
+                # 밀키트 언급 포함 시 제외
+                if cleaned_ingredient and '밀키트' not in cleaned_ingredient:
+                    ingredients.append(cleaned_ingredient)
+
+    # 조리법
+    if not step_items:
+        step_items = _fallback_step_items(root)
+    steps = []
+    for item in step_items:
+        step_text = extract_step_text(item)
+        if step_text and '밀키트' not in step_text:
+            steps.append(step_text)
+
+    # 태그
+    tags = []
+    for tag_elem in tag_elements:
+        tag_text = text_of(tag_elem)
+        if tag_text and len(tag_text) > 1:
+            tags.append(tag_text)
+
+    page_text = ''.join(iter_strings(root))
+    return build_recipe_data(url, title, image_url, ingredients, steps, tags, page_text)
+
+
+def parse_search_results_fast(content):
+    """검색 결과 페이지에서 레시피 URL 목록 추출 (parse_search_results와 동일 결과)"""
+    root = parse_html(content)
+    recipe_urls = []
+    seen = set()
+    link_count = 0
+    for link in root.iter('a'):
+        href = link.get('href')
+        if not href or not RECIPE_NUMBER_PATTERN.search(href):
+            continue
+        link_count += 1
+        full_url = urljoin(BASE_URL, href)
+        if full_url not in seen:
+            seen.add(full_url)
+            recipe_urls.append(full_url)
+    return recipe_urls, link_count
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+recipes 컬렉션 증분 동기화
+전체 삭제 후 재업로드 대신, 내용 해시를 비교해 추가/변경된 레시피만 쓰고
+이번 크롤링에서 사라진 레시피만 삭제 (WriteBatch 최대 500개 단위 커밋)
+"""
+
+import hashlib
+import json
+
+from firebase_admin import firestore
+
+FIRESTORE_BATCH_LIMIT = 500
+
+# 동기화가 끝날 때마다 갱신하는 표식 문서 recipe_sync/{컬렉션 이름}
+# (백엔드 레시피 검색 색인이 syncedAt이 바뀌면 바뀐 레시피만 다시 읽음)
+SYNC_MARKER_COLLECTION = 'recipe_sync'
+
+# 해시/저장 대상에서 제외할 필드 (크롤링 내부용 또는 업로드 시점에 채워지는 값)
+NON_CONTENT_FIELDS = ('score', 'createdAt', 'updatedAt', 'contentHash')
+
+
+def recipe_content_hash(recipe):
+    """레시피 내용 해시 (필드 순서와 무관, 점수/타임스탬프 제외)"""
+    content = {k: v for k, v in recipe.items() if k not in NON_CONTENT_FIELDS}
+    payload = json.dumps(content, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_remote_hashes(recipes_ref):
+    """기존 문서 ID → contentHash (contentHash 필드만 읽음)"""
+    remote = {}
+    for doc in recipes_ref.select(['contentHash']).stream():
+        data = doc.to_dict() or {}
+        remote[doc.id] = data.get('contentHash')
+    return remote
+
+
+def plan_sync(recipes, remote_hashes):
+    """추가/변경/삭제 대상 계산 (반환: added, changed, deleted_ids, unchanged_count)"""
+    added, changed = [], []
+    local_ids = set()
+    for recipe in recipes:
+        recipe_id = recipe['id']
+        # 같은 레시피가 여러 키워드의 최고 점수로 뽑힌 경우 한 번만 반영
+        if recipe_id in local_ids:
+            continue
+        local_ids.add(recipe_id)
+        content_hash = recipe_content_hash(recipe)
+        if recipe_id not in remote_hashes:
+            added.append((recipe, content_hash))
+        elif remote_hashes[recipe_id] != content_hash:
+            changed.append((recipe, content_hash))
+    deleted_ids = [doc_id for doc_id in remote_hashes if doc_id not in local_ids]
+    unchanged_count = len(local_ids) - len(added) - len(changed)
+    return added, changed, deleted_ids, unchanged_count
+
+
+def _commit_in_batches(db, operations):
+    """(op, ref, data) 목록을 최대 500개씩 WriteBatch로 커밋, 커밋 횟수 반환"""
+    commits = 0
+    for start in range(0, len(operations), FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for op, ref, data in operations[start:start + FIRESTORE_BATCH_LIMIT]:
+            if op == 'delete':
+                batch.delete(ref)
+            elif op == 'merge':
+                batch.set(ref, data, merge=True)
+            else:
+                batch.set(ref, data)
+        batch.commit()
+        commits += 1
+    return commits
+
+
+def sync_recipes(db, recipes, collection='recipes', dry_run=False):
+    """선택된 레시피(리스트 또는 체크포인트 스트림)와 Firestore 컬렉션을 증분 동기화"""
+    recipes_ref = db.collection(collection)
+    remote_hashes = load_remote_hashes(recipes_ref)
+    added, changed, deleted_ids, unchanged_count = plan_sync(recipes, remote_hashes)
+
+    print(f"🔄 동기화 계획: 추가 {len(added)}개, 변경 {len(changed)}개, "
+          f"삭제 {len(deleted_ids)}개, 유지 {unchanged_count}개")
+
+    operations = []
+    for recipe, content_hash in added:
+        data = {k: v for k, v in recipe.items() if k not in NON_CONTENT_FIELDS}
+        data['contentHash'] = content_hash
+        data['createdAt'] = firestore.SERVER_TIMESTAMP
+        data['updatedAt'] = firestore.SERVER_TIMESTAMP
+        operations.append(('set', recipes_ref.document(recipe['id']), data))
+    for recipe, content_hash in changed:
+        # 기존 createdAt은 유지되도록 createdAt 없이 merge
+        data = {k: v for k, v in recipe.items() if k not in NON_CONTENT_FIELDS}
+        data['contentHash'] = content_hash
+        data['updatedAt'] = firestore.SERVER_TIMESTAMP
+        operations.append(('merge', recipes_ref.document(recipe['id']), data))
+    for doc_id in deleted_ids:
+        operations.append(('delete', recipes_ref.document(doc_id), None))
+    if operations:
+        # 마지막 배치에 들어가므로 앞선 커밋이 모두 성공해야 표식이 바뀜
+        operations.append(('set', db.collection(SYNC_MARKER_COLLECTION).document(collection), {
+            'syncedAt': firestore.SERVER_TIMESTAMP,
+            'added': len(added),
+            'changed': len(changed),
+            'deleted': len(deleted_ids),
+        }))
+
+    summary = {
+        'added': [recipe['id'] for recipe, _ in added],
+        'changed': [recipe['id'] for recipe, _ in changed],
+        'deleted': deleted_ids,
+        'unchanged': unchanged_count,
+        'commits': 0,
+    }
+    if dry_run or not operations:
+        return summary
+
+    summary['commits'] = _commit_in_batches(db, operations)
+    print(f"✅ 동기화 완료: {len(operations)}개 쓰기, {summary['commits']}회 커밋")
+    return summary
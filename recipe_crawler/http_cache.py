@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+레시피 페이지용 디스크 HTTP 캐시
+정규화된 URL을 키로 응답 본문을 압축 저장하고, ETag/Last-Modified로 조건부 재검증
+
+- 본문은 내용 해시(sha256) 기준으로 저장 (동일 본문은 한 번만 저장)
+- TTL 이내 응답은 네트워크 없이 재사용, 만료 시 조건부 요청(304면 본문 재사용)
+- 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+- offline=True면 네트워크 없이 캐시만 사용 (점수/정리 로직 변경 후 재파싱용)
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.http_cache')
+DEFAULT_TTL = 7 * 24 * 60 * 60  # 7일
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512MB
+
+
+def normalize_url(url):
+    """캐시 키용 URL 정규화 (모바일 도메인 통일, 쿼리 정렬, fragment 제거)"""
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or 'https').lower()
+    netloc = parts.netloc.lower()
+    if netloc == 'm.10000recipe.com':
+        netloc = 'www.10000recipe.com'
+    path = parts.path or '/'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+
+class CacheMiss(Exception):
+    """오프라인 모드에서 캐시에 없는 URL 요청"""
+
+
+class CachedResponse:
+    """캐시에서 꺼낸 응답 (requests.Response에서 크롤러가 쓰는 부분만 제공)"""
+
+    def __init__(self, url, content, headers=None, status_code=200, from_cache=True):
+        self.url = url
+        self.content = content
+        self.headers = headers or {}
+        self.status_code = status_code
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def raise_for_status(self):
+        pass
+
+
+class HttpCache:
+    """sqlite 색인 + gzip 본문 파일로 구성된 디스크 캐시"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(cache_dir, 'objects'), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'index.sqlite3'), check_same_thread=False)
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS entries (
+                url_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS bodies (
+                body_hash TEXT PRIMARY KEY,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+        ''')
+        self._db.commit()
+
+    def _body_path(self, body_hash):
+        return os.path.join(self.cache_dir, 'objects', body_hash[:2], body_hash + '.gz')
+
+    def get(self, url):
+        """캐시 항목 조회 (없으면 None). 반환: dict(content, etag, last_modified, fetched_at)"""
+        url_key = normalize_url(url)
+        with self._lock:
+            row = self._db.execute(
+                'SELECT body_hash, etag, last_modified, fetched_at FROM entries WHERE url_key = ?',
+                (url_key,),
+            ).fetchone()
+            if not row:
+                return None
+            body_hash, etag, last_modified, fetched_at = row
+            try:
+                with gzip.open(self._body_path(body_hash), 'rb') as f:
+                    content = f.read()
+            except OSError:
+                # 본문 파일이 사라진 항목은 색인에서도 제거
+                self._db.execute('DELETE FROM entries WHERE url_key = ?', (url_key,))
+                self._db.commit()
+                return None
+            self._db.execute('UPDATE entries SET accessed_at = ? WHERE url_key = ?', (time.time(), url_key))
+            self._db.commit()
+        return {
+            'content': content,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': fetched_at,
+        }
+
+    def is_fresh(self, entry):
+        return entry is not None and time.time() - entry['fetched_at'] < self.ttl
+
+    def is_url_fresh(self, url):
+        """본문을 읽지 않고 TTL 이내 항목이 있는지만 확인"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT fetched_at FROM entries WHERE url_key = ?', (normalize_url(url),)
+            ).fetchone()
+        return row is not None and time.time() - row[0] < self.ttl
+
+    def put(self, url, content, etag=None, last_modified=None):
+        """응답 본문 저장 (동일 내용의 본문 파일은 공유)"""
+        url_key = normalize_url(url)
+        body_hash = hashlib.sha256(content).hexdigest()
+        path = self._body_path(body_hash)
+        now = time.time()
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with gzip.open(tmp_path, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+            self._db.execute(
+                'INSERT OR REPLACE INTO bodies (body_hash, size) VALUES (?, ?)',
+                (body_hash, os.path.getsize(path)),
+            )
+            self._db.execute(
+                'INSERT OR REPLACE INTO entries '
+                '(url_key, url, body_hash, etag, last_modified, fetched_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url_key, url, body_hash, etag, last_modified, now, now),
+            )
+            self._db.commit()
+            self._evict()
+
+    def touch(self, url):
+        """304 재검증 성공 시 fetched_at 갱신"""
+        with self._lock:
+            now = time.time()
+            self._db.execute(
+                'UPDATE entries SET fetched_at = ?, accessed_at = ? WHERE url_key = ?',
+                (now, now, normalize_url(url)),
+            )
+            self._db.commit()
+
+    def total_bytes(self):
+        row = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM bodies').fetchone()
+        return row[0]
+
+    def _evict(self):
+        """max_bytes를 넘으면 오래 사용하지 않은 항목부터 제거 (lock 보유 상태에서 호출)"""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute('SELECT url_key, body_hash FROM entries ORDER BY accessed_at').fetchall()
+        for url_key, body_hash in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute('DELETE FROM entries WHERE url_key = ?', (url_key,))
+            still_used = self._db.execute(
+                'SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1', (body_hash,)
+            ).fetchone()
+            if still_used:
+                continue
+            size_row = self._db.execute('SELECT size FROM bodies WHERE body_hash = ?', (body_hash,)).fetchone()
+            self._db.execute('DELETE FROM bodies WHERE body_hash = ?', (body_hash,))
+            try:
+                os.remove(self._body_path(body_hash))
+            except OSError:
+                pass
+            total -= size_row[0] if size_row else 0
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class CachedSession:
+    """requests.Session을 감싸 캐시를 거쳐 GET 요청을 보내는 세션
+
+    search_recipes / extract_recipe_data 는 session.get(url, timeout=...)만 사용하므로
+    세션 자리에 그대로 넘길 수 있습니다.
+    """
+
+    def __init__(self, session, cache, offline=False):
+        self.session = session
+        self.cache = cache
+        self.offline = offline
+        self.last_from_cache = False
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'bytes_downloaded': 0}
+        self._stats_lock = threading.Lock()
+
+    def will_hit(self, url):
+        """네트워크 요청 없이 캐시로 응답할 수 있는지 (속도 제한 생략 판단용)"""
+        return self.offline or self.cache.is_url_fresh(url)
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def get(self, url, **kwargs):
+        entry = self.cache.get(url)
+
+        if self.offline or self.cache.is_fresh(entry):
+            if entry is None:
+                raise CacheMiss(f"캐시에 없는 URL입니다 (오프라인 모드): {url}")
+            self._count('hits')
+            self.last_from_cache = True
+            return CachedResponse(url, entry['content'])
+
+        # 만료된 항목은 조건부 요청으로 재검증
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.session.get(url, headers=headers, **kwargs)
+        self.last_from_cache = False
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url)
+            self._count('revalidated')
+            # 본문은 캐시에서 가져오지만 서버 요청은 했으므로 호출하는 쪽의 요청 간격 대기 대상
+            return CachedResponse(url, entry['content'], headers=response.headers, from_cache=False)
+
+        self._count('misses')
+        self._count('bytes_downloaded', len(response.content))
+        if response.status_code == 200:
+            self.cache.put(
+                url,
+                response.content,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+            )
+        return response
+
+    def print_stats(self):
+        s = self.stats
+        print(f"💾 HTTP 캐시: 적중 {s['hits']}회, 재검증(304) {s['revalidated']}회, "
+              f"다운로드 {s['misses']}회 ({s['bytes_downloaded'] / 1024:.1f}KB)")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+크롤러용 HTTP 전송 계층
+requests.Session에 연결 풀 크기를 지정한 HTTPAdapter를 붙여 스레드 간 keep-alive 연결을 재사용하고,
+일시적 실패(429/5xx, 연결 오류)는 지터를 더한 지수 백오프로 재시도
+
+- Retry-After 헤더가 있으면 그 시간만큼 기다린 뒤 재시도
+- 연결 타임아웃과 읽기 타임아웃을 따로 지정 (요청에서 timeout을 넘기지 않으면 기본값 사용)
+- 호스트별 요청 수/연결 재사용률/재시도 횟수/수신 바이트를 모아 실행 끝에 출력
+"""
+
+import random
+import threading
+from collections import defaultdict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5  # 0.5초, 1초, 2초 ... (+ 지터)
+DEFAULT_BACKOFF_JITTER = 0.5  # 백오프 시간의 최대 50%를 무작위로 추가
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 10
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class TransportMetrics:
+    """호스트별 전송 통계 (여러 스레드에서 동시에 갱신)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hosts = defaultdict(lambda: {'requests': 0, 'retries': 0, 'bytes': 0, 'errors': 0})
+
+    def record_response(self, host, size):
+        with self._lock:
+            stats = self.hosts[host]
+            stats['requests'] += 1
+            stats['bytes'] += size
+
+    def record_retry(self, host, failed):
+        with self._lock:
+            stats = self.hosts[host]
+            stats['retries'] += 1
+            if failed:
+                stats['errors'] += 1
+
+    def connection_stats(self, adapters):
+        """어댑터 연결 풀에서 호스트별 (새 연결 수, 요청 수) 집계"""
+        connections = defaultdict(lambda: [0, 0])
+        for adapter in adapters:
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                counts = connections[pool.host]
+                counts[0] += pool.num_connections
+                counts[1] += pool.num_requests
+        return connections
+
+    def summary(self, adapters=()):
+        """호스트별 통계 dict (reuse_ratio = 기존 연결로 보낸 요청 비율)"""
+        connections = self.connection_stats(adapters)
+        with self._lock:
+            result = {}
+            for host, stats in self.hosts.items():
+                new_connections, pool_requests = connections.get(host, (0, 0))
+                reuse_ratio = 1 - new_connections / pool_requests if pool_requests else 0.0
+                result[host] = dict(stats, connections=new_connections, reuse_ratio=reuse_ratio)
+            return result
+
+    def print_summary(self, adapters=()):
+        for host, stats in self.summary(adapters).items():
+            print(f"🌐 {host}: 요청 {stats['requests']}회, 새 연결 {stats['connections']}개 "
+                  f"(재사용률 {stats['reuse_ratio'] * 100:.0f}%), 재시도 {stats['retries']}회, "
+                  f"수신 {stats['bytes'] / 1024:.1f}KB")
+
+
+class JitteredRetry(Retry):
+    """지수 백오프에 지터를 더하고 재시도 횟수를 TransportMetrics에 기록하는 Retry
+
+    urllib3 1.26/2.x 모두에서 동작하도록 지터는 get_backoff_time에서 직접 더함
+    (Retry-After가 있는 응답은 urllib3가 그 값을 우선 사용)
+    """
+
+    def __init__(self, *args, jitter=DEFAULT_BACKOFF_JITTER, metrics=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.jitter = jitter
+        self.metrics = metrics
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.jitter = self.jitter
+        retry.metrics = self.metrics
+        return retry
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if backoff <= 0 or not self.jitter:
+            return backoff
+        return backoff + random.uniform(0, backoff * self.jitter)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if self.metrics is not None and _pool is not None:
+            self.metrics.record_retry(_pool.host, failed=error is not None)
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+class TransportAdapter(HTTPAdapter):
+    """기본 (연결, 읽기) 타임아웃을 적용하는 HTTPAdapter"""
+
+    def __init__(self, *args, timeout=(DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT), **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=self.timeout if timeout is None else timeout, **kwargs)
+
+
+def create_session(pool_size=DEFAULT_POOL_SIZE, retries=DEFAULT_RETRIES, backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                   connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT):
+    """연결 풀/재시도/타임아웃이 설정된 requests.Session 생성
+
+    pool_size는 동시에 요청을 보내는 스레드 수 이상이어야 연결을 버리지 않고 재사용합니다.
+    """
+    metrics = TransportMetrics()
+    retry = JitteredRetry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # 재시도 후에도 실패하면 마지막 응답을 돌려주고 raise_for_status에서 처리
+        metrics=metrics,
+    )
+    adapter = TransportAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+        timeout=(connect_timeout, read_timeout),
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    def record_response(response, *args, **kwargs):
+        # 본문을 읽은 뒤 raw.tell()은 압축 해제 전 수신 바이트 수
+        size = len(response.content)
+        raw_size = response.raw.tell() if hasattr(response.raw, 'tell') else 0
+        metrics.record_response(urlparse(response.url).hostname, raw_size or size)
+
+    session.hooks['response'].append(record_response)
+    session.transport_metrics = metrics
+    return session
+
+
+def print_transport_stats(session):
+    """create_session으로 만든 세션의 호스트별 전송 통계 출력 (다른 세션이면 무시)"""
+    metrics = getattr(session, 'transport_metrics', None)
+    if metrics is None:
+        return
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}.values()
+    metrics.print_summary(adapters)
@@ -5,8 +5,8 @@
 만개의 레시피에서 100개 레시피를 크롤링하고 Firebase에 업로드
 """
 
-import requests
 from bs4 import BeautifulSoup
+import argparse
 import json
 import time
 import random
@@ -16,6 +16,16 @@ import sys
 from urllib.parse import urljoin, urlparse
 import firebase_admin
 from firebase_admin import credentials, firestore
+from http_cache import CachedSession, HttpCache, DEFAULT_CACHE_DIR, DEFAULT_TTL
+from http_transport import (
+    DEFAULT_CONNECT_TIMEOUT, DEFAULT_POOL_SIZE, DEFAULT_READ_TIMEOUT, DEFAULT_RETRIES,
+    create_session, print_transport_stats,
+)
+from firestore_sync import sync_recipes
+from keyword_matcher import KeywordMatcher
+from ingredient_normalizer import normalize_ingredients
+from checkpoint import CrawlCheckpoint, DEFAULT_CHECKPOINT_DIR, iter_selected_recipes
+from recipe_snapshot import export_snapshot
 
 # Firebase 초기화
 def initialize_firebase():
@@ -52,6 +62,11 @@ HEADERS = {
     'Upgrade-Insecure-Requests': '1',
 }
 
+# 요청 사이 대기 시간 범위 (초, 순차 모드). 로컬 리플레이 벤치마크에서는 (0, 0)으로 바꿔 사용
+REQUEST_DELAY_RANGE = (1, 2)
+
+RECIPE_NUMBER_PATTERN = re.compile(r'/recipe/(\d+)')
+
 # 요리별 검색 키워드 (각각 다른 요리로 취급)
 RECIPE_KEYWORDS = [
     # 한식 (우선 가중치 대상)
@@ -74,39 +89,65 @@ RECIPE_KEYWORDS = [
     "가지튀김", "마라탕", "마라샹궈", "고기딤섬"
 ]
 
-def get_session():
-    """세션 생성"""
-    session = requests.Session()
+def get_session(pool_size=DEFAULT_POOL_SIZE, retries=DEFAULT_RETRIES,
+                connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT):
+    """세션 생성 (연결 풀 + 429/5xx 재시도 백오프 + 연결/읽기 타임아웃 분리, http_transport)"""
+    session = create_session(
+        pool_size=pool_size,
+        retries=retries,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+    )
     session.headers.update(HEADERS)
     return session
 
-def search_recipes(session, keyword, max_pages=2):
+def parse_search_results(content):
+    """검색 결과 페이지에서 레시피 URL 목록 추출 (페이지 내 순서 유지)"""
+    soup = BeautifulSoup(content, 'html.parser')
+    recipe_urls = []
+    seen = set()
+    
+    # 레시피 링크 추출
+    recipe_links = soup.find_all('a', href=re.compile(r'/recipe/\d+'))
+    
+    for link in recipe_links:
+        href = link.get('href')
+        if href and '/recipe/' in href:
+            full_url = urljoin(BASE_URL, href)
+            if full_url not in seen:
+                seen.add(full_url)
+                recipe_urls.append(full_url)
+    
+    return recipe_urls, len(recipe_links)
+
+def build_search_url(keyword, page):
+    """검색 페이지 URL 생성"""
+    return f"{BASE_URL}/recipe/list.html?q={keyword}&order=reco&page={page}"
+
+def search_recipes(session, keyword, max_pages=2, parse_search=parse_search_results):
     """키워드로 레시피 검색"""
     recipe_urls = []
+    seen = set()
     
     for page in range(1, max_pages + 1):
         try:
-            search_url = f"{BASE_URL}/recipe/list.html?q={keyword}&order=reco&page={page}"
+            search_url = build_search_url(keyword, page)
             print(f"    🔍 검색 중: {keyword} (페이지 {page})")
             
-            response = session.get(search_url, timeout=10)
+            response = session.get(search_url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 레시피 링크 추출
-            recipe_links = soup.find_all('a', href=re.compile(r'/recipe/\d+'))
+            page_urls, link_count = parse_search(response.content)
+            for full_url in page_urls:
+                if full_url not in seen:
+                    seen.add(full_url)
+                    recipe_urls.append(full_url)
             
-            for link in recipe_links:
-                href = link.get('href')
-                if href and '/recipe/' in href:
-                    full_url = urljoin(BASE_URL, href)
-                    if full_url not in recipe_urls:
-                        recipe_urls.append(full_url)
+            print(f"    📋 {link_count}개 레시피 링크 발견 (총 {len(recipe_urls)}개)")
             
-            print(f"    📋 {len(recipe_links)}개 레시피 링크 발견 (총 {len(recipe_urls)}개)")
-            
-            time.sleep(random.uniform(1, 2))
+            # 캐시에서 가져온 응답은 서버 요청이 아니므로 대기 불필요
+            if not getattr(response, 'from_cache', False):
+                time.sleep(random.uniform(*REQUEST_DELAY_RANGE))
             
         except Exception as e:
             print(f"    ❌ 검색 실패: {e}")
@@ -114,52 +155,62 @@ def search_recipes(session, keyword, max_pages=2):
     
     return recipe_urls
 
+# 재료/조리 단계 정리용 키워드 (모듈 로드 시 한 번만 컴파일)
+UTENSIL_KEYWORDS = [
+    '도마','칼','조리용나이프','나이프','스푼','수저','숟가락','젓가락','집게','뒤집개','국자','거품기','볼','그릇',
+    '냄비','팬','프라이팬','오븐','전자레인지','믹서기','블렌더','체','망','찜기','압력솥','계량컵','계량스푼','요리도구','조리도구', '뚝배기'
+]
+STEP_BAN_WORDS = ['이야기', '후기', '소감', '잡담', '광고', '이벤트', '판매', '구독', '좋아요', '댓글', '공유']
+STEP_TIP_WORDS = ['팁', 'TIP', '참고', '주의', '노하우']
+
+UTENSIL_MATCHER = KeywordMatcher(UTENSIL_KEYWORDS)
+STEP_BAN_MATCHER = KeywordMatcher(STEP_BAN_WORDS)
+STEP_TIP_MATCHER = KeywordMatcher(STEP_TIP_WORDS)
+
+PURCHASE_SUFFIX_PATTERN = re.compile(r'구매$')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+STEP_PREFIX_PATTERNS = [re.compile(r'^[0-9]+\.\s*'), re.compile(r'^[가-힣A-Za-z]*\s*:')]
+BULLET_LINE_PATTERN = re.compile(r'^[•ㆍ●★☆◆◇▪▫]\s*')
+BULLET_PREFIX_PATTERN = re.compile(r'^[•ㆍ●★☆◆◇▪▫]+\s*')
+STEP_SUB_CLASS_PATTERN = re.compile(r'(small|gray|tip|note)', re.I)
+SERVINGS_PATTERNS = [
+    re.compile(r'(\d+)인분'),
+    re.compile(r'(\d+)인'),
+    re.compile(r'(\d+)명'),
+    re.compile(r'(\d+)인용'),
+]
+
 def clean_ingredient_text(text):
     """재료 텍스트 정리 (구매/조리도구 제거)"""
     # "구매" 제거
-    text = re.sub(r'구매$', '', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    # 조리도구 키워드 제거
-    utensil_keywords = [
-        '도마','칼','조리용나이프','나이프','스푼','수저','숟가락','젓가락','집게','뒤집개','국자','거품기','볼','그릇',
-        '냄비','팬','프라이팬','오븐','전자레인지','믹서기','블렌더','체','망','찜기','압력솥','계량컵','계량스푼','요리도구','조리도구', '뚝배기'
-    ]
-    lowered = text.lower()
-    for k in utensil_keywords:
-        if k in lowered:
-            return ''
+    text = PURCHASE_SUFFIX_PATTERN.sub('', text)
+    text = WHITESPACE_PATTERN.sub(' ', text).strip()
+    # 조리도구 키워드 제거 (키워드가 모두 한글이라 대소문자 변환 불필요)
+    if UTENSIL_MATCHER.contains_any(text):
+        return ''
     return text
 
-def extract_servings(soup):
-    """몇인분인지 추출"""
+def extract_servings_from_text(text_content, rng=random):
+    """페이지 텍스트에서 몇인분인지 추출 (찾지 못하면 rng로 기본값 생성)"""
+    # 여러 패턴으로 인분 정보 찾기
+    for pattern in SERVINGS_PATTERNS:
+        match = pattern.search(text_content)
+        if match:
+            return int(match.group(1))
+    
+    # 기본값
+    return rng.randint(1, 4)
+
+def extract_servings(soup, rng=random):
+    """몇인분인지 추출 (찾지 못하면 rng로 기본값 생성)"""
     try:
-        # 여러 패턴으로 인분 정보 찾기
-        patterns = [
-            r'(\d+)인분',
-            r'(\d+)인',
-            r'(\d+)명',
-            r'(\d+)인용'
-        ]
-        
-        text_content = soup.get_text()
-        
-        for pattern in patterns:
-            match = re.search(pattern, text_content)
-            if match:
-                return int(match.group(1))
-        
-        # 기본값
-        return random.randint(1, 4)
-        
+        return extract_servings_from_text(soup.get_text(), rng)
     except:
-        return random.randint(1, 4)
+        return rng.randint(1, 4)
 
 def clean_recipe_steps(steps):
     """레시피 단계 정리 (불필요한 내용 제거, 간결화)"""
     cleaned_steps = []
-    remove_prefix_patterns = [r'^[0-9]+\.\s*', r'^[가-힣A-Za-z]*\s*:']
-    ban_words = ['이야기', '후기', '소감', '잡담', '광고', '이벤트', '판매', '구독', '좋아요', '댓글', '공유']
-    tip_words = ['팁', 'TIP', '참고', '주의', '노하우']
 
     for step in steps:
         if not step:
@@ -169,20 +220,21 @@ def clean_recipe_steps(steps):
             continue
 
         # 번호/라벨 제거
-        for pat in remove_prefix_patterns:
-            step = re.sub(pat, '', step)
+        for pat in STEP_PREFIX_PATTERNS:
+            step = pat.sub('', step)
         # 괄호/대괄호는 더이상 제거하지 않음 (보조설명 유지)
-        # 팁/주석 섹션 잘라내기
-        for w in tip_words:
-            idx = step.find(w)
-            if idx != -1 and idx > 0:
+        # 팁/주석 섹션 잘라내기 (키워드 목록 순서대로, 맨 앞에 나온 경우는 제외)
+        tip_positions = STEP_TIP_MATCHER.first_positions(step)
+        for w in STEP_TIP_WORDS:
+            idx = tip_positions.get(w, -1)
+            if idx > 0:
                 step = step[:idx]
                 break
         # 광고/잡담 포함 단계 제외
-        if any(w in step for w in ban_words):
+        if STEP_BAN_MATCHER.contains_any(step):
             continue
         # 공백 정리
-        step = re.sub(r'\s+', ' ', step).strip()
+        step = WHITESPACE_PATTERN.sub(' ', step).strip()
         # 이미 단계 추출에서 보조설명을 괄호로 처리했으므로 추가 처리 불필요
         # 너무 긴 문장은 자르기 (보조설명이 포함되므로 제한을 늘림)
         if len(step) > 300:
@@ -192,181 +244,265 @@ def clean_recipe_steps(steps):
 
     return cleaned_steps
 
-def extract_recipe_data(session, url):
-    """레시피 데이터 추출"""
+def get_recipe_number(url):
+    """레시피 URL에서 만개의 레시피 고유 번호 추출 (없으면 None)"""
+    match = RECIPE_NUMBER_PATTERN.search(url or '')
+    return int(match.group(1)) if match else None
+
+def make_recipe_id(url):
+    """원본 URL 번호 기반의 고정 문서 ID (재크롤링해도 같은 ID)"""
+    recipe_number = get_recipe_number(url)
+    if recipe_number is None:
+        return f"crawled_{int(time.time())}_{random.randint(1000, 9999)}"
+    return f"recipe_{recipe_number}"
+
+def normalize_recipe_url(url):
+    """모바일 도메인으로 들어온 경우 데스크톱 도메인으로 정규화"""
+    if url.startswith('https://m.10000recipe.com'):
+        url = url.replace('https://m.10000recipe.com', BASE_URL)
+    return url
+
+class CrawlFrontier:
+    """레시피 번호 기준 전역 크롤링 프론티어
+    
+    여러 키워드 검색 결과에 같은 레시피가 나와도(예: 불고기/간장불고기) 한 번만 가져와 파싱하고,
+    이후 키워드에서는 저장해 둔 결과를 재사용합니다. 점수는 키워드와 무관하므로 레시피당 한 번만 계산합니다.
+    """
+    
+    def __init__(self):
+        self._entries = {}
+        self.keywords = {}  # 레시피 키 → 이 레시피가 검색된 키워드 목록
+        self.loaded = 0
+        self.reused = 0
+    
+    @staticmethod
+    def key(url):
+        recipe_number = get_recipe_number(url)
+        return recipe_number if recipe_number is not None else normalize_recipe_url(url)
+    
+    def lookup(self, keyword, url, load):
+        """url의 레시피를 처음 한 번만 load(url)로 가져오고 이후에는 같은 결과 반환
+        
+        반환: (결과, 새로 가져왔는지). 비동기 모드에서는 load가 Task를 돌려주므로 같은 Task를 공유합니다.
+        """
+        key = self.key(url)
+        self.keywords.setdefault(key, []).append(keyword)
+        if key in self._entries:
+            self.reused += 1
+            return self._entries[key], False
+        result = load(url)
+        self._entries[key] = result
+        self.loaded += 1
+        return result, True
+    
+    def print_stats(self):
+        print(f"🧭 크롤링 프론티어: 레시피 {self.loaded + self.reused}건 중 {self.reused}건 재사용 "
+              f"(고유 레시피 {self.loaded}개만 요청/파싱)")
+
+def extract_recipe_data(session, url, parse_page=None):
+    """레시피 데이터 추출 (parse_page: HTML 파서 함수, 기본은 BeautifulSoup 구현)"""
     try:
-        # 모바일 도메인으로 들어온 경우 데스크톱 도메인으로 정규화
-        if url.startswith('https://m.10000recipe.com'):
-            url = url.replace('https://m.10000recipe.com', BASE_URL)
-        response = session.get(url, timeout=10)
+        url = normalize_recipe_url(url)
+        response = session.get(url)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # 레시피 제목
-        title_elem = soup.find('h3', class_='view2_summary_info3') or soup.find('h1', class_='view2_summary_info3')
-        if not title_elem:
-            title_elem = soup.find('h3') or soup.find('h1')
-        
-        title = title_elem.get_text(strip=True) if title_elem else "제목 없음"
-        # 밀키트 레시피 제외
-        if '밀키트' in title:
-            return None
-        
-        # 레시피 이미지 (만개의 레시피 이미지만)
-        img_elem = soup.find('img', class_='view2_summary_img') or soup.find('img', {'class': re.compile(r'.*summary_img.*')})
-        if not img_elem:
-            img_elem = soup.find('img', {'src': re.compile(r'.*recipe.*')}) or soup.find('img', {'src': re.compile(r'.*food.*')})
-        
-        image_url = ""
-        if img_elem and img_elem.get('src'):
-            img_src = img_elem.get('src')
-            if img_src.startswith('//'):
-                image_url = 'https:' + img_src
-            elif img_src.startswith('/'):
-                image_url = BASE_URL + img_src
-            elif img_src.startswith('http'):
-                image_url = img_src
-        
-        # 재료 정보
-        ingredients = []
-        ingredient_sections = soup.find_all('div', class_='ready_ingre3')
-        
-        for section in ingredient_sections:
-            ingredient_items = section.find_all('li')
-            for item in ingredient_items:
-                ingredient_text = item.get_text(strip=True)
-                if ingredient_text and ingredient_text != '재료':
-                    # 재료 텍스트 정리
-                    cleaned_ingredient = clean_ingredient_text(ingredient_text)
-                    # 밀키트 언급 포함 시 제외
-                    if cleaned_ingredient and '밀키트' not in cleaned_ingredient:
-                        ingredients.append(cleaned_ingredient)
-        
-        # 조리법
-        steps = []
-        # 1순위: 데스크톱의 명확한 단계 블록(id=stepDivN)
-        step_items = soup.find_all('div', id=re.compile(r'^stepDiv\d+$'))
-        # 대체: 넓은 선택자 (모바일/변형 대응)
-        if not step_items:
-            step_sections = soup.select('div.view_step, section.view_step, div.rd_step, section.rd_step, [class*="step"]')
-            step_items = []
-            for section in step_sections:
-                step_items.extend(section.select('div.view_step_cont, div.rd_step_cont, li.view_step_cont, .step_cont, .step_txt, li'))
-        
-        for item in step_items:
-            # 1) 메인 텍스트와 보조설명을 HTML 구조로 분리
-            main_text = ''
-            sub_text = ''
-            
-            # 메인 텍스트: media-body에서 step_add 클래스 제외한 부분
-            main_elem = item.find('div', class_='media-body')
-            if main_elem:
-                # step_add 클래스 요소들 제거하고 메인 텍스트 추출
-                main_elem_copy = main_elem.__copy__()
-                for tip_elem in main_elem_copy.find_all('p', class_='step_add'):
-                    tip_elem.decompose()
-                main_text = main_elem_copy.get_text('\n', strip=True)
-                # 모든 일반 줄을 메인 텍스트로 사용 (줄바꿈을 공백으로)
-                main_lines = [ln.strip() for ln in main_text.split('\n') if ln.strip()]
-                main_text = ' '.join(main_lines) if main_lines else ''
-            
-            # 보조설명: step_add 클래스 요소들
-            tip_elements = item.find_all('p', class_='step_add')
-            tip_texts = []
-            for tip_elem in tip_elements:
-                tip_text = tip_elem.get_text(' ', strip=True)
-                if tip_text:
-                    tip_texts.append(tip_text)
-            
-            if tip_texts:
-                sub_text = ' '.join(tip_texts)
-            
-            # 2) 불릿(•)으로 시작하는 보조설명도 찾기
-            raw_text = item.get_text('\n', strip=True)
-            lines = [ln.strip() for ln in raw_text.split('\n') if ln and ln.strip()]
-            
-            bullet_lines = []
-            for line in lines:
-                if re.match(r'^[•ㆍ●★☆◆◇▪▫]\s*', line):
-                    bullet_text = re.sub(r'^[•ㆍ●★☆◆◇▪▫]+\s*', '', line).strip()
-                    if bullet_text:
-                        bullet_lines.append(bullet_text)
-            
-            if bullet_lines:
-                bullet_text = ' '.join(bullet_lines)
-                sub_text = (sub_text + ' ' + bullet_text).strip() if sub_text else bullet_text
-            
-            # 3) 작은 회색/보조 span 들 수집하여 보조설명에 추가
-            sub_elements = item.find_all('span', class_=re.compile(r'(small|gray|tip|note)', re.I))
-            extra_subs = [se.get_text(' ', strip=True) for se in sub_elements if se.get_text(strip=True)]
-            if extra_subs:
-                sub_text = (sub_text + ' ' + ' '.join(extra_subs)).strip() if sub_text else ' '.join(extra_subs)
-            
-            # 4) 결합 및 정리
-            step_text = main_text.strip()
-            if step_text and sub_text:
-                step_text = f"{step_text} ({sub_text})"
-            elif not step_text and sub_text:
-                step_text = sub_text
-            elif not step_text:
-                # 메인 텍스트가 없으면 전체 텍스트 사용
-                step_text = ' '.join([ln.strip() for ln in lines if ln.strip()])
-            
-            step_text = re.sub(r'\s+', ' ', step_text).strip()
-            
-            if step_text and '밀키트' not in step_text:
-                steps.append(step_text)
-        
-        # 조리법 정리
-        steps = clean_recipe_steps(steps)
-        
-        # 태그
-        tags = []
-        tag_elements = soup.find_all('a', href=re.compile(r'/recipe/list\.html\?q='))
-        for tag_elem in tag_elements:
-            tag_text = tag_elem.get_text(strip=True)
-            if tag_text and len(tag_text) > 1:
-                tags.append(tag_text)
-        
-        # 인분 수 추출
-        servings = extract_servings(soup)
-        
-        # 기본 정보
-        recipe_id = f"crawled_{int(time.time())}_{random.randint(1000, 9999)}"
-        
-        # 요리 카테고리 판단
-        category = "한식"
-        if any(keyword in title for keyword in ["파스타", "스파게티", "피자", "스테이크", "샐러드", "그라탕", "오믈렛"]):
-            category = "양식"
-        elif any(keyword in title for keyword in ["초밥", "라멘", "우동", "돈카츠", "텐푸라", "규동", "가츠동"]):
-            category = "일식"
-        elif any(keyword in title for keyword in ["짜장면", "짬뽕", "탕수육", "깐풍기", "마파두부", "춘권", "만두"]):
-            category = "중식"
-        
-        recipe_data = {
-            "id": recipe_id,
-            "name": title,
-            "ingredients": ingredients,
-            "steps": steps,
-            "tags": tags[:5],  # 최대 5개 태그
-            "imageUrl": image_url,
-            "sourceUrl": url,
-            "category": category,
-            "servings": servings,
-            "cookingTime": random.randint(15, 120),  # 15-120분
-            "difficulty": random.choice(["쉬움", "보통", "어려움"]),
-            "createdAt": firestore.SERVER_TIMESTAMP
-        }
-        
-        return recipe_data
+        return (parse_page or parse_recipe_page)(response.content, url)
         
     except Exception as e:
         print(f"    ❌ 레시피 추출 실패: {e}")
         return None
 
+def parse_recipe_page(content, url):
+    """레시피 상세 페이지 HTML에서 레시피 데이터 추출"""
+    soup = BeautifulSoup(content, 'html.parser')
+    
+    # 레시피 제목
+    title_elem = soup.find('h3', class_='view2_summary_info3') or soup.find('h1', class_='view2_summary_info3')
+    if not title_elem:
+        title_elem = soup.find('h3') or soup.find('h1')
+    
+    title = title_elem.get_text(strip=True) if title_elem else "제목 없음"
+    # 밀키트 레시피 제외
+    if '밀키트' in title:
+        return None
+    
+    # 레시피 이미지 (만개의 레시피 이미지만)
+    img_elem = soup.find('img', class_='view2_summary_img') or soup.find('img', {'class': re.compile(r'.*summary_img.*')})
+    if not img_elem:
+        img_elem = soup.find('img', {'src': re.compile(r'.*recipe.*')}) or soup.find('img', {'src': re.compile(r'.*food.*')})
+    
+    image_url = normalize_image_url(img_elem.get('src') if img_elem else None)
+    
+    # 재료 정보
+    ingredients = []
+    ingredient_sections = soup.find_all('div', class_='ready_ingre3')
+    
+    for section in ingredient_sections:
+        ingredient_items = section.find_all('li')
+        for item in ingredient_items:
+            ingredient_text = item.get_text(strip=True)
+            if ingredient_text and ingredient_text != '재료':
+                # 재료 텍스트 정리
+                cleaned_ingredient = clean_ingredient_text(ingredient_text)
+                # 밀키트 언급 포함 시 제외
+                if cleaned_ingredient and '밀키트' not in cleaned_ingredient:
+                    ingredients.append(cleaned_ingredient)
+    
+    # 조리법
+    steps = []
+    # 1순위: 데스크톱의 명확한 단계 블록(id=stepDivN)
+    step_items = soup.find_all('div', id=re.compile(r'^stepDiv\d+$'))
+    # 대체: 넓은 선택자 (모바일/변형 대응)
+    if not step_items:
+        step_sections = soup.select('div.view_step, section.view_step, div.rd_step, section.rd_step, [class*="step"]')
+        step_items = []
+        for section in step_sections:
+            step_items.extend(section.select('div.view_step_cont, div.rd_step_cont, li.view_step_cont, .step_cont, .step_txt, li'))
+    
+    for item in step_items:
+        # 1) 메인 텍스트와 보조설명을 HTML 구조로 분리
+        # 메인 텍스트: media-body에서 step_add 클래스 제외한 부분
+        main_text = ''
+        main_elem = item.find('div', class_='media-body')
+        if main_elem:
+            # step_add 클래스 요소들 제거하고 메인 텍스트 추출
+            main_elem_copy = main_elem.__copy__()
+            for tip_elem in main_elem_copy.find_all('p', class_='step_add'):
+                tip_elem.decompose()
+            main_text = main_elem_copy.get_text('\n', strip=True)
+            # 모든 일반 줄을 메인 텍스트로 사용 (줄바꿈을 공백으로)
+            main_lines = [ln.strip() for ln in main_text.split('\n') if ln.strip()]
+            main_text = ' '.join(main_lines) if main_lines else ''
+        
+        # 보조설명: step_add 클래스 요소들
+        tip_elements = item.find_all('p', class_='step_add')
+        tip_texts = []
+        for tip_elem in tip_elements:
+            tip_text = tip_elem.get_text(' ', strip=True)
+            if tip_text:
+                tip_texts.append(tip_text)
+        
+        # 2) 불릿 줄 / 작은 회색 span 보조설명을 붙여 한 단계로 결합
+        raw_text = item.get_text('\n', strip=True)
+        lines = [ln.strip() for ln in raw_text.split('\n') if ln and ln.strip()]
+        
+        sub_elements = item.find_all('span', class_=STEP_SUB_CLASS_PATTERN)
+        extra_subs = [se.get_text(' ', strip=True) for se in sub_elements if se.get_text(strip=True)]
+        
+        step_text = compose_step_text(main_text, tip_texts, lines, extra_subs)
+        
+        if step_text and '밀키트' not in step_text:
+            steps.append(step_text)
+    
+    # 태그
+    tags = []
+    tag_elements = soup.find_all('a', href=re.compile(r'/recipe/list\.html\?q='))
+    for tag_elem in tag_elements:
+        tag_text = tag_elem.get_text(strip=True)
+        if tag_text and len(tag_text) > 1:
+            tags.append(tag_text)
+    
+    return build_recipe_data(url, title, image_url, ingredients, steps, tags, soup.get_text())
+
+def compose_step_text(main_text, tip_texts, lines, extra_subs):
+    """메인 텍스트와 보조설명(step_add, 불릿 줄, 보조 span)을 한 단계 문장으로 결합"""
+    sub_text = ''
+    if tip_texts:
+        sub_text = ' '.join(tip_texts)
+    
+    # 불릿(•)으로 시작하는 보조설명도 찾기
+    bullet_lines = []
+    for line in lines:
+        if BULLET_LINE_PATTERN.match(line):
+            bullet_text = BULLET_PREFIX_PATTERN.sub('', line).strip()
+            if bullet_text:
+                bullet_lines.append(bullet_text)
+    
+    if bullet_lines:
+        bullet_text = ' '.join(bullet_lines)
+        sub_text = (sub_text + ' ' + bullet_text).strip() if sub_text else bullet_text
+    
+    # 작은 회색/보조 span 들 수집하여 보조설명에 추가
+    if extra_subs:
+        sub_text = (sub_text + ' ' + ' '.join(extra_subs)).strip() if sub_text else ' '.join(extra_subs)
+    
+    # 결합 및 정리
+    step_text = main_text.strip()
+    if step_text and sub_text:
+        step_text = f"{step_text} ({sub_text})"
+    elif not step_text and sub_text:
+        step_text = sub_text
+    elif not step_text:
+        # 메인 텍스트가 없으면 전체 텍스트 사용
+        step_text = ' '.join([ln.strip() for ln in lines if ln.strip()])
+    
+    return WHITESPACE_PATTERN.sub(' ', step_text).strip()
+
+def normalize_image_url(img_src):
+    """이미지 src를 절대 URL로 변환 (지원하지 않는 형식이면 빈 문자열)"""
+    image_url = ""
+    if img_src:
+        if img_src.startswith('//'):
+            image_url = 'https:' + img_src
+        elif img_src.startswith('/'):
+            image_url = BASE_URL + img_src
+        elif img_src.startswith('http'):
+            image_url = img_src
+    return image_url
+
+def classify_category(title):
+    """요리 카테고리 판단"""
+    category = "한식"
+    if any(keyword in title for keyword in ["파스타", "스파게티", "피자", "스테이크", "샐러드", "그라탕", "오믈렛"]):
+        category = "양식"
+    elif any(keyword in title for keyword in ["초밥", "라멘", "우동", "돈카츠", "텐푸라", "규동", "가츠동"]):
+        category = "일식"
+    elif any(keyword in title for keyword in ["짜장면", "짬뽕", "탕수육", "깐풍기", "마파두부", "춘권", "만두"]):
+        category = "중식"
+    return category
+
+def build_recipe_data(url, title, image_url, ingredients, raw_steps, tags, page_text):
+    """추출한 필드로 레시피 dict 구성 (파서 구현과 무관한 공통 후처리)"""
+    # 조리법 정리
+    steps = clean_recipe_steps(raw_steps)
+    
+    # 페이지에 없는 값(인분/조리시간/난이도)은 레시피 번호로 시드한 난수로 채움
+    # → 같은 레시피는 매번 같은 값이 나와 내용 해시가 안정적으로 유지됨
+    recipe_number = get_recipe_number(url)
+    rng = random.Random(recipe_number) if recipe_number is not None else random
+    
+    # 인분 수 추출
+    servings = extract_servings_from_text(page_text, rng)
+    
+    # 기본 정보
+    recipe_id = make_recipe_id(url)
+    
+    # 요리 카테고리 판단
+    category = classify_category(title)
+    
+    # 재료 정규화 (이름/양/단위 분리 + 동의어 → 대표 이름)
+    normalized_ingredients, ingredient_tokens = normalize_ingredients(ingredients)
+    
+    recipe_data = {
+        "id": recipe_id,
+        "name": title,
+        "ingredients": ingredients,
+        "normalizedIngredients": normalized_ingredients,
+        "ingredientTokens": ingredient_tokens,
+        "steps": steps,
+        "tags": tags[:5],  # 최대 5개 태그
+        "imageUrl": image_url,
+        "sourceUrl": url,
+        "category": category,
+        "servings": servings,
+        "cookingTime": rng.randint(15, 120),  # 15-120분
+        "difficulty": rng.choice(["쉬움", "보통", "어려움"]),
+    }
+    
+    return recipe_data
+
 def score_recipe(recipe_data):
-    """레시피 점수 계산 (간단/명료 중심)"""
+    """레시피 점수 계산 (간단/명료 중심, 가중치를 바꾸면 batch_scoring.DEFAULT_WEIGHTS도 함께 수정)"""
     score = 0
 
     name = recipe_data.get('name', '')
@@ -425,71 +561,76 @@ def score_recipe(recipe_data):
 
     return score
 
-def crawl_recipes():
-    """메인 크롤링 함수"""
-    print("🚀 레시피 크롤링 시작")
-    
-    # Firebase 초기화
-    db = initialize_firebase()
-    if not db:
-        return
+def is_valid_recipe(recipe_data):
+    """재료 3개 이상, 조리 단계 2개 이상인 레시피만 유효"""
+    return bool(recipe_data) and len(recipe_data['ingredients']) >= 3 and len(recipe_data['steps']) >= 2
+
+def select_best_recipe(keyword_recipes):
+    """키워드별 최고 점수 레시피 선택 (동점이면 먼저 수집된 레시피)"""
+    if not keyword_recipes:
+        return None
+    return max(keyword_recipes, key=lambda x: x['score'])
+
+def crawl_keywords_sequential(session, keywords=RECIPE_KEYWORDS, max_pages=2, max_recipes_per_keyword=10,
+                              parse_page=None, parse_search=parse_search_results, checkpoint=None, frontier=None):
+    """키워드를 하나씩 순차적으로 크롤링 (요리별 최고 점수 레시피 반환)
     
-    session = get_session()
-    all_recipes = []
+    checkpoint가 있으면 수집한 레시피와 키워드 완료 여부를 즉시 파일에 기록합니다.
+    다른 키워드에서 이미 가져온 레시피는 frontier(CrawlFrontier)에서 재사용합니다.
+    """
     selected_recipes = {}  # 요리별로 최고 점수 레시피만 저장
+    if frontier is None:
+        frontier = CrawlFrontier()
     
-    print(f"\n📝 {len(RECIPE_KEYWORDS)}개 요리 키워드로 크롤링 시작...")
-    
-    for i, keyword in enumerate(RECIPE_KEYWORDS):
-        print(f"\n📝 {i+1}/{len(RECIPE_KEYWORDS)}: '{keyword}' 검색 중...")
+    for i, keyword in enumerate(keywords):
+        print(f"\n📝 {i+1}/{len(keywords)}: '{keyword}' 검색 중...")
         
         # 해당 키워드로 레시피 검색
-        recipe_urls = search_recipes(session, keyword, max_pages=2)
+        recipe_urls = search_recipes(session, keyword, max_pages=max_pages, parse_search=parse_search)
         
         if not recipe_urls:
             print(f"    ⚠️ '{keyword}' 검색 결과 없음")
+            if checkpoint:
+                checkpoint.mark_keyword_done(keyword, None)
             continue
         
         # 각 레시피 크롤링하여 점수 계산
         keyword_recipes = []
         
-        for url in recipe_urls[:10]:  # 키워드당 최대 10개 크롤링
-            print(f"    📝 레시피 수집 중...")
-            recipe_data = extract_recipe_data(session, url)
+        for url in recipe_urls[:max_recipes_per_keyword]:  # 키워드당 최대 10개 크롤링
+            recipe_data, fetched = frontier.lookup(
+                keyword, url, lambda u: extract_recipe_data(session, u, parse_page=parse_page)
+            )
+            print(f"    📝 레시피 수집 중..." if fetched else f"    ♻️ 이미 수집한 레시피 재사용")
             
-            if recipe_data and len(recipe_data['ingredients']) >= 3 and len(recipe_data['steps']) >= 2:
-                recipe_data['score'] = score_recipe(recipe_data)
+            if is_valid_recipe(recipe_data):
+                if 'score' not in recipe_data:
+                    recipe_data['score'] = score_recipe(recipe_data)
                 keyword_recipes.append(recipe_data)
+                if checkpoint:
+                    checkpoint.record_recipe(keyword, recipe_data)
                 print(f"    ✅ 수집 완료: {recipe_data['name']} (점수: {recipe_data['score']})")
             else:
                 print(f"    ⚠️ 데이터 부족으로 스킵")
             
-            time.sleep(random.uniform(1, 2))
+            if fetched and not getattr(session, 'last_from_cache', False):
+                time.sleep(random.uniform(*REQUEST_DELAY_RANGE))
         
         # 해당 키워드의 최고 점수 레시피 선택
-        if keyword_recipes:
-            best_recipe = max(keyword_recipes, key=lambda x: x['score'])
+        best_recipe = select_best_recipe(keyword_recipes)
+        if best_recipe:
             selected_recipes[keyword] = best_recipe
             print(f"    🏆 '{keyword}' 최고 점수 레시피 선택: {best_recipe['name']} (점수: {best_recipe['score']})")
         else:
             print(f"    ❌ '{keyword}' 유효한 레시피 없음")
+        if checkpoint:
+            checkpoint.mark_keyword_done(keyword, best_recipe)
     
-    # 선택된 레시피들을 리스트로 변환
-    all_recipes = list(selected_recipes.values())
-    
-    print(f"\n📊 크롤링 완료: 총 {len(all_recipes)}개 레시피 선택")
-    
-    # 카테고리별 통계
-    category_count = {}
-    for recipe in all_recipes:
-        category = recipe['category']
-        category_count[category] = category_count.get(category, 0) + 1
-    
-    print("📈 카테고리별 통계:")
-    for category, count in category_count.items():
-        print(f"   - {category}: {count}개")
-    
-    # Firebase에 업로드
+    frontier.print_stats()
+    return selected_recipes
+
+def upload_recipes(db, all_recipes):
+    """기존 레시피를 지우고 선택된 레시피를 Firebase에 업로드"""
     print(f"\n🔥 Firebase 업로드 시작...")
     
     try:
@@ -501,23 +642,233 @@ def crawl_recipes():
             doc.reference.delete()
         print("✅ 기존 레시피 삭제 완료")
         
-        # 새 레시피 업로드
+        # 새 레시피 업로드 (all_recipes는 체크포인트 스트림일 수 있으므로 한 번만 순회)
         print("📤 새 레시피 업로드 중...")
+        uploaded_count = 0
         for i, recipe in enumerate(all_recipes):
             try:
                 # score 필드 제거 (Firebase에 저장하지 않음)
                 recipe_to_upload = {k: v for k, v in recipe.items() if k != 'score'}
+                # 생성 시각은 업로드 시점에 서버 타임스탬프로 기록
+                # (파싱 결과는 프로세스 간 전달/직렬화 가능한 순수 dict로 유지)
+                recipe_to_upload['createdAt'] = firestore.SERVER_TIMESTAMP
                 
                 recipes_ref.document(recipe['id']).set(recipe_to_upload)
-                print(f"    ✅ {i+1}/{len(all_recipes)}: {recipe['name']} ({recipe['category']}, {recipe['servings']}인분)")
+                uploaded_count += 1
+                print(f"    ✅ {i+1}: {recipe['name']} ({recipe['category']}, {recipe['servings']}인분)")
                 
             except Exception as e:
                 print(f"    ❌ 업로드 실패: {recipe['name']} - {e}")
         
-        print(f"\n🎉 완료! {len(all_recipes)}개 레시피가 Firebase에 업로드되었습니다.")
+        print(f"\n🎉 완료! {uploaded_count}개 레시피가 Firebase에 업로드되었습니다.")
         
     except Exception as e:
         print(f"❌ Firebase 업로드 실패: {e}")
 
+def print_category_stats(recipes):
+    """카테고리별 통계 출력 (recipes는 한 번만 순회)"""
+    category_count = {}
+    total = 0
+    for recipe in recipes:
+        category = recipe['category']
+        category_count[category] = category_count.get(category, 0) + 1
+        total += 1
+    
+    print(f"\n📊 크롤링 완료: 총 {total}개 레시피 선택")
+    print("📈 카테고리별 통계:")
+    for category, count in category_count.items():
+        print(f"   - {category}: {count}개")
+
+def publish_recipes(db, recipes, upload_mode='sync'):
+    """선택된 레시피를 Firebase에 반영 (sync: 증분 동기화, replace: 전체 재업로드)"""
+    if upload_mode == 'replace':
+        upload_recipes(db, recipes)
+        return
+    print(f"\n🔥 Firebase 증분 동기화 시작...")
+    try:
+        sync_recipes(db, recipes)
+    except Exception as e:
+        print(f"❌ Firebase 동기화 실패: {e}")
+
+def export_selected_snapshot(checkpoint_dir, snapshot_path):
+    """체크포인트의 선택된 레시피를 열 단위 스냅샷(recipe_snapshot)으로 저장"""
+    count = export_snapshot(iter_selected_recipes(checkpoint_dir), snapshot_path)
+    print(f"📦 스냅샷 저장: {snapshot_path} (레시피 {count}개)")
+
+def upload_from_checkpoint(checkpoint_dir=None, upload_mode='sync'):
+    """크롤링 없이 체크포인트 파일만 읽어 업로드 (크롤링과 분리된 스트리밍 업로드 단계)"""
+    checkpoint_dir = checkpoint_dir or DEFAULT_CHECKPOINT_DIR
+    print(f"📂 체크포인트에서 업로드: {checkpoint_dir}")
+    
+    db = initialize_firebase()
+    if not db:
+        return
+    
+    print_category_stats(iter_selected_recipes(checkpoint_dir))
+    publish_recipes(db, iter_selected_recipes(checkpoint_dir), upload_mode)
+
+def crawl_recipes(use_async=False, concurrency=8, requests_per_second=2.0, parser_workers=None,
+                  use_cache=True, cache_dir=None, cache_ttl=None, offline=False, upload_mode='sync',
+                  parser='lxml', checkpoint_dir=None, resume=False, skip_upload=False,
+                  pool_size=None, retries=DEFAULT_RETRIES, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                  read_timeout=DEFAULT_READ_TIMEOUT, snapshot_path=None):
+    """메인 크롤링 함수
+    
+    use_async=True 이면 비동기 크롤링 엔진(async_crawler)을 사용하며,
+    전체 요청 속도는 호스트별 requests_per_second 예산으로 제한됩니다.
+    HTML 파싱은 parser_workers개의 프로세스에서 병렬로 수행됩니다.
+    use_cache=True 이면 검색/레시피 페이지를 디스크 캐시(http_cache)를 거쳐 가져오고,
+    offline=True 이면 네트워크 없이 캐시된 페이지만 다시 파싱합니다.
+    upload_mode='sync' 이면 바뀐 레시피만 배치로 쓰고(firestore_sync),
+    'replace' 이면 기존처럼 전체 삭제 후 다시 업로드합니다.
+    parser='lxml' 이면 단일 패스 lxml 추출기(fast_extractor), 'bs4' 이면 BeautifulSoup 추출기를 씁니다.
+    수집한 레시피는 checkpoint_dir의 JSONL 파일에 즉시 기록되며, resume=True 이면
+    이미 완료된 키워드는 건너뜁니다. 업로드는 이 파일을 스트리밍으로 읽어 수행합니다.
+    pool_size는 호스트별 keep-alive 연결 풀 크기(기본: 비동기 모드는 concurrency 이상)이고,
+    일시적 실패는 retries회까지 백오프 후 재시도합니다.
+    snapshot_path가 있으면 선택된 레시피를 열 단위 스냅샷(recipe_snapshot)으로도 저장합니다.
+    """
+    print("🚀 레시피 크롤링 시작")
+    
+    # Firebase 초기화 (크롤링 후 업로드가 실패하지 않도록 미리 확인)
+    db = None
+    if not skip_upload:
+        db = initialize_firebase()
+        if not db:
+            return
+    
+    if pool_size is None:
+        pool_size = max(DEFAULT_POOL_SIZE, concurrency) if use_async else DEFAULT_POOL_SIZE
+    transport = get_session(
+        pool_size=pool_size,
+        retries=retries,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+    )
+    session = transport
+    if use_cache or offline:
+        cache = HttpCache(cache_dir or DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL if cache_ttl is None else cache_ttl)
+        session = CachedSession(session, cache, offline=offline)
+    
+    if parser == 'lxml':
+        from fast_extractor import parse_recipe_page_fast as parse_page, parse_search_results_fast as parse_search
+    else:
+        parse_page, parse_search = parse_recipe_page, parse_search_results
+    
+    checkpoint_dir = checkpoint_dir or DEFAULT_CHECKPOINT_DIR
+    checkpoint = CrawlCheckpoint(checkpoint_dir, resume=resume)
+    keywords = RECIPE_KEYWORDS
+    if resume:
+        done = checkpoint.completed_keywords()
+        keywords = [keyword for keyword in RECIPE_KEYWORDS if keyword not in done]
+        print(f"\n♻️ 이어서 크롤링: 완료된 키워드 {len(RECIPE_KEYWORDS) - len(keywords)}개 건너뜀")
+    
+    print(f"\n📝 {len(keywords)}개 요리 키워드로 크롤링 시작...")
+    
+    try:
+        if use_async:
+            from async_crawler import crawl_keywords_async
+            crawl_keywords_async(
+                session,
+                keywords,
+                concurrency=concurrency,
+                requests_per_second=requests_per_second,
+                parser_workers=parser_workers,
+                parse_page=parse_page,
+                parse_search=parse_search,
+                checkpoint=checkpoint,
+            )
+        else:
+            crawl_keywords_sequential(
+                session, keywords, parse_page=parse_page, parse_search=parse_search, checkpoint=checkpoint
+            )
+    finally:
+        checkpoint.close()
+    
+    if isinstance(session, CachedSession):
+        session.print_stats()
+    print_transport_stats(transport)
+    
+    # 이전 실행분을 포함한 선택 결과를 체크포인트에서 스트리밍으로 읽음
+    print_category_stats(iter_selected_recipes(checkpoint_dir))
+    
+    if snapshot_path:
+        export_selected_snapshot(checkpoint_dir, snapshot_path)
+    
+    if skip_upload:
+        print(f"\n⏭️ 업로드 생략 (체크포인트: {checkpoint_dir})")
+        return
+    
+    # Firebase에 업로드
+    publish_recipes(db, iter_selected_recipes(checkpoint_dir), upload_mode)
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="만개의 레시피 크롤러")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='비동기 크롤링 엔진 사용 (동시 요청 + 호스트별 속도 제한)')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='비동기 모드 최대 동시 요청 수 (기본 8)')
+    parser.add_argument('--rps', type=float, default=2.0,
+                        help='비동기 모드 호스트별 초당 요청 수 예산 (기본 2.0)')
+    parser.add_argument('--parser-workers', type=int, default=None,
+                        help='비동기 모드 HTML 파서 프로세스 수 (기본: CPU 코어 수, 0이면 파서 프로세스 미사용)')
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                        help='디스크 HTTP 캐시 사용 안 함')
+    parser.add_argument('--cache-dir', default=None,
+                        help='HTTP 캐시 디렉터리 (기본: recipe_crawler/.http_cache)')
+    parser.add_argument('--cache-ttl', type=float, default=None,
+                        help='캐시 유효 시간(초), 지나면 조건부 요청으로 재검증 (기본 7일)')
+    parser.add_argument('--offline', action='store_true',
+                        help='네트워크 없이 캐시된 페이지만 다시 파싱')
+    parser.add_argument('--parser', choices=['lxml', 'bs4'], default='lxml',
+                        help='HTML 추출기: lxml 단일 패스 (기본) 또는 BeautifulSoup')
+    parser.add_argument('--upload-mode', choices=['sync', 'replace'], default='sync',
+                        help='sync: 변경분만 배치 반영 (기본), replace: 전체 삭제 후 재업로드')
+    parser.add_argument('--pool-size', type=int, default=None,
+                        help='호스트별 HTTP 연결 풀 크기 (기본: 10, 비동기 모드는 동시 요청 수 이상)')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help=f'429/5xx/연결 오류 재시도 횟수 (기본 {DEFAULT_RETRIES})')
+    parser.add_argument('--connect-timeout', type=float, default=DEFAULT_CONNECT_TIMEOUT,
+                        help=f'연결 타임아웃(초, 기본 {DEFAULT_CONNECT_TIMEOUT})')
+    parser.add_argument('--read-timeout', type=float, default=DEFAULT_READ_TIMEOUT,
+                        help=f'읽기 타임아웃(초, 기본 {DEFAULT_READ_TIMEOUT})')
+    parser.add_argument('--checkpoint-dir', default=None,
+                        help='체크포인트(JSONL) 디렉터리 (기본: recipe_crawler/checkpoints)')
+    parser.add_argument('--resume', action='store_true',
+                        help='체크포인트에 완료로 기록된 키워드는 건너뛰고 이어서 크롤링')
+    parser.add_argument('--skip-upload', action='store_true',
+                        help='크롤링만 하고 업로드는 생략 (나중에 --upload-only로 업로드)')
+    parser.add_argument('--upload-only', action='store_true',
+                        help='크롤링 없이 체크포인트 파일을 읽어 업로드만 수행')
+    parser.add_argument('--export-snapshot', default=None, metavar='PATH',
+                        help='선택된 레시피를 열 단위 스냅샷 파일로도 저장 (recipe_snapshot)')
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    crawl_recipes()
+    args = parse_args()
+    if args.upload_only:
+        if args.export_snapshot:
+            export_selected_snapshot(args.checkpoint_dir or DEFAULT_CHECKPOINT_DIR, args.export_snapshot)
+        upload_from_checkpoint(args.checkpoint_dir, upload_mode=args.upload_mode)
+        sys.exit(0)
+    crawl_recipes(
+        use_async=args.use_async,
+        concurrency=args.concurrency,
+        requests_per_second=args.rps,
+        parser_workers=args.parser_workers,
+        use_cache=args.use_cache,
+        cache_dir=args.cache_dir,
+        cache_ttl=args.cache_ttl,
+        offline=args.offline,
+        upload_mode=args.upload_mode,
+        parser=args.parser,
+        checkpoint_dir=args.checkpoint_dir,
+        resume=args.resume,
+        skip_upload=args.skip_upload,
+        pool_size=args.pool_size,
+        retries=args.retries,
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+        snapshot_path=args.export_snapshot,
+    )
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+재료 정규화
+"돼지고기300g", "양파 1/2개", "소금 약간" 같은 재료 문자열을 이름/양/단위로 나누고,
+동의어 사전(shared/ingredient_synonyms.json)으로 대표 이름(normalizedName)을 붙임
+
+- 대표 이름은 소문자 + 공백/괄호 제거 후 동의어를 대표어로 바꾼 값 (예: "파" → "대파", "달걀" → "계란")
+- 레시피마다 대표 이름 집합(ingredientTokens)을 미리 계산해 두면 추천 매칭이 부분 문자열 비교 대신 해시 조회가 됨
+- 대표 이름 규칙과 동의어 사전은 shared/ingredient_names.py에 있고, fastapi-backend도 같은 모듈로 팬트리 재료 이름을 정규화
+"""
+
+import os
+import re
+import sys
+
+# 대표 이름 규칙과 동의어 사전은 백엔드와 함께 쓰는 shared/ingredient_names.py에 있음
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.ingredient_names import canonical_name  # noqa: E402
+
+# 이름 뒤에 붙는 분량 표현의 시작 (숫자, 분수 문자, 분량 단어)
+AMOUNT_START_PATTERN = re.compile(
+    r'\d|[½⅓⅔¼¾⅛]|약간|적당량|적당히|조금|소량|한줌|한꼬집|한주먹|톡톡|취향껏|기호에\s*따라|생략가능'
+)
+NUMBER_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)(?:\s*/\s*(\d+))?')
+RANGE_SUFFIX_PATTERN = re.compile(r'^\s*[~\-]\s*\d+(?:\.\d+)?(?:\s*/\s*\d+)?')
+UNICODE_FRACTIONS = {'½': 0.5, '⅓': 1 / 3, '⅔': 2 / 3, '¼': 0.25, '¾': 0.75, '⅛': 0.125}
+
+
+def parse_quantity(amount):
+    """분량 문자열 → (양, 단위) (양을 숫자로 읽을 수 없으면 None)"""
+    amount = amount.strip()
+    if not amount:
+        return None, ''
+    if amount[0] in UNICODE_FRACTIONS:
+        return UNICODE_FRACTIONS[amount[0]], amount[1:].strip()
+    match = NUMBER_PATTERN.match(amount)
+    if not match:
+        # 약간/적당량 같은 분량 단어는 단위로 보관
+        return None, amount
+    quantity = float(match.group(1))
+    if match.group(2):
+        denominator = int(match.group(2))
+        quantity = quantity / denominator if denominator else None
+    # 2~3개 같은 범위는 앞 값만 사용
+    unit = RANGE_SUFFIX_PATTERN.sub('', amount[match.end():]).strip()
+    if quantity is not None and quantity.is_integer():
+        quantity = int(quantity)
+    return quantity, unit
+
+
+def parse_ingredient(text, synonyms=None):
+    """재료 문자열 → {name, normalizedName, quantity, unit}"""
+    text = (text or '').strip()
+    match = AMOUNT_START_PATTERN.search(text)
+    name, amount = (text[:match.start()].strip(), text[match.start():]) if match else (text, '')
+    if not name:
+        # 분량이 앞에 오는 등 이름을 찾지 못하면 전체를 이름으로 사용
+        name, amount = text, ''
+    quantity, unit = parse_quantity(amount)
+    return {
+        'name': name,
+        'normalizedName': canonical_name(name, synonyms),
+        'quantity': quantity,
+        'unit': unit,
+    }
+
+
+def normalize_ingredients(ingredients, synonyms=None):
+    """재료 문자열 목록 → (정규화된 재료 목록, 레시피의 대표 이름 목록(정렬, 중복 제거))"""
+    normalized = [parse_ingredient(text, synonyms) for text in ingredients]
+    tokens = sorted({item['normalizedName'] for item in normalized if item['normalizedName']})
+    return normalized, tokens
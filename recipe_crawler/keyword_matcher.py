@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+다중 키워드 매처
+조리도구/금지어/팁 키워드 목록을 미리 컴파일한 하나의 정규식(대안 패턴)으로 검사
+(키워드마다 `in` 검사를 반복하지 않음, Aho-Corasick은 아니므로 시작 위치마다 대안을 차례로 시도)
+"""
+
+import re
+
+
+class KeywordMatcher:
+    """키워드 목록을 단일 패턴으로 컴파일한 매처"""
+
+    def __init__(self, keywords):
+        self.keywords = tuple(keywords)
+        # 같은 위치에서 시작하는 키워드는 긴 것을 우선 매칭
+        alternation = '|'.join(
+            re.escape(k) for k in sorted(set(self.keywords), key=len, reverse=True)
+        )
+        self._pattern = re.compile(alternation)
+        # 겹치는 위치까지 모두 찾기 위한 lookahead 패턴
+        self._overlapping = re.compile(f'(?=({alternation}))')
+
+    def contains_any(self, text):
+        """키워드 중 하나라도 포함되어 있는지"""
+        return self._pattern.search(text) is not None
+
+    def first_positions(self, text):
+        """키워드별 첫 등장 위치 (등장하지 않은 키워드는 포함하지 않음)"""
+        positions = {}
+        for match in self._overlapping.finditer(text):
+            keyword = match.group(1)
+            if keyword not in positions:
+                positions[keyword] = match.start()
+        return positions
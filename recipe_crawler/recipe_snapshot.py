@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+열 단위(columnar) 레시피 스냅샷
+크롤링 결과를 dict/list/str 객체 대신 배열 몇 개로 저장하고, 읽을 때는 파일을 메모리 맵으로 열어
+복사 없이 필요한 레시피/필드만 그때그때 디코딩
+
+파일 구성 (모든 정수는 little-endian, 배열은 8바이트 정렬):
+    b'RCPSNAP1' | 헤더 길이(uint64) | 헤더(JSON) | 배열들
+- 문자열 표: 모든 문자열을 한 번만 저장 (strings.bytes + strings.offsets, 문자 수는 strings.lengths)
+- 문자열 필드(id, name, ...): 문자열 번호 배열 (uint32)
+- 목록 필드(ingredients, steps, tags, ingredientTokens): <필드>.offsets (N + 1) + <필드>.ids
+- normalizedIngredients: 목록 필드와 같은 offsets에 name/normalizedName/unit 문자열 번호와 quantity 열
+- 숫자 필드: servings, cookingTime (int32, 없으면 -1), score (float64, 없으면 NaN)
+
+사용법:
+    python recipe_snapshot.py --checkpoint-dir checkpoints --output recipes.snap          # 선택된 레시피
+    python recipe_snapshot.py --checkpoint-dir checkpoints --output all.snap --all-candidates
+    python recipe_snapshot.py --info recipes.snap
+"""
+
+import argparse
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+from batch_scoring import features_from_columns
+from checkpoint import DEFAULT_CHECKPOINT_DIR, iter_recorded_recipes, iter_selected_recipes
+
+MAGIC = b'RCPSNAP1'
+ALIGNMENT = 8
+
+STRING_FIELDS = ('id', 'name', 'imageUrl', 'sourceUrl', 'category', 'difficulty')
+LIST_FIELDS = ('ingredients', 'steps', 'tags', 'ingredientTokens')
+INT_FIELDS = ('servings', 'cookingTime')
+FLOAT_FIELDS = ('score',)
+NORMALIZED_FIELD = 'normalizedIngredients'
+NORMALIZED_STRING_KEYS = ('name', 'normalizedName', 'unit')
+MISSING_INT = -1
+
+
+class _StringTable:
+    """문자열 → 번호 (같은 문자열은 한 번만 저장)"""
+
+    def __init__(self):
+        self.ids = {}
+        self.chunks = []
+        self.offsets = array('Q', [0])
+        self.lengths = array('I')
+
+    def add(self, text):
+        text = '' if text is None else str(text)
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = len(self.lengths)
+            self.ids[text] = string_id
+            encoded = text.encode('utf-8')
+            self.chunks.append(encoded)
+            self.offsets.append(self.offsets[-1] + len(encoded))
+            self.lengths.append(len(text))
+        return string_id
+
+
+def _numpy_dtype(typecode):
+    return np.dtype({'I': '<u4', 'Q': '<u8', 'i': '<i4', 'd': '<f8', 'B': 'u1'}[typecode])
+
+
+def export_snapshot(recipes, path):
+    """레시피 이터러블을 스냅샷 파일로 저장 (한 번만 순회), 저장한 레시피 수 반환"""
+    strings = _StringTable()
+    columns = {field: array('I') for field in STRING_FIELDS}
+    for field in LIST_FIELDS + (NORMALIZED_FIELD,):
+        columns[f'{field}.offsets'] = array('Q', [0])
+    for field in LIST_FIELDS:
+        columns[f'{field}.ids'] = array('I')
+    for key in NORMALIZED_STRING_KEYS:
+        columns[f'{NORMALIZED_FIELD}.{key}'] = array('I')
+    columns[f'{NORMALIZED_FIELD}.quantity'] = array('d')
+    for field in INT_FIELDS:
+        columns[field] = array('i')
+    for field in FLOAT_FIELDS:
+        columns[field] = array('d')
+
+    count = 0
+    for recipe in recipes:
+        count += 1
+        for field in STRING_FIELDS:
+            columns[field].append(strings.add(recipe.get(field)))
+        for field in LIST_FIELDS:
+            values = recipe.get(field) or []
+            columns[f'{field}.ids'].extend(strings.add(value) for value in values)
+            columns[f'{field}.offsets'].append(columns[f'{field}.offsets'][-1] + len(values))
+        normalized = recipe.get(NORMALIZED_FIELD) or []
+        for item in normalized:
+            for key in NORMALIZED_STRING_KEYS:
+                columns[f'{NORMALIZED_FIELD}.{key}'].append(strings.add(item.get(key)))
+            quantity = item.get('quantity')
+            columns[f'{NORMALIZED_FIELD}.quantity'].append(math.nan if quantity is None else float(quantity))
+        columns[f'{NORMALIZED_FIELD}.offsets'].append(columns[f'{NORMALIZED_FIELD}.offsets'][-1] + len(normalized))
+        for field in INT_FIELDS:
+            value = recipe.get(field)
+            columns[field].append(MISSING_INT if value is None else int(value))
+        for field in FLOAT_FIELDS:
+            value = recipe.get(field)
+            columns[field].append(math.nan if value is None else float(value))
+
+    columns['strings.offsets'] = strings.offsets
+    columns['strings.lengths'] = strings.lengths
+    columns['strings.bytes'] = array('B', b''.join(strings.chunks))
+
+    # 헤더에 들어갈 배열 위치는 헤더 길이에 따라 달라지므로 상대 위치로 먼저 계산
+    layout, position = {}, 0
+    for name, values in columns.items():
+        dtype = _numpy_dtype(values.typecode)
+        layout[name] = [position, dtype.str, len(values)]
+        position += len(values) * dtype.itemsize
+        position += -position % ALIGNMENT
+    header = json.dumps({'count': count, 'arrays': layout}, ensure_ascii=False).encode('utf-8')
+    data_start = len(MAGIC) + 8 + len(header)
+    data_start += -data_start % ALIGNMENT
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        f.write(b'\0' * (data_start - f.tell()))
+        for name, values in columns.items():
+            f.write(b'\0' * (data_start + layout[name][0] - f.tell()))
+            f.write(np.frombuffer(values, dtype=values.typecode).astype(layout[name][1], copy=False).tobytes())
+    os.replace(tmp_path, path)
+    return count
+
+
+class RecipeView:
+    """스냅샷의 레시피 1개 (필드를 읽을 때만 디코딩)"""
+
+    __slots__ = ('_snapshot', '_index')
+
+    def __init__(self, snapshot, index):
+        self._snapshot = snapshot
+        self._index = index
+
+    def __getitem__(self, field):
+        return self._snapshot.field(self._index, field)
+
+    def get(self, field, default=None):
+        try:
+            value = self[field]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def keys(self):
+        return self._snapshot.fields
+
+    def to_dict(self):
+        recipe = {field: self[field] for field in self._snapshot.fields}
+        return {field: value for field, value in recipe.items() if value is not None}
+
+    def __repr__(self):
+        return f"RecipeView({self._index}, {self['name']!r})"
+
+
+class RecipeSnapshot:
+    """메모리 맵으로 연 스냅샷 (배열은 복사 없이 파일을 가리키는 뷰, 실제로 읽은 페이지만 메모리에 올라옴)"""
+
+    fields = STRING_FIELDS + LIST_FIELDS + (NORMALIZED_FIELD,) + INT_FIELDS + FLOAT_FIELDS
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"레시피 스냅샷 파일이 아닙니다: {path}")
+            (header_length,) = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_length).decode('utf-8'))
+        data_start = len(MAGIC) + 8 + header_length
+        data_start += -data_start % ALIGNMENT
+
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        raw = memoryview(self._mmap)
+        self.count = header['count']
+        # arrays: 일괄 연산용 numpy 뷰, _columns: 레시피 1개를 읽을 때 쓰는 memoryview (원소 접근이 더 가벼움)
+        self.arrays = {}
+        self._columns = {}
+        for name, (offset, dtype, length) in header['arrays'].items():
+            dtype = np.dtype(dtype)
+            start = data_start + offset
+            self.arrays[name] = np.frombuffer(self._mmap, dtype=dtype, count=length, offset=start)
+            if sys.byteorder == 'little':
+                self._columns[name] = raw[start:start + length * dtype.itemsize].cast(dtype.char)
+            else:
+                self._columns[name] = self.arrays[name]
+        self._raw = raw
+        self._string_offsets = self._columns['strings.offsets']
+        self._strings_start = data_start + header['arrays']['strings.bytes'][0]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return RecipeView(self, index)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield RecipeView(self, index)
+
+    def string(self, string_id):
+        strings_start = self._strings_start
+        start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+        return str(self._raw[strings_start + start:strings_start + end], 'utf-8')
+
+    def strings(self, string_ids):
+        """문자열 번호 배열 → 문자열 목록"""
+        string_ids = np.asarray(string_ids, dtype=np.int64)
+        offsets = self.arrays['strings.offsets']
+        starts = (offsets[string_ids] + self._strings_start).tolist()
+        ends = (offsets[string_ids + 1] + self._strings_start).tolist()
+        raw = self._raw
+        return [str(raw[start:end], 'utf-8') for start, end in zip(starts, ends)]
+
+    def list_ids(self, field, index):
+        """목록 필드의 레시피 index 항목 문자열 번호"""
+        offsets = self._columns[f'{field}.offsets']
+        return self._columns[f'{field}.ids'][offsets[index]:offsets[index + 1]]
+
+    def field(self, index, field):
+        if field in STRING_FIELDS:
+            return self.string(self._columns[field][index])
+        if field in LIST_FIELDS:
+            return [self.string(string_id) for string_id in self.list_ids(field, index)]
+        if field == NORMALIZED_FIELD:
+            offsets = self._columns[f'{NORMALIZED_FIELD}.offsets']
+            key_columns = [(key, self._columns[f'{NORMALIZED_FIELD}.{key}']) for key in NORMALIZED_STRING_KEYS]
+            quantities = self._columns[f'{NORMALIZED_FIELD}.quantity']
+            items = []
+            for slot in range(offsets[index], offsets[index + 1]):
+                item = {key: self.string(column[slot]) for key, column in key_columns}
+                quantity = float(quantities[slot])
+                item['quantity'] = None if math.isnan(quantity) else (int(quantity) if quantity.is_integer() else quantity)
+                items.append(item)
+            return items
+        if field in INT_FIELDS:
+            value = int(self._columns[field][index])
+            return None if value == MISSING_INT else value
+        if field in FLOAT_FIELDS:
+            value = float(self._columns[field][index])
+            return None if math.isnan(value) else value
+        raise KeyError(field)
+
+    def iter_dicts(self):
+        """레시피를 dict로 하나씩 (업로드 등 dict가 필요한 곳에서 전체를 메모리에 올리지 않고 사용)"""
+        for view in self:
+            yield view.to_dict()
+
+    def features(self, keywords):
+        """batch_scoring용 RecipeFeatures (문자열은 이름만 디코딩, 단계 길이는 문자열 표의 문자 수 사용)"""
+        names = self.strings(self.arrays['name'])
+        ingredient_counts = np.diff(self.arrays['ingredients.offsets'])
+        step_lengths = self.arrays['strings.lengths'][self.arrays['steps.ids']]
+        return features_from_columns(names, ingredient_counts, step_lengths, self.arrays['steps.offsets'], keywords)
+
+
+def load_snapshot(path):
+    return RecipeSnapshot(path)
+
+
+def iter_candidate_recipes(checkpoint_dir):
+    """체크포인트에 기록된 후보 레시피 (여러 키워드에서 나온 같은 레시피는 한 번만)"""
+    seen = set()
+    for _, recipe in iter_recorded_recipes(checkpoint_dir):
+        if recipe.get('id') not in seen:
+            seen.add(recipe.get('id'))
+            yield recipe
+
+
+def main():
+    parser = argparse.ArgumentParser(description="레시피 스냅샷 내보내기/확인")
+    parser.add_argument('--checkpoint-dir', default=DEFAULT_CHECKPOINT_DIR, help='체크포인트 디렉터리')
+    parser.add_argument('--output', default=None, help='저장할 스냅샷 파일 경로')
+    parser.add_argument('--all-candidates', action='store_true',
+                        help='키워드별 최고 점수 레시피가 아니라 기록된 후보 레시피 전체를 저장')
+    parser.add_argument('--info', default=None, help='스냅샷 파일 요약 출력')
+    args = parser.parse_args()
+
+    if args.info:
+        snapshot = load_snapshot(args.info)
+        print(f"📦 {args.info}: 레시피 {len(snapshot)}개, 문자열 {len(snapshot.arrays['strings.lengths'])}개, "
+              f"{os.path.getsize(args.info) / 2**20:.1f}MB")
+        return
+    if not args.output:
+        parser.error('--output 또는 --info가 필요합니다.')
+
+    if args.all_candidates:
+        recipes = iter_candidate_recipes(args.checkpoint_dir)
+    else:
+        recipes = iter_selected_recipes(args.checkpoint_dir)
+    count = export_snapshot(recipes, args.output)
+    print(f"✅ 스냅샷 저장: {args.output} (레시피 {count}개, {os.path.getsize(args.output) / 2**20:.1f}MB)")
+
+
+if __name__ == "__main__":
+    main()
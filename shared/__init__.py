@@ -0,0 +1,4 @@
+"""
+fastapi-backend와 recipe_crawler가 함께 쓰는 모듈
+(두 쪽 모두 저장소 루트를 sys.path에 넣고 `shared.<모듈>`로 import)
+"""
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+재료 대표 이름 규칙
+크롤러(recipe_crawler/ingredient_normalizer.py)가 레시피 재료의 normalizedName/ingredientTokens를 만들 때와
+백엔드(fastapi-backend/services/recommendation.py)가 팬트리 재료 이름을 매칭할 때 같은 규칙과 동의어 사전을 씀
+
+- 대표 이름은 소문자 + 공백/괄호 제거 후 동의어를 대표어로 바꾼 값 (예: "파" → "대파", "달걀" → "계란")
+- 동의어 사전은 이 폴더의 ingredient_synonyms.json ({대표어: [동의어, ...]})
+"""
+
+import json
+import os
+import re
+
+DEFAULT_SYNONYMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ingredient_synonyms.json')
+
+PARENTHESES_PATTERN = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+NAME_NOISE_PATTERN = re.compile(r'[^0-9a-z가-힣]')
+
+
+def compact_name(name):
+    """비교용 이름 (소문자, 괄호 안 설명/공백/기호 제거)"""
+    return NAME_NOISE_PATTERN.sub('', PARENTHESES_PATTERN.sub('', name or '').lower())
+
+
+def load_synonyms(path=DEFAULT_SYNONYMS_PATH):
+    """{대표어: [동의어, ...]} 파일 → {동의어 또는 대표어: 대표어}
+
+    파일이 없으면 FileNotFoundError (빈 사전으로 넘어가면 동의어 매칭이 조용히 꺼지므로 시작 시점에 실패시킴)
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"재료 동의어 사전을 찾을 수 없습니다: {path}")
+    with open(path, 'r', encoding='utf-8') as f:
+        table = json.load(f)
+    synonyms = {}
+    for canonical, aliases in table.items():
+        canonical_key = compact_name(canonical)
+        synonyms[canonical_key] = canonical_key
+        for alias in aliases:
+            synonyms.setdefault(compact_name(alias), canonical_key)
+    return synonyms
+
+
+SYNONYMS = load_synonyms()
+
+
+def canonical_name(name, synonyms=None):
+    """재료 이름 → 대표 이름"""
+    synonyms = SYNONYMS if synonyms is None else synonyms
+    key = compact_name(name)
+    return synonyms.get(key, key)